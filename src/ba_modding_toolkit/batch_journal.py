@@ -0,0 +1,192 @@
+# batch_journal.py
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from .utils import CRCUtils
+
+# 日志文件默认保存在批量更新的输出目录中
+JOURNAL_FILENAME = "bamt_batch_journal.json"
+
+# 日志格式版本，格式变化时旧日志自然失效
+JOURNAL_VERSION = 1
+
+STATUS_SUCCESS = "success"
+STATUS_FAILED = "failed"
+
+
+def hash_file(path: Path, chunk_size: int = 1 << 20) -> str:
+    """计算文件内容的哈希。"""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_options(*options: object) -> str:
+    """计算一组选项的哈希，选项通过 repr 序列化。"""
+    return hashlib.blake2b(repr(options).encode("utf-8"), digest_size=20).hexdigest()
+
+
+@dataclass
+class JournalOutput:
+    """一个输出文件的记录。"""
+    path: str
+    size: int
+    crc: int
+
+    @classmethod
+    def from_file(cls, path: Path) -> "JournalOutput":
+        with open(path, "rb") as f:
+            crc = CRCUtils.compute_crc32_stream(f)
+        return cls(str(path), path.stat().st_size, crc)
+
+    def is_valid(self) -> bool:
+        """输出文件仍然存在，且大小和 CRC 与记录一致。"""
+        path = Path(self.path)
+        try:
+            if path.stat().st_size != self.size:
+                return False
+            with open(path, "rb") as f:
+                return CRCUtils.compute_crc32_stream(f) == self.crc
+        except OSError:
+            return False
+
+
+@dataclass
+class JournalEntry:
+    """一个输入Mod的处理记录。"""
+    mod_hash: str
+    options_hash: str
+    status: str
+    target: str | None = None
+    target_size: int | None = None
+    target_mtime_ns: int | None = None
+    outputs: list[JournalOutput] = field(default_factory=list)
+    message: str = ""
+
+    def target_unchanged(self) -> bool:
+        """目标bundle文件仍然存在，且大小和修改时间与记录一致。"""
+        if self.target is None:
+            return False
+        try:
+            st = Path(self.target).stat()
+        except OSError:
+            return False
+        return st.st_size == self.target_size and st.st_mtime_ns == self.target_mtime_ns
+
+    def is_complete(self) -> bool:
+        """记录为成功，且目标文件未变化、所有输出文件仍然有效。"""
+        return (
+            self.status == STATUS_SUCCESS
+            and bool(self.outputs)
+            and self.target_unchanged()
+            and all(output.is_valid() for output in self.outputs)
+        )
+
+
+class BatchJournal:
+    """
+    批量Mod更新的断点续传日志。
+
+    以 JSON 文件记录每个输入Mod的内容哈希、选项哈希、目标bundle、输出文件及其 CRC 和处理状态，
+    每记录一个Mod就原子地重写一次文件，进程中断时已完成的记录不会丢失。
+    重新运行时，内容和选项都未变化、目标和输出文件都仍然有效的Mod可以直接跳过。
+    """
+
+    def __init__(self, path: Path | str):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._entries: dict[str, JournalEntry] = self._load()
+
+    @classmethod
+    def in_directory(cls, output_dir: Path) -> "BatchJournal":
+        """打开输出目录中的日志文件。"""
+        return cls(Path(output_dir) / JOURNAL_FILENAME)
+
+    @staticmethod
+    def _key(mod_path: Path) -> str:
+        return str(Path(mod_path).resolve())
+
+    def _load(self) -> dict[str, JournalEntry]:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get("version") != JOURNAL_VERSION:
+            return {}
+        entries = {}
+        for key, raw in data.get("entries", {}).items():
+            try:
+                outputs = [JournalOutput(**output) for output in raw.pop("outputs", [])]
+                entries[key] = JournalEntry(**raw, outputs=outputs)
+            except TypeError:
+                continue
+        return entries
+
+    def _save(self) -> None:
+        data = {
+            "version": JOURNAL_VERSION,
+            "entries": {key: asdict(entry) for key, entry in self._entries.items()},
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            os.replace(temp_path, self.path)
+        except BaseException:
+            Path(temp_path).unlink(missing_ok=True)
+            raise
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, mod_path: Path) -> JournalEntry | None:
+        with self._lock:
+            return self._entries.get(self._key(mod_path))
+
+    def find_complete(self, mod_path: Path, mod_hash: str, options_hash: str) -> JournalEntry | None:
+        """查找可以跳过的已完成记录，没有或已失效时返回 None。"""
+        entry = self.get(mod_path)
+        if entry is None or entry.mod_hash != mod_hash or entry.options_hash != options_hash:
+            return None
+        return entry if entry.is_complete() else None
+
+    def record(
+        self,
+        mod_path: Path,
+        mod_hash: str,
+        options_hash: str,
+        success: bool,
+        target: Path | None = None,
+        outputs: list[Path] | None = None,
+        message: str = "",
+    ) -> JournalEntry:
+        """记录一个Mod的处理结果并立即写入日志文件。"""
+        target_stat = None
+        if target is not None:
+            try:
+                target_stat = target.stat()
+            except OSError:
+                pass
+        entry = JournalEntry(
+            mod_hash=mod_hash,
+            options_hash=options_hash,
+            status=STATUS_SUCCESS if success else STATUS_FAILED,
+            target=str(target) if target is not None else None,
+            target_size=target_stat.st_size if target_stat else None,
+            target_mtime_ns=target_stat.st_mtime_ns if target_stat else None,
+            outputs=[JournalOutput.from_file(path) for path in outputs or [] if path.is_file()],
+            message=message,
+        )
+        with self._lock:
+            self._entries[self._key(mod_path)] = entry
+            self._save()
+        return entry
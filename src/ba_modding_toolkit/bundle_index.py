@@ -0,0 +1,186 @@
+# bundle_index.py
+
+import hashlib
+import json
+import sqlite3
+import threading
+from contextlib import closing
+from pathlib import Path
+
+from .i18n import t
+from .utils import LogFunc, no_log
+from .core import (
+    COMPARABLE_ASSET_TYPES,
+    NameTypeKey,
+    ContNameTypeKey,
+    get_bundle_records,
+    parse_filename,
+)
+
+# 默认的索引文件名，与 config.toml 放在同一目录
+DEFAULT_INDEX_FILENAME = "bundle_index.sqlite"
+
+# 索引结构版本，结构变化时整体重建
+INDEX_SCHEMA_VERSION = 1
+
+# Bloom 过滤器参数：2048 位，每个键 3 个哈希
+BLOOM_BITS = 2048
+BLOOM_HASHES = 3
+
+
+def _bloom_positions(key: NameTypeKey) -> list[int]:
+    digest = hashlib.blake2b(str(key).encode("utf-8"), digest_size=4 * BLOOM_HASHES).digest()
+    return [int.from_bytes(digest[i * 4:i * 4 + 4], "little") % BLOOM_BITS for i in range(BLOOM_HASHES)]
+
+def build_bloom(keys: set[NameTypeKey]) -> bytes:
+    """为一组 (名称, 类型) 键构造 Bloom 过滤器。"""
+    bits = bytearray(BLOOM_BITS // 8)
+    for key in keys:
+        for pos in _bloom_positions(key):
+            bits[pos >> 3] |= 1 << (pos & 7)
+    return bytes(bits)
+
+def bloom_may_contain(bloom: bytes, key: NameTypeKey) -> bool:
+    """检查键是否可能在 Bloom 过滤器中。返回 False 时一定不在。"""
+    return all(bloom[pos >> 3] & (1 << (pos & 7)) for pos in _bloom_positions(key))
+
+
+class BundleIndex:
+    """
+    游戏资源目录的持久化指纹索引，保存在 SQLite 文件中。
+
+    每个 bundle 记录其 (名称, 类型) 与 (容器, 名称, 类型) 键集合、容器列表、文件大小、修改时间、
+    文件名中的 CRC，以及用于快速排除的 Bloom 过滤器。
+    查询时只有大小或修改时间发生变化的文件才会被重新扫描。
+    """
+
+    def __init__(self, db_path: Path | str = DEFAULT_INDEX_FILENAME):
+        self.db_path = Path(db_path)
+        self._lock = threading.Lock()
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def _init_db(self) -> None:
+        with self._lock, closing(self._connect()) as conn, conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            row = conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+            if row is None or int(row[0]) != INDEX_SCHEMA_VERSION:
+                conn.execute("DROP TABLE IF EXISTS bundles")
+                conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('schema_version', ?)",
+                    (str(INDEX_SCHEMA_VERSION),),
+                )
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS bundles (
+                    path TEXT PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    crc TEXT,
+                    name_type_keys TEXT NOT NULL,
+                    cont_name_type_keys TEXT NOT NULL,
+                    containers TEXT NOT NULL,
+                    bloom BLOB NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_bundles_name ON bundles (name)")
+
+    @staticmethod
+    def _scan(key: str, bundle_path: Path, size: int, mtime_ns: int, log: LogFunc) -> tuple | None:
+        """扫描一个 bundle，返回与 bundles 表列顺序一致的行（不含 name 列）。"""
+        if (records := get_bundle_records(bundle_path, log)) is None:
+            return None
+        name_type_keys = {NameTypeKey(r.name, r.type.name) for r in records}
+        cont_name_type_keys = {ContNameTypeKey(r.container, r.name, r.type.name) for r in records}
+        comparable = {
+            NameTypeKey(r.name, r.type.name) for r in records if r.class_id in COMPARABLE_ASSET_TYPES
+        }
+        return (
+            key,
+            size,
+            mtime_ns,
+            parse_filename(bundle_path.name)[4],
+            json.dumps(sorted(name_type_keys, key=str), ensure_ascii=False),
+            json.dumps(sorted(cont_name_type_keys, key=str), ensure_ascii=False),
+            json.dumps(sorted({r.container for r in records if r.container}), ensure_ascii=False),
+            build_bloom(comparable),
+        )
+
+    def _load_rows(self, bundle_paths: list[Path], log: LogFunc) -> dict[Path, tuple]:
+        """
+        读取指定文件的索引行，缺失或已变化（大小、修改时间不同）的文件会被重新扫描并写回索引。
+
+        Returns:
+            文件路径 -> 索引行；无法读取的文件不会出现在结果中。
+        """
+        stats: dict[str, tuple[Path, int, int]] = {}
+        for path in bundle_paths:
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            stats[str(path.resolve())] = (path, st.st_size, st.st_mtime_ns)
+
+        rows: dict[str, tuple] = {}
+        keys = list(stats)
+        with self._lock, closing(self._connect()) as conn:
+            # SQLite 对参数数量有限制，分批查询
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                for row in conn.execute(
+                    "SELECT path, size, mtime_ns, crc, name_type_keys, cont_name_type_keys, containers, bloom "
+                    f"FROM bundles WHERE path IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ):
+                    rows[row[0]] = row
+
+        result: dict[Path, tuple] = {}
+        stale = []
+        for key, (path, size, mtime_ns) in stats.items():
+            row = rows.get(key)
+            if row and row[1] == size and row[2] == mtime_ns:
+                result[path] = row
+            else:
+                stale.append((key, path, size, mtime_ns))
+
+        if stale:
+            log(f"  > {t('log.index.refreshing', count=len(stale))}")
+            scanned = []
+            for key, path, size, mtime_ns in stale:
+                if row := self._scan(key, path, size, mtime_ns, log):
+                    result[path] = row
+                    scanned.append((row[0], path.name, *row[1:]))
+            with self._lock, closing(self._connect()) as conn, conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO bundles "
+                    "(path, name, size, mtime_ns, crc, name_type_keys, cont_name_type_keys, containers, bloom) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    scanned,
+                )
+
+        return result
+
+    def find_matches(
+        self,
+        bundle_paths: list[Path],
+        fingerprint: set[NameTypeKey],
+        log: LogFunc = no_log,
+    ) -> list[Path]:
+        """
+        在指定文件中查找含有指纹中任一资源键的 bundle，保持输入顺序。
+        先用 Bloom 过滤器排除，只有可能匹配的文件才会解析其键集合。
+        """
+        rows = self._load_rows(bundle_paths, log)
+        matched = []
+        for path in bundle_paths:
+            if not (row := rows.get(path)):
+                continue
+            bloom = row[7]
+            if not any(bloom_may_contain(bloom, key) for key in fingerprint):
+                continue
+            keys = {NameTypeKey(*key) for key in json.loads(row[4])}
+            if not keys.isdisjoint(fingerprint):
+                matched.append(path)
+        return matched
@@ -7,15 +7,24 @@ from pathlib import Path
 from .taps import UpdateTap, PackTap, CrcTap, EnvTap, ExtractTap
 from ..core import (
     find_new_bundle_path,
+    ResourceCatalog,
     SaveOptions,
+    SaveVariant,
     SpineOptions,
     process_mod_update,
+    process_batch_mod_update,
+    plan_mod_update,
+    plan_batch_mod_update,
+    BatchPlan,
     process_asset_packing,
     process_asset_extraction,
     extract_core_filename,
     parse_filename,
+    find_crc_patch_offset,
 )
-from ..utils import get_environment_info, CRCUtils, get_BA_path, get_search_resource_dirs, parse_hex_bytes
+from ..utils import get_environment_info, CRCUtils, get_BA_path, get_search_resource_dirs, parse_hex_bytes, no_log
+from ..bundle_index import BundleIndex
+from ..batch_journal import BatchJournal
 
 def setup_cli_logger():
     """配置一个简单的日志记录器，将日志输出到控制台。"""
@@ -35,11 +44,37 @@ def setup_cli_logger():
     return CLILogger()
 
 
+def _build_update_options(args: UpdateTap) -> tuple[SaveOptions, SpineOptions]:
+    save_options = SaveOptions(
+        perform_crc=not args.no_crc,
+        extra_bytes=parse_hex_bytes(args.extra_bytes),
+        compression=args.compression,
+        max_workers=args.jobs,
+        use_texture_cache=not args.no_texture_cache,
+        variants=[SaveVariant(compression) for compression in args.variants],
+        keep_mod_extra_bytes=args.keep_mod_extra_bytes,
+    )
+
+    spine_options = SpineOptions(
+        enabled=args.enable_spine_conversion,
+        converter_path=Path(args.spine_converter_path) if args.spine_converter_path else None,
+        target_version=args.target_spine_version or None,
+    )
+    return save_options, spine_options
+
+
 def handle_update(args: UpdateTap, logger) -> None:
     """处理 'update' 命令的逻辑。"""
+    if args.dry_run:
+        handle_update_plan(args, logger)
+        return
+    if len(args.old) > 1:
+        handle_batch_update(args, logger)
+        return
+
     logger.log("--- Start Mod Update ---")
 
-    old_mod_path = Path(args.old)
+    old_mod_path = Path(args.old[0])
     output_dir = Path(args.output_dir)
 
     # 确保输出目录存在
@@ -58,7 +93,11 @@ def handle_update(args: UpdateTap, logger) -> None:
             logger.log(f"❌ Error: Game resource directory '{resource_path}' does not exist or is not a directory.")
             return
 
-        found_paths, message = find_new_bundle_path(old_mod_path, get_search_resource_dirs(resource_path), logger.log)
+        index = BundleIndex(args.index_file) if args.index_file else None
+        found_paths, message = find_new_bundle_path(
+            old_mod_path, get_search_resource_dirs(resource_path), logger.log,
+            index=index, max_workers=args.jobs, first_match_only=True
+        )
         if not found_paths:
             logger.log(f"❌ Auto-search failed: {message}")
             return
@@ -71,17 +110,7 @@ def handle_update(args: UpdateTap, logger) -> None:
     asset_types = set(args.asset_types)
     logger.log(f"Specified asset replacement types: {', '.join(asset_types)}")
 
-    save_options = SaveOptions(
-        perform_crc=not args.no_crc,
-        extra_bytes=parse_hex_bytes(args.extra_bytes),
-        compression=args.compression
-    )
-
-    spine_options = SpineOptions(
-        enabled=args.enable_spine_conversion,
-        converter_path=Path(args.spine_converter_path) if args.spine_converter_path else None,
-        target_version=args.target_spine_version or None,
-    )
+    save_options, spine_options = _build_update_options(args)
 
     # 调用核心处理函数
     success, message = process_mod_update(
@@ -101,6 +130,94 @@ def handle_update(args: UpdateTap, logger) -> None:
         logger.log(f"❌ Operation Failed: {message}")
 
 
+def handle_batch_update(args: UpdateTap, logger) -> None:
+    """处理传入多个旧Mod文件时的 'update' 命令逻辑。"""
+    logger.log("--- Start Batch Mod Update ---")
+
+    if args.target:
+        logger.log("❌ Error: '--target' cannot be used when updating multiple files.")
+        return
+
+    resource_dir = args.resource_dir or get_BA_path()
+    if not resource_dir:
+        logger.log("❌ Error: Must provide '--resource-dir' to search the target resource files.")
+        return
+    resource_path = Path(resource_dir)
+    if not resource_path.is_dir():
+        logger.log(f"❌ Error: Game resource directory '{resource_path}' does not exist or is not a directory.")
+        return
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    mod_file_list = [Path(path) for path in args.old]
+    asset_types = set(args.asset_types)
+    logger.log(f"Specified asset replacement types: {', '.join(asset_types)}")
+
+    save_options, spine_options = _build_update_options(args)
+
+    def progress_callback(current: int, total: int, filename: str) -> None:
+        logger.log(f"[{current}/{total}] {filename}")
+
+    success_count, fail_count, failed_tasks = process_batch_mod_update(
+        mod_file_list=mod_file_list,
+        search_paths=get_search_resource_dirs(resource_path),
+        output_dir=output_dir,
+        asset_types_to_replace=asset_types,
+        save_options=save_options,
+        spine_options=spine_options,
+        log=logger.log,
+        progress_callback=progress_callback,
+        index=BundleIndex(args.index_file) if args.index_file else None,
+        max_workers=args.jobs,
+        journal=None if args.no_journal else BatchJournal.in_directory(output_dir),
+    )
+
+    logger.log("\n" + "="*50)
+    logger.log(f"Total: {len(mod_file_list)}, Succeeded: {success_count}, Failed: {fail_count}")
+    for task in failed_tasks:
+        logger.log(f"❌ {task}")
+
+
+def handle_update_plan(args: UpdateTap, logger) -> None:
+    """处理 'update --dry-run'：只生成迁移计划并以 JSON 输出，不编码或保存任何文件。"""
+    # 计划输出到标准输出时不打印过程日志，保证输出是合法的 JSON
+    log = logger.log if args.plan_file else no_log
+    mod_file_list = [Path(path) for path in args.old]
+    asset_types = set(args.asset_types)
+
+    if args.target:
+        if len(mod_file_list) > 1:
+            logger.log("❌ Error: '--target' cannot be used when updating multiple files.")
+            return
+        plan = BatchPlan([plan_mod_update(mod_file_list[0], Path(args.target), asset_types, log)])
+    else:
+        resource_dir = args.resource_dir or get_BA_path()
+        if not resource_dir:
+            logger.log("❌ Error: Must provide '--target' or '--resource-dir' to determine the target resource file.")
+            return
+        resource_path = Path(resource_dir)
+        if not resource_path.is_dir():
+            logger.log(f"❌ Error: Game resource directory '{resource_path}' does not exist or is not a directory.")
+            return
+        plan = plan_batch_mod_update(
+            mod_file_list,
+            get_search_resource_dirs(resource_path),
+            asset_types,
+            log=log,
+            index=BundleIndex(args.index_file) if args.index_file else None,
+            max_workers=args.jobs,
+        )
+
+    if args.plan_file:
+        plan_file = Path(args.plan_file)
+        plan_file.parent.mkdir(parents=True, exist_ok=True)
+        plan_file.write_text(plan.to_json(), encoding="utf-8")
+        logger.log(f"✅ Migration plan written to '{plan_file}'.")
+    else:
+        print(plan.to_json())
+
+
 def handle_asset_packing(args: PackTap, logger) -> None:
     """处理 'pack' 命令的逻辑。"""
     logger.log("--- Start Asset Packing ---")
@@ -123,7 +240,10 @@ def handle_asset_packing(args: PackTap, logger) -> None:
     save_options = SaveOptions(
         perform_crc=not args.no_crc,
         extra_bytes=parse_hex_bytes(args.extra_bytes),
-        compression=args.compression
+        compression=args.compression,
+        max_workers=args.jobs,
+        use_texture_cache=not args.no_texture_cache,
+        variants=[SaveVariant(compression) for compression in args.variants],
     )
 
     spine_options = SpineOptions(
@@ -176,16 +296,10 @@ def handle_crc(args: CrcTap, logger) -> None:
             return
 
         # 在搜索目录中查找同名文件（只取第一个找到的）
-        search_dirs = get_search_resource_dirs(game_dir)
+        catalog = ResourceCatalog(get_search_resource_dirs(game_dir))
         target_name = modified_path.name
-        original_path: Path | None = None
-        for dir_path in search_dirs:
-            if not dir_path.exists():
-                continue
-            candidate = dir_path / target_name
-            if candidate.is_file():
-                original_path = candidate
-                break
+        matches = catalog.find_by_name(target_name)
+        original_path: Path | None = matches[0].path if matches else None
 
         if original_path is None:
             logger.log(f"❌ Auto-search failed: File '{target_name}' not found in search directories")
@@ -195,15 +309,11 @@ def handle_crc(args: CrcTap, logger) -> None:
     # --- 模式 1: 仅检查/计算 CRC ---
     if args.check_only:
         try:
-            with open(modified_path, "rb") as f:
-                modified_data = f.read()
-            modified_crc_hex = f"{CRCUtils.compute_crc32(modified_data):08X}"
+            modified_crc_hex = f"{CRCUtils.compute_crc32(modified_path):08X}"
             logger.log(f"Modified File CRC32: {modified_crc_hex}  ({modified_path.name})")
 
             if original_path:
-                with open(original_path, "rb") as f:
-                    original_data = f.read()
-                original_crc_hex = f"{CRCUtils.compute_crc32(original_data):08X}"
+                original_crc_hex = f"{CRCUtils.compute_crc32(original_path):08X}"
                 logger.log(f"Original File CRC32: {original_crc_hex}  ({original_path.name})")
                 if original_crc_hex == modified_crc_hex:
                     logger.log("✅ CRC Match: Yes")
@@ -229,8 +339,7 @@ def handle_crc(args: CrcTap, logger) -> None:
         logger.log(f"Target CRC from filename: {target_crc:08X}")
 
         # 检查当前 CRC 是否已匹配
-        with open(modified_path, "rb") as f:
-            current_crc = CRCUtils.compute_crc32(f.read())
+        current_crc = CRCUtils.compute_crc32(modified_path)
         
         if current_crc == target_crc:
             logger.log("⚠ CRC values already match, no fix needed.")
@@ -238,12 +347,27 @@ def handle_crc(args: CrcTap, logger) -> None:
 
         logger.log("CRC mismatch. Starting CRC fix...")
 
+        patch_offset = None
+        if args.fix_mode == "patch":
+            # 原地改写保留位置的 4 个字节，文件大小不变
+            patch_offset = args.patch_offset if args.patch_offset is not None else find_crc_patch_offset(modified_path)
+            if patch_offset is None:
+                logger.log("❌ Error: No reserved bytes found for in-place patching. Use '--fix-mode append' or specify '--patch-offset'.")
+                return
+
         if not args.no_backup:
             backup_path = modified_path.with_suffix(modified_path.suffix + '.backup')
             shutil.copy2(modified_path, backup_path)
             logger.log(f"  > Backup file created: {backup_path.name}")
 
-        success = CRCUtils.manipulate_file_crc(modified_path, target_crc, parse_hex_bytes(args.extra_bytes))
+        if patch_offset is not None:
+            logger.log(f"  > Patching 4 bytes in place at offset {patch_offset}")
+            success = CRCUtils.forge_crc_at_offset(modified_path, target_crc, patch_offset)
+        else:
+            # 已知当前 CRC，只需在文件末尾追加修正字节
+            success = CRCUtils.append_crc_fix(
+                modified_path, target_crc, parse_hex_bytes(args.extra_bytes), crc_state=current_crc
+            )
 
         if success:
             logger.log("✅ CRC Fix Successful! The modified file has been updated.")
@@ -1,4 +1,6 @@
 # cli/main.py - CLI 主入口
+import multiprocessing
+
 from .taps import MainTap
 from .handlers import (
     setup_cli_logger,
@@ -21,6 +23,9 @@ COMMAND_HANDLERS = {
 
 def main() -> None:
     """主函数，用于解析命令行参数并分派任务。"""
+    # 打包为可执行文件后，进程池的子进程需要此调用
+    multiprocessing.freeze_support()
+
     args = MainTap().parse_args()
 
     # 初始化日志记录器
@@ -17,18 +17,26 @@ class UpdateTap(Tap):
     """Update命令的参数解析器 - 用于更新或移植Mod。"""
 
     # 基本参数
-    old: Path  # Path to the old Mod bundle file.
+    old: list[Path]  # Path(s) to the old Mod bundle file(s). Multiple files are updated as a batch.
     output_dir: Path = Path('./output/')  # Directory to save the generated Mod file (Default: ./output/).
 
     # 目标文件定位参数
     target: Path | None = None  # Path to the new game resource bundle file (Overrides --resource-dir if provided).
     resource_dir: Path | None = None  # Path to the game resource directory. Will try to find the directory automatically if not provided.
+    index_file: Path | None = None  # Path to a SQLite fingerprint index of the resource directory (created if missing). Speeds up repeated auto-searches.
+    jobs: int = 1  # Number of worker processes used to check candidate files during auto-search and to encode replaced textures. When updating multiple files, the number of Mods processed in parallel.
+    no_journal: bool = False  # When updating multiple files, do not use the batch journal in the output directory. By default Mods already updated by a previous run (with unchanged input, options and output) are skipped.
+    dry_run: bool = False  # Only resolve the migration plan (target files, matching strategy and assets to replace) and print it as JSON, without encoding or saving anything.
+    plan_file: Path | None = None  # With --dry-run, write the JSON plan to this file instead of printing it.
 
     # 资源与保存参数
     no_crc: bool = False  # Disable CRC fix function.
     extra_bytes: str | None = None  # Extra bytes in hex format (e.g., "0x08080808" or "QWERTYUI") to append before CRC correction.
+    keep_mod_extra_bytes: bool = False  # When --extra-bytes is not given, re-append the extra bytes found at the end of the old Mod before CRC correction.
     asset_types: list[str] = ['Texture2D', 'TextAsset', 'Mesh']  # List of asset types to replace.
-    compression: Literal['lzma', 'lz4', 'original', 'none'] = 'lzma'  # Compression method for Bundle files.
+    compression: Literal['lzma', 'lz4', 'original', 'none'] = 'lzma'  # Compression method for Bundle files. 'original' keeps the target bundle's compression and copies unchanged compressed blocks as-is.
+    no_texture_cache: bool = False  # Disable the on-disk cache of encoded textures.
+    variants: list[Literal['lzma', 'lz4', 'original', 'none']] = []  # Additional compression variants to save from the same run, each into a subdirectory of the output directory named after it.
 
     # Spine转换参数
     enable_spine_conversion: bool = False  # Enable Spine skeleton conversion.
@@ -49,13 +57,31 @@ Examples:
   # Manually specify new file and update
   bamt-cli update "old_mod.bundle" --target "C:\\path\\to\\new_game_file.bundle" --output-dir "C:\\path\\to\\output"
 
+  # Reuse a fingerprint index of the resource directory across runs
+  bamt-cli update "old_mod.bundle" --index-file "bundle_index.sqlite"
+
+  # Check candidate files and encode textures with 4 worker processes
+  bamt-cli update "old_mod.bundle" --jobs 4
+
+  # Save an LZMA build and an additional LZ4 build (in output/lz4/) in one run
+  bamt-cli update "old_mod.bundle" --variants lz4
+
+  # Update several Mods at once, 8 Mods in parallel
+  bamt-cli update "mod_a.bundle" "mod_b.bundle" "mod_c.bundle" --jobs 8
+
+  # Re-run an interrupted batch from scratch instead of resuming it
+  bamt-cli update "mod_a.bundle" "mod_b.bundle" "mod_c.bundle" --no-journal
+
+  # Preview which files and assets a batch update would touch, without saving anything
+  bamt-cli update "mod_a.bundle" "mod_b.bundle" --dry-run --plan-file "plan.json"
+
   # Enable Spine skeleton conversion
   bamt-cli update "old.bundle" --enable-spine-conversion --spine-converter-path "C:\\path\\to\\SpineSkeletonDataConverter.exe" --target-spine-version "4.2.0808"
 '''
         self.formatter_class = RawTextHelpFormatter
         self._underscores_to_dashes = True
         self.add_argument('--asset-types', nargs='+', choices=['Texture2D', 'TextAsset', 'Mesh', 'ALL'])
-        self.add_argument('old') # 第一个参数，可以匿名
+        self.add_argument('old', nargs='+') # 第一个参数，可以匿名，可以有多个
 
 
 class PackTap(Tap):
@@ -69,7 +95,10 @@ class PackTap(Tap):
     # 保存参数
     no_crc: bool = False  # Disable CRC fix function.
     extra_bytes: str | None = None  # Extra bytes in hex format (e.g., "0x08080808" or "QWERTYUI") to append before CRC correction.
-    compression: Literal['lzma', 'lz4', 'original', 'none'] = 'lzma'  # Compression method for Bundle files.
+    compression: Literal['lzma', 'lz4', 'original', 'none'] = 'lzma'  # Compression method for Bundle files. 'original' keeps the target bundle's compression and copies unchanged compressed blocks as-is.
+    no_texture_cache: bool = False  # Disable the on-disk cache of encoded textures.
+    variants: list[Literal['lzma', 'lz4', 'original', 'none']] = []  # Additional compression variants to save from the same run, each into a subdirectory of the output directory named after it.
+    jobs: int = 1  # Number of worker processes used to encode textures.
 
     # Spine转换参数
     enable_spine_conversion: bool = False  # Enable Spine skeleton conversion.
@@ -79,8 +108,14 @@ class PackTap(Tap):
     def configure(self) -> None:
         self.description = '''Pack contents from an asset folder into a target bundle file.
 
-Example:
+Examples:
   bamt-cli pack --bundle "C:\\path\\to\\target.bundle" --folder "C:\\path\\to\\assets" --output-dir "C:\\path\\to\\output"
+
+  # Encode textures with 4 worker processes
+  bamt-cli pack --bundle "target.bundle" --folder "assets" --jobs 4
+
+  # Also save an LZ4 build into output/lz4/
+  bamt-cli pack --bundle "target.bundle" --folder "assets" --variants lz4
 '''
         self.formatter_class = RawTextHelpFormatter
         self._underscores_to_dashes = True
@@ -100,6 +135,8 @@ class CrcTap(Tap):
     check_only: bool = False  # Only calculate and compare CRC, do not modify any files.
     no_backup: bool = False  # Do not create a backup (.backup) before fixing the file.
     extra_bytes: str | None = None  # Extra bytes in hex format (e.g., "0x08080808" or "QWERTYUI") to append before CRC correction.
+    fix_mode: Literal['append', 'patch'] = 'append'  # 'append': append correction bytes to the end. 'patch': overwrite 4 reserved bytes in place, keeping the file size (extra bytes are ignored).
+    patch_offset: int | None = None  # Offset of the 4 bytes to overwrite in 'patch' mode. Found automatically (trailing CRC bytes or header padding) if not provided.
 
     def configure(self) -> None:
         self.description = '''Tool to fix file CRC32 checksum or calculate/compare CRC32 values.
@@ -115,6 +152,9 @@ Examples:
   # Check if CRC matches only, do not modify file
   bamt-cli crc "my_mod.bundle" --original "original.bundle" --check-only
 
+  # Fix CRC in place without changing the file size
+  bamt-cli crc "my_mod.bundle" --fix-mode patch
+
   # Calculate CRC for a single file
   bamt-cli crc "my_mod.bundle" --check-only
 '''
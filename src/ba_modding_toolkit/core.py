@@ -1,20 +1,43 @@
 # core.py
 
+import binascii
+import bisect
+import copy
+import io
+import json
+import os
+import threading
 import traceback
+import uuid
+import weakref
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, wait
+from contextlib import contextmanager
+from functools import partial
 from pathlib import Path
 import shutil
 import re
+import sys
 import tempfile
-from dataclasses import dataclass
-from typing import Callable, Any, Literal, NamedTuple
+from dataclasses import asdict, dataclass, field, replace
+from typing import TYPE_CHECKING, Callable, Any, Iterator, Literal, NamedTuple
 import UnityPy
 from UnityPy.enums import ClassIDType as AssetType
-from UnityPy.files import ObjectReader as Obj, SerializedFile
+from UnityPy.files import ObjectReader as Obj, SerializedFile, BundleFile
 from UnityPy.environment import Environment as Env
+from UnityPy.streams import EndianBinaryReader, EndianBinaryWriter
+from UnityPy.enums import ArchiveFlags, ArchiveFlagsOld
+from UnityPy.helpers import CompressionHelper, TypeTreeHelper
 from PIL import Image
 
 from .i18n import t
-from .utils import CRCUtils, SpineUtils, ImageUtils, no_log
+from .utils import CRCUtils, SpineUtils, ImageUtils, no_log, map_file
+from .texture_cache import TextureCache, get_texture_cache, ENCODER_VERSION
+from .batch_journal import BatchJournal, JournalEntry, hash_file, hash_options
+
+if TYPE_CHECKING:
+    from .bundle_index import BundleIndex
 
 # -------- 类型别名 ---------
 
@@ -40,22 +63,49 @@ class ContNameTypeKey(NamedTuple):
 
 AssetKey = str | int | NameTypeKey | ContNameTypeKey
 
-# 资源的具体内容，可以是字节数据、PIL图像或None
-AssetContent = bytes | Image.Image | None  
+class LazyAssetContent:
+    """
+    延迟读取的资源内容。
+
+    只保存来源对象的引用，在替换流程真正写入时才调用 resolve() 解码图像或读取字节，
+    没有匹配到目标的来源资源永远不会被解码。结果在第一次 resolve() 后缓存。
+    """
+    __slots__ = ("obj", "_spine_options", "_log", "_content", "_resolved")
+
+    def __init__(self, obj: Obj, spine_options: "SpineOptions | None" = None, log: "LogFunc" = no_log):
+        self.obj = obj
+        self._spine_options = spine_options
+        self._log = log
+        self._content: bytes | Image.Image | None = None
+        self._resolved = False
+
+    @property
+    def resolved(self) -> bool:
+        return self._resolved
+
+    def resolve(self) -> bytes | Image.Image | None:
+        if not self._resolved:
+            self._content = _extract_object_content(self.obj, self._spine_options, self._log)
+            self._resolved = True
+        return self._content
+
+# 资源的具体内容，可以是字节数据、PIL图像、延迟读取的内容或None
+AssetContent = bytes | Image.Image | LazyAssetContent | None  
 
 # 从对象生成资源键的函数，接收UnityPy对象，返回该资源的键
 KeyGeneratorFunc = Callable[[Obj], AssetKey]
 
 # 资源匹配策略集合，用于在不同场景下生成资源键。
+# 键只由对象表中的元数据和名称字段生成，不会反序列化整个对象。
 MATCH_STRATEGIES: dict[str, KeyGeneratorFunc] = {
     # path_id: 使用 Unity 对象的 path_id 作为键，适用于相同版本精确匹配，主要方式
     'path_id': lambda obj: obj.path_id,
     # container: 使用 Unity 对象的 container 作为键（弃用，因为发现同一个container下可以用重名资源）
     'container': lambda obj: obj.container,
     # name_type: 使用 (资源名, 资源类型) 作为键，适用于按名称和类型匹配，在Asset Packing中使用
-    'name_type': lambda obj: NameTypeKey(obj.peek_name(), obj.type.name),
+    'name_type': lambda obj: NameTypeKey(_peek_object_name(obj), obj.type.name),
     # cont_name_type: 使用 (容器名, 资源名, 资源类型) 作为键，适用于按容器、名称和类型匹配，用于跨版本移植
-    'cont_name_type': lambda obj: ContNameTypeKey(obj.container, obj.peek_name(), obj.type.name),
+    'cont_name_type': lambda obj: ContNameTypeKey(obj.container, _peek_object_name(obj), obj.type.name),
 }
 
 # 日志函数类型
@@ -64,12 +114,51 @@ LogFunc = Callable[[str], None]
 # 压缩类型
 CompressionType = Literal["lzma", "lz4", "original", "none"]  
 
+@dataclass
+class SaveVariant:
+    """
+    除主输出外额外保存的一个版本，未指定的字段沿用 SaveOptions 中的设置。
+    保存到主输出文件所在目录下的 subdir 子目录（默认为压缩方式名），文件名保持不变，
+    以便 CRC 修正仍能从文件名中取得目标值。
+    """
+    compression: CompressionType
+    perform_crc: bool | None = None
+    extra_bytes: bytes | None = None
+    subdir: str | None = None
+
+class SaveOutput(NamedTuple):
+    """一个输出文件的实际保存设置。"""
+    path: Path
+    compression: CompressionType
+    perform_crc: bool
+    extra_bytes: bytes | None
+
 @dataclass
 class SaveOptions:
     """封装了保存、压缩和CRC修正相关的选项。"""
     perform_crc: bool = True
     extra_bytes: bytes | None = None
     compression: CompressionType = "lzma"
+    max_workers: int = 1  # 大于 1 时使用进程池并行编码替换的纹理，并用线程池并行压缩数据块
+    use_texture_cache: bool = True  # 是否复用磁盘缓存中相同图像的纹理编码结果
+    variants: list[SaveVariant] = field(default_factory=list)  # 同时保存的其他版本
+    keep_mod_extra_bytes: bool = False  # 更新Mod时，未指定 extra_bytes 则沿用旧Mod末尾的 extra_bytes
+
+    def get_texture_cache(self) -> TextureCache | None:
+        """获取本次保存使用的纹理编码缓存，禁用时返回 None。"""
+        return get_texture_cache() if self.use_texture_cache else None
+
+    def resolve_outputs(self, output_path: Path) -> list[SaveOutput]:
+        """列出主输出和各个版本的输出路径与保存设置。"""
+        outputs = [SaveOutput(output_path, self.compression, self.perform_crc, self.extra_bytes)]
+        for variant in self.variants:
+            outputs.append(SaveOutput(
+                output_path.parent / (variant.subdir or variant.compression) / output_path.name,
+                variant.compression,
+                self.perform_crc if variant.perform_crc is None else variant.perform_crc,
+                self.extra_bytes if variant.extra_bytes is None else variant.extra_bytes,
+            ))
+        return outputs
 
 @dataclass
 class SpineOptions:
@@ -99,7 +188,7 @@ def get_unity_platform_info(input: Path | Env) -> tuple[str, str]:
                          如果找不到则返回 ("UnknownPlatform", "Unknown")
     """
     if isinstance(input, Path):
-        env = load_bundle(str(input))
+        env = load_bundle(input)
     elif isinstance(input, Env):
         env = input
     else:
@@ -112,59 +201,614 @@ def get_unity_platform_info(input: Path | Env) -> tuple[str, str]:
     
     return "UnknownPlatform", "Unknown"
 
+# UnityFS 文件头签名
+UNITYFS_SIGNATURE = b"UnityFS\x00"
+# 解析 UnityFS 头部时预读的字节数，足以覆盖签名、格式版本、两个版本字符串和 bundle 大小字段
+BUNDLE_HEADER_PEEK_SIZE = 256
+# CRC 修正时附加在文件末尾的字节数
+CRC_FIX_SIZE = 4
+
+def parse_declared_bundle_size(header: bytes) -> int | None:
+    """
+    从 UnityFS 文件头中解析声明的 bundle 大小。
+    头部结构: signature(以0结尾) + format(u32) + version_player(以0结尾) + version_engine(以0结尾) + size(i64)
+
+    Returns:
+        声明的 bundle 大小；如果不是 UnityFS 文件或头部不完整则返回 None。
+    """
+    if not header.startswith(UNITYFS_SIGNATURE):
+        return None
+
+    pos = len(UNITYFS_SIGNATURE) + 4
+    for _ in range(2):
+        end = header.find(b"\x00", pos)
+        if end < 0:
+            return None
+        pos = end + 1
+
+    if len(header) < pos + 8:
+        return None
+    return int.from_bytes(header[pos:pos + 8], "big", signed=True)
+
+def _get_declared_size(bundle_path: Path) -> tuple[int, int] | None:
+    """
+    读取 UnityFS 头部声明的大小和实际文件大小，返回 (声明大小, 文件大小)。
+    不是 UnityFS 文件或无法读取时返回 None。
+    """
+    try:
+        file_size = bundle_path.stat().st_size
+        with open(bundle_path, "rb") as f:
+            declared_size = parse_declared_bundle_size(f.read(BUNDLE_HEADER_PEEK_SIZE))
+    except OSError:
+        return None
+
+    if declared_size is None or not 0 < declared_size <= file_size:
+        return None
+    return declared_size, file_size
+
+def _get_trailing_size(bundle_path: Path) -> tuple[int, int] | None:
+    """
+    比较 UnityFS 头部声明的大小和实际文件大小。
+    返回 (声明大小, 文件末尾多余的字节数)；无法识别或没有多余字节时返回 None。
+    """
+    sizes = _get_declared_size(bundle_path)
+    if not sizes or sizes[0] == sizes[1]:
+        return None
+    declared_size, file_size = sizes
+    return declared_size, file_size - declared_size
+
+def get_bundle_suffix(bundle_path: Path) -> bytes:
+    """
+    读取 bundle 文件末尾附加的字节（如 extra_bytes 与 CRC 修正字节），只读取文件头和末尾部分。
+    没有附加字节或无法识别时返回空字节串。
+    """
+    if not (trailing := _get_trailing_size(bundle_path)):
+        return b""
+
+    declared_size, suffix_size = trailing
+    try:
+        with open(bundle_path, "rb") as f:
+            f.seek(declared_size)
+            return f.read(suffix_size)
+    except OSError:
+        return b""
+
+def extract_extra_bytes(suffix: bytes) -> bytes | None:
+    """
+    从 bundle 末尾附加的字节中分离出 extra_bytes。
+    附加字节的最后 4 字节是 CRC 修正值，其余部分即为 CRC 修正前附加的 extra_bytes。
+    """
+    if len(suffix) <= CRC_FIX_SIZE:
+        return None
+    return suffix[:-CRC_FIX_SIZE]
+
+def parse_header_padding(header: bytes) -> tuple[int, int] | None:
+    """
+    从 UnityFS 文件头中找出头部之后的 16 字节对齐填充。
+    头部结构: signature + format(u32) + version_player + version_engine + size(i64)
+             + compressed_blocks_info_size(u32) + uncompressed_blocks_info_size(u32) + flags(u32)
+    format >= 7 时读取方直接跳过这段填充而不检查其内容。
+
+    Returns:
+        (填充起始位置, 填充长度)；不是 UnityFS 文件、format < 7 或头部不完整时返回 None。
+    """
+    if not header.startswith(UNITYFS_SIGNATURE) or len(header) < len(UNITYFS_SIGNATURE) + 4:
+        return None
+
+    pos = len(UNITYFS_SIGNATURE)
+    format_version = int.from_bytes(header[pos:pos + 4], "big")
+    if format_version < 7:
+        return None
+
+    pos += 4
+    for _ in range(2):
+        end = header.find(b"\x00", pos)
+        if end < 0:
+            return None
+        pos = end + 1
+
+    pos += 8 + 4 + 4 + 4
+    if len(header) < pos:
+        return None
+    return pos, (16 - pos % 16) % 16
+
+def find_crc_patch_offset(bundle_path: Path) -> int | None:
+    """
+    查找 bundle 中可以原地改写 4 个 CRC 修正字节而不影响解析的位置。
+    优先使用文件末尾的附加字节（如之前追加的 CRC 修正字节），其次使用头部之后的对齐填充。
+    找不到合适位置时返回 None。
+    """
+    if trailing := _get_trailing_size(bundle_path):
+        declared_size, suffix_size = trailing
+        if suffix_size >= CRC_FIX_SIZE:
+            return declared_size + suffix_size - CRC_FIX_SIZE
+
+    try:
+        with open(bundle_path, "rb") as f:
+            padding = parse_header_padding(f.read(BUNDLE_HEADER_PEEK_SIZE))
+    except OSError:
+        return None
+    if padding and padding[1] >= CRC_FIX_SIZE:
+        return padding[0]
+    return None
+
+# ====== Bundle 缓存 ======
+
+@dataclass
+class BundleCacheStats:
+    """Bundle 缓存的命中统计。"""
+    hits: int = 0
+    misses: int = 0
+    entries: int = 0
+    size_bytes: int = 0
+
+@dataclass
+class _BundleCacheEntry:
+    """缓存条目：解压后的未压缩 bundle 快照，以及恢复原始压缩方式所需的标志。"""
+    stat_key: tuple[int, int]
+    snapshot: bytes
+    dataflags: Any
+    block_info_flags: int
+    suffix: bytes
+
+class BundleCache:
+    """
+    进程级的 bundle 解析缓存，按 (路径, 文件大小, 修改时间) 识别文件。
+
+    缓存中保存的是解压后的未压缩 bundle 快照，每次命中都会从快照重新解析出一个新的 Environment，
+    调用方可以随意修改返回的环境而不会影响缓存。重新解析未压缩数据不需要再做 LZMA/LZ4 解压，
+    因此重复加载同一文件几乎没有开销。
+    生成快照需要完整复制一遍解压后的数据，因此只在同一文件第二次加载时（或调用方明确要求时）才生成，
+    只加载一次的文件（搜索候选、旧Mod等）不会产生额外开销。
+    文件在磁盘上发生变化（大小或修改时间不同）时，旧条目会自动失效。
+    """
+
+    # 记录已加载过一次的文件数量上限，只保存路径和大小/修改时间
+    MAX_SEEN = 4096
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, _BundleCacheEntry] = OrderedDict()
+        self._seen: OrderedDict[str, tuple[int, int]] = OrderedDict()
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _stat_key(bundle_path: Path) -> tuple[str, tuple[int, int]] | None:
+        try:
+            st = bundle_path.stat()
+        except OSError:
+            return None
+        return str(bundle_path.resolve()), (st.st_size, st.st_mtime_ns)
+
+    def get(self, bundle_path: Path) -> tuple[Env, bytes] | None:
+        """
+        从缓存中取出 bundle 的一个新副本。
+        未命中、文件已变化或缓存被禁用时返回 None。
+        """
+        if self.max_bytes <= 0 or not (key := self._stat_key(bundle_path)):
+            return None
+        path_key, stat_key = key
+
+        with self._lock:
+            entry = self._entries.get(path_key)
+            if entry is None or entry.stat_key != stat_key:
+                if entry is not None:
+                    self._remove(path_key)
+                self._misses += 1
+                return None
+            self._entries.move_to_end(path_key)
+            self._hits += 1
+
+        env = UnityPy.load(EndianBinaryReader(entry.snapshot))
+        # 恢复原始的压缩标志，使 "original" 压缩方式保持与源文件一致
+        env.file.dataflags = entry.dataflags
+        env.file._block_info_flags = entry.block_info_flags
+        return env, entry.suffix
+
+    def put(self, bundle_path: Path, env: Env, suffix: bytes, force: bool = False) -> None:
+        """
+        为刚从磁盘加载、尚未修改的环境生成快照并放入缓存。
+        文件第一次加载时只记录下来，第二次加载时才生成快照；force 为 True 时立即生成。
+        无法生成快照的文件（如非 UnityFS 或嵌套 bundle）不会被缓存。
+        """
+        if self.max_bytes <= 0 or not (key := self._stat_key(bundle_path)):
+            return
+        path_key, stat_key = key
+
+        if not force:
+            with self._lock:
+                seen = self._seen.pop(path_key, None)
+                if seen != stat_key:
+                    self._seen[path_key] = stat_key
+                    if len(self._seen) > self.MAX_SEEN:
+                        self._seen.popitem(last=False)
+                    return
+
+        bundle = getattr(env, "file", None)
+        if not isinstance(bundle, BundleFile) or bundle.signature != "UnityFS":
+            return
+
+        # 用各文件的原始（已解压）数据构造一个不压缩的 bundle，避免重新序列化 SerializedFile
+        files = {}
+        for name, f in bundle.files.items():
+            if isinstance(f, SerializedFile):
+                reader = EndianBinaryReader(f.reader.bytes)
+            elif isinstance(f, EndianBinaryReader):
+                reader = EndianBinaryReader(f.bytes)
+            else:
+                return
+            reader.flags = f.flags
+            files[name] = reader
+        shadow = copy.copy(bundle)
+        shadow.files = files
+        try:
+            snapshot = shadow.save(packer=(64, 64))
+        except Exception:
+            return
+
+        if len(snapshot) > self.max_bytes:
+            return
+
+        entry = _BundleCacheEntry(
+            stat_key=stat_key,
+            snapshot=snapshot,
+            dataflags=bundle.dataflags,
+            block_info_flags=getattr(bundle, "_block_info_flags", 64),
+            suffix=suffix,
+        )
+        with self._lock:
+            if path_key in self._entries:
+                self._remove(path_key)
+            self._entries[path_key] = entry
+            self._size += len(snapshot)
+            # 超出内存预算时，按最近最少使用的顺序淘汰
+            while self._size > self.max_bytes and self._entries:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, bundle_path: Path | None = None) -> None:
+        """使指定文件的缓存失效；不指定路径时清空整个缓存。"""
+        with self._lock:
+            if bundle_path is None:
+                self._entries.clear()
+                self._seen.clear()
+                self._size = 0
+                return
+            path_key = str(Path(bundle_path).resolve())
+            self._seen.pop(path_key, None)
+            if path_key in self._entries:
+                self._remove(path_key)
+
+    def stats(self) -> BundleCacheStats:
+        """返回当前的命中统计。"""
+        with self._lock:
+            return BundleCacheStats(self._hits, self._misses, len(self._entries), self._size)
+
+    def reset_stats(self) -> None:
+        """清零命中与未命中计数。"""
+        with self._lock:
+            self._hits = 0
+            self._misses = 0
+
+    def _remove(self, path_key: str) -> None:
+        entry = self._entries.pop(path_key)
+        self._size -= len(entry.snapshot)
+
+# 默认内存预算 (MB)，可通过环境变量 BAMT_BUNDLE_CACHE_MB 调整，设为 0 可禁用缓存
+DEFAULT_BUNDLE_CACHE_MB = 64
+
+def _get_bundle_cache_budget() -> int:
+    try:
+        return int(os.environ.get("BAMT_BUNDLE_CACHE_MB", DEFAULT_BUNDLE_CACHE_MB)) * 1024 * 1024
+    except ValueError:
+        return DEFAULT_BUNDLE_CACHE_MB * 1024 * 1024
+
+bundle_cache = BundleCache(_get_bundle_cache_budget())
+
+def _init_pool_worker() -> None:
+    """
+    进程池工作进程的初始化函数。
+    工作进程中加载的文件大多只使用一次，且每个进程各自持有一份缓存会使内存占用随进程数增长，因此禁用 bundle 缓存。
+    """
+    bundle_cache.max_bytes = 0
+    bundle_cache.invalidate()
+
+def load_bundle_with_suffix(
+    bundle_path: Path,
+    log: LogFunc = no_log,
+    keep_cached: bool = False,
+) -> tuple[Env | None, bytes]:
+    """
+    加载一个 Unity bundle 文件，并返回文件末尾检测到的附加字节。
+    通过比较 UnityFS 头部声明的大小与实际文件大小，一步确定末尾多余的字节数，
+    然后只加载正确长度的零拷贝视图，不再逐个尝试截断。
+    文件通过只读内存映射交给 UnityPy（见 utils.map_file），可用 BAMT_NO_MMAP 回退为普通读取。
+    同一文件第二次加载时结果会放入进程级的 bundle_cache，之后再加载时直接返回缓存中的新副本；
+    keep_cached 为 True 时第一次加载就放入缓存，适用于调用方知道之后还会再次加载的文件。
+
+    Returns:
+        tuple[Env | None, bytes]: (加载的环境, 末尾附加字节) 的元组，加载失败时环境为 None。
+    """
+    if cached := bundle_cache.get(bundle_path):
+        _remember_bundle_source(cached[0], bundle_path)
+        return cached
+
+    sizes = _get_declared_size(bundle_path)
+
+    # 1. 不是可识别的 UnityFS 文件，交给 UnityPy 按路径加载
+    if not sizes:
+        try:
+            return UnityPy.load(str(bundle_path)), b""
+        except Exception:
+            log(f'❌ {t("log.file.load_failed", path=bundle_path)}')
+            return None, b""
+
+    # 2. 通过内存映射只加载头部声明长度的数据，其余部分即为附加字节
+    declared_size, _ = sizes
+    try:
+        with map_file(bundle_path) as view:
+            env = UnityPy.load(EndianBinaryReader(view[:declared_size]))
+            suffix = bytes(view[declared_size:])
+    except OSError as e:
+        log(f'  ❌ {t("log.file.read_in_memory_failed", name=bundle_path.name, error=e)}')
+        return None, b""
+    except Exception:
+        log(f'❌ {t("log.file.load_failed", path=bundle_path)}')
+        return None, b""
+
+    bundle_cache.put(bundle_path, env, suffix, force=keep_cached)
+    _remember_bundle_source(env, bundle_path)
+    return env, suffix
+
 def load_bundle(
     bundle_path: Path,
-    log: LogFunc = no_log
+    log: LogFunc = no_log,
+    keep_cached: bool = False,
 ) -> Env | None:
     """
     尝试加载一个 Unity bundle 文件。
-    如果直接加载失败，会尝试移除末尾的几个字节后再次加载。
+    如果文件末尾有附加字节（如CRC修正字节），会根据文件头声明的大小忽略这些字节。
     """
+    env, _ = load_bundle_with_suffix(bundle_path, log, keep_cached)
+    return env
 
-    # 1. 尝试直接加载
-    try:
-        env = UnityPy.load(str(bundle_path))
-        return env
-    except Exception as e:
-        pass
+# UnityPy 原有的分块压缩函数
+_unitypy_chunk_based_compress = CompressionHelper.chunk_based_compress
+_block_compress_state = threading.local()
+_block_compress_install_lock = threading.Lock()
+_block_compress_users = 0  # 正处于 _block_compression 上下文中的调用数，受 _block_compress_install_lock 保护
+
+@dataclass
+class _SourceBlocks:
+    """保存时可复用的源文件压缩数据块，以及本次保存的复用统计。"""
+    view: memoryview
+    data_start: int
+    blocks: list[tuple[int, int, int]]
+    reused: int = 0
+    total: int = 0
+
+def _compress_chunks(
+    chunks: list[memoryview],
+    block_info_flag: int,
+    max_workers: int = 1,
+) -> list[tuple[bytes, tuple[int, int, int]]]:
+    """
+    按 block_info_flag 指定的方式压缩各个数据块，返回 [(块数据, (解压大小, 压缩大小, 标志))]。
+    与 UnityPy 相同：压缩后反而变大的块按原样存储，并去掉块的压缩标志。
+    max_workers 大于 1 时用线程池并行压缩。
+    """
+    switch = block_info_flag & 0x3F
+    compress_func = CompressionHelper.COMPRESSION_MAP[switch]
+    if max_workers > 1 and len(chunks) > 1:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as executor:
+            compressed_chunks = list(executor.map(compress_func, chunks))
+    else:
+        compressed_chunks = [compress_func(chunk) for chunk in chunks]
+
+    results = []
+    for chunk, compressed in zip(chunks, compressed_chunks):
+        if len(compressed) > len(chunk):
+            results.append((chunk, (len(chunk), len(chunk), block_info_flag ^ switch)))
+        else:
+            results.append((compressed, (len(chunk), len(compressed), block_info_flag)))
+    return results
+
+def _split_chunks(view: memoryview, start: int, end: int, chunk_size: int) -> list[memoryview]:
+    """把 [start, end) 范围按 chunk_size 切分。"""
+    return [view[pos:min(pos + chunk_size, end)] for pos in range(start, end, chunk_size)]
 
-    # 如果直接加载失败，读取文件内容到内存
+def _parallel_chunk_based_compress(data: bytes, block_info_flag: int, max_workers: int) -> tuple[bytes, list]:
+    """
+    CompressionHelper.chunk_based_compress 的并行版本，输出与原函数逐字节一致。
+    各数据块互相独立，用线程池并行压缩后按顺序拼接并生成块信息表。
+    只有按固定大小分块的压缩方式（LZ4/LZ4HC）才会并行；LZMA 在 UnityPy 中整体作为一个块压缩，仍走原函数。
+    """
+    switch = block_info_flag & 0x3F
+    chunk_size = CompressionHelper.COMPRESSION_CHUNK_SIZE_MAP.get(switch)
+    if max_workers <= 1 or switch == 0 or not chunk_size or len(data) <= chunk_size:
+        return _unitypy_chunk_based_compress(data, block_info_flag)
+
+    results = _compress_chunks(_split_chunks(memoryview(data), 0, len(data), chunk_size), block_info_flag, max_workers)
+    return b"".join(chunk for chunk, _ in results), [info for _, info in results]
+
+def _reuse_chunk_based_compress(
+    data: bytes,
+    block_info_flag: int,
+    source: _SourceBlocks,
+    max_workers: int,
+) -> tuple[bytes, list]:
+    """
+    增量压缩：解压后内容与源文件相同的数据块直接复制源文件中的压缩数据，只重新压缩有变化的部分。
+
+    新旧数据的长度差来自某处对象大小的变化：变化之前的块应在原位置，之后的块应整体平移长度差。
+    每个源数据块只解压一次，分别与新数据的原位置和平移后的位置比较，
+    再选一个切分点使复用的块最多；其余范围按压缩方式的块大小切分后重新压缩。
+    """
+    switch = block_info_flag & 0x3F
+    chunk_size = CompressionHelper.COMPRESSION_CHUNK_SIZE_MAP.get(switch)
+    if switch not in CompressionHelper.COMPRESSION_MAP or not chunk_size:
+        return _unitypy_chunk_based_compress(data, block_info_flag)
+
+    view = memoryview(data)
+    count = len(source.blocks)
+    c_starts = []
+    u_starts = []
+    c_pos, u_pos = source.data_start, 0
+    for usize, csize, _ in source.blocks:
+        c_starts.append(c_pos)
+        u_starts.append(u_pos)
+        c_pos += csize
+        u_pos += usize
+    shift = len(data) - u_pos
+
+    def matches(old: bytes, start: int) -> bool:
+        return 0 <= start and start + len(old) <= len(data) and old == view[start:start + len(old)]
+
+    same_place = []
+    shifted = []
+    for index, (usize, csize, flags) in enumerate(source.blocks):
+        decompress = CompressionHelper.DECOMPRESSION_MAP[flags & ArchiveFlags.CompressionTypeMask]
+        old = decompress(source.view[c_starts[index]:c_starts[index] + csize], usize)
+        same_place.append(matches(old, u_starts[index]))
+        shifted.append(matches(old, u_starts[index] + shift) if shift else same_place[-1])
+
+    # 切分点 k 之前的块按原位置复用，之后的块按平移后的位置复用
+    best_k, best = 0, sum(shifted)
+    reusable = best
+    for k in range(count):
+        reusable += same_place[k] - shifted[k]
+        if reusable > best:
+            best_k, best = k + 1, reusable
+
+    # 按新数据的顺序排列复用的块和待压缩的范围，None 表示该位置的块需要重新压缩
+    layout: list[tuple[bytes, tuple[int, int, int]] | None] = []
+    dirty_chunks: list[memoryview] = []
+    pos = 0
+    for index, (usize, csize, flags) in enumerate(source.blocks):
+        reuse, start = (same_place[index], u_starts[index]) if index < best_k else (shifted[index], u_starts[index] + shift)
+        if not reuse or start < pos:
+            continue
+        chunks = _split_chunks(view, pos, start, chunk_size)
+        dirty_chunks += chunks
+        layout += [None] * len(chunks)
+        layout.append((source.view[c_starts[index]:c_starts[index] + csize], (usize, csize, flags)))
+        pos = start + usize
+    chunks = _split_chunks(view, pos, len(data), chunk_size)
+    dirty_chunks += chunks
+    layout += [None] * len(chunks)
+
+    compressed = iter(_compress_chunks(dirty_chunks, block_info_flag, max_workers))
+    results = [item if item is not None else next(compressed) for item in layout]
+
+    source.reused = len(layout) - len(dirty_chunks)
+    source.total = len(layout)
+    return b"".join(chunk for chunk, _ in results), [info for _, info in results]
+
+def _chunk_based_compress(data: bytes, block_info_flag: int) -> tuple[bytes, list]:
+    """替换 CompressionHelper.chunk_based_compress，按当前线程的设置选择增量、并行或原有的压缩方式。"""
+    max_workers = getattr(_block_compress_state, "max_workers", 1)
+    source = getattr(_block_compress_state, "source_blocks", None)
+    if source is not None:
+        return _reuse_chunk_based_compress(data, block_info_flag, source, max_workers)
+    return _parallel_chunk_based_compress(data, block_info_flag, max_workers)
+
+@contextmanager
+def _block_compression(max_workers: int = 1, source_blocks: _SourceBlocks | None = None) -> Iterator[None]:
+    """
+    在上下文内让当前线程的 bundle 保存使用并行块压缩，或复用 source_blocks 中未改动的压缩块。
+    BundleFile.save_fs 通过 CompressionHelper 模块查找压缩函数，因此进入上下文时把模块上的函数替换为 _chunk_based_compress，
+    最后一个使用者退出时再恢复为原函数；替换期间其他线程的保存仍直接调用原函数，不受影响。
+    UnityPy 把 LZMA 数据整体作为一个 0xFFFFFFFF 大小的块压缩，因此 LZMA 不会并行压缩。
+    """
+    global _block_compress_users
+    with _block_compress_install_lock:
+        if _block_compress_users == 0:
+            CompressionHelper.chunk_based_compress = _chunk_based_compress
+        _block_compress_users += 1
+
+    previous = (
+        getattr(_block_compress_state, "max_workers", 1),
+        getattr(_block_compress_state, "source_blocks", None),
+    )
+    _block_compress_state.max_workers = max_workers
+    _block_compress_state.source_blocks = source_blocks
     try:
-        with open(bundle_path, "rb") as f:
-            data = f.read()
-    except Exception as e:
-        log(f'  ❌ {t("log.file.read_in_memory_failed", name=bundle_path.name, error=e)}')
+        yield
+    finally:
+        _block_compress_state.max_workers, _block_compress_state.source_blocks = previous
+        with _block_compress_install_lock:
+            _block_compress_users -= 1
+            # 期间被其他代码再次替换时保留对方的函数
+            if _block_compress_users == 0 and CompressionHelper.chunk_based_compress is _chunk_based_compress:
+                CompressionHelper.chunk_based_compress = _unitypy_chunk_based_compress
+
+# 记录已加载 bundle 的源文件及其 (大小, 修改时间)，以 "original" 方式保存时用于复用未改动的压缩块。
+# 只有 LZ4/LZ4HC 源文件按 128 KB 分块；LZMA 源文件整体是一个块，任何改动都会导致整个文件重新压缩。
+_bundle_sources: "weakref.WeakKeyDictionary[BundleFile, tuple[Path, tuple[int, int]]]" = weakref.WeakKeyDictionary()
+
+def _remember_bundle_source(env: Env, bundle_path: Path) -> None:
+    bundle = getattr(env, "file", None)
+    if isinstance(bundle, BundleFile) and (key := BundleCache._stat_key(bundle_path)):
+        _bundle_sources[bundle] = (bundle_path, key[1])
+
+def _save_reusing_source_blocks(bundle: BundleFile, max_workers: int, log: LogFunc) -> bytes | None:
+    """
+    以原始压缩方式保存，并复用源文件中内容未变的压缩块。
+    源文件未知、已变化或无法解析时返回 None，由调用方按普通方式保存。
+    """
+    if not (source := _bundle_sources.get(bundle)):
+        return None
+    source_path, stat_key = source
+    current = BundleCache._stat_key(source_path)
+    if not current or current[1] != stat_key or not (sizes := _get_declared_size(source_path)):
         return None
 
-    # 定义加载策略：字节移除数量
-    bytes_to_remove = [4, 8, 12]
+    with map_file(source_path) as view:
+        source_view = view[:sizes[0]]
+        try:
+            layout = _read_fs_layout(EndianBinaryReader(source_view))
+        except Exception:
+            layout = None
+        if not layout:
+            return None
+        data_start, blocks, _ = layout
 
-    # 2. 依次尝试不同的加载策略
-    for bytes_num in bytes_to_remove:
-        if len(data) > bytes_num:
-            try:
-                trimmed_data = data[:-bytes_num]
-                env = UnityPy.load(trimmed_data)
-                return env
-            except Exception as e:
-                pass
+        source_blocks = _SourceBlocks(source_view, data_start, blocks)
+        with _block_compression(max_workers, source_blocks):
+            data = bundle.save(packer="original")
 
-    log(f'❌ {t("log.file.load_failed", path=bundle_path)}')
-    return None
+    if source_blocks.total:
+        log(f'  > {t("log.file.reused_blocks", reused=source_blocks.reused, total=source_blocks.total)}')
+    return data
 
 def compress_bundle(
     env: Env,
     compression: CompressionType = "none",
     log: LogFunc = no_log,
+    max_workers: int = 1,
 ) -> bytes:
     """
     从 UnityPy.Environment 对象生成 bundle 文件的字节数据。
     compression: 用于控制压缩方式。
                  - "lzma": 使用 LZMA 压缩。
                  - "lz4": 使用 LZ4 压缩。
-                 - "original": 保留原始压缩方式。
+                 - "original": 保留原始压缩方式。环境由 load_bundle 从文件加载时，
+                   内容未变的数据块直接复制源文件中的压缩数据，只重新压缩有变化的部分
+                   （LZMA 源文件只有一个块，有改动时整体重新压缩）。
                  - "none": 不进行压缩。
+    max_workers: 大于 1 时用线程池并行压缩各个数据块（仅 LZ4 分块压缩有效），输出与串行压缩完全相同。
     """
+    return _compress_bundle_file(env.file, compression, log, max_workers)
+
+def _compress_bundle_file(
+    bundle: BundleFile,
+    compression: CompressionType,
+    log: LogFunc = no_log,
+    max_workers: int = 1,
+) -> bytes:
+    """compress_bundle 的实现，直接作用于 BundleFile。"""
     save_kwargs = {}
     if compression == "original":
         # Not passing the 'packer' argument preserves the original compression.
@@ -173,83 +817,373 @@ def compress_bundle(
         save_kwargs['packer'] = ""  # An empty string typically means no compression.
     else:
         save_kwargs['packer'] = compression
-    
-    return env.file.save(**save_kwargs)
+
+    if compression == "original" and (data := _save_reusing_source_blocks(bundle, max_workers, log)) is not None:
+        return data
+    if max_workers > 1:
+        with _block_compression(max_workers):
+            return bundle.save(**save_kwargs)
+    return bundle.save(**save_kwargs)
+
+def compress_bundle_variants(
+    env: Env,
+    compressions: list[CompressionType],
+    log: LogFunc = no_log,
+    max_workers: int = 1,
+) -> list[bytes]:
+    """
+    用多种压缩方式生成同一个 bundle 的字节数据，返回值与 compressions 一一对应。
+    bundle 中的各个文件只序列化一次，之后每种压缩方式只需拼接和压缩，并在线程池中同时进行。
+    各压缩方式产生的日志在全部完成后按顺序输出。
+    """
+    bundle: BundleFile = env.file
+    if len(compressions) <= 1:
+        return [_compress_bundle_file(bundle, compression, log, max_workers) for compression in compressions]
+
+    files = {}
+    for name, f in bundle.files.items():
+        if isinstance(f, (EndianBinaryReader, EndianBinaryWriter)):
+            reader = EndianBinaryReader(f.bytes)
+        else:
+            reader = EndianBinaryReader(f.save())
+        reader.flags = f.flags
+        files[name] = reader
+    source = _bundle_sources.get(bundle)
+
+    def compress(compression: CompressionType, variant_log: LogFunc) -> bytes:
+        serialized = copy.copy(bundle)
+        serialized.files = files
+        if source:
+            _bundle_sources[serialized] = source
+        return _compress_bundle_file(serialized, compression, variant_log, max_workers)
+
+    logs: list[list[str]] = [[] for _ in compressions]
+    with ThreadPoolExecutor(max_workers=len(compressions)) as executor:
+        futures = [executor.submit(compress, compression, lines.append) for compression, lines in zip(compressions, logs)]
+        results = [future.result() for future in futures]
+    for lines in logs:
+        for line in lines:
+            log(line)
+    return results
+
+# 写入 bundle 文件时每次写入并计算 CRC 的块大小
+_WRITE_CHUNK_SIZE = 1 << 20
+
+def _write_bundle_file(
+    output_path: Path,
+    data: bytes,
+    extra_bytes: bytes | None = None,
+    target_crc: int | None = None,
+) -> bool:
+    """
+    将 bundle 数据分块写入输出目录下的临时文件，写入的同时累计 CRC32。
+    指定 target_crc 时，随后写入 extra_bytes 和由累计 CRC 算出的 4 个修正字节。
+    全部写完后原子地重命名为 output_path，不会拼接出数据的完整副本，也不会留下写了一半的文件。
+
+    Returns:
+        bool: 是否成功写入。CRC 无法修正时返回 False，且不生成文件。
+    """
+    temp_path = output_path.with_name(f".{output_path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        with open(temp_path, "xb") as f:
+            crc = 0
+            view = memoryview(data)
+            for start in range(0, len(view), _WRITE_CHUNK_SIZE):
+                chunk = view[start:start + _WRITE_CHUNK_SIZE]
+                f.write(chunk)
+                if target_crc is not None:
+                    crc = binascii.crc32(chunk, crc)
+
+            if target_crc is not None:
+                if extra_bytes:
+                    f.write(extra_bytes)
+                    crc = binascii.crc32(extra_bytes, crc)
+                correction = CRCUtils.compute_crc_correction(crc, target_crc)
+                if correction is None:
+                    return False
+                f.write(correction)
+
+        os.replace(temp_path, output_path)
+        return True
+    finally:
+        temp_path.unlink(missing_ok=True)
 
 def save_bundle(
     env: Env,
     output_path: Path,
     save_options: SaveOptions,
     log: LogFunc = no_log,
+    source_suffix: bytes = b"",
 ) -> tuple[bool, str]:
     """
     一个辅助函数，用于生成压缩bundle数据，根据需要执行CRC修正，并最终保存到文件。
     封装了保存、CRC修正的逻辑。
     CRC修正使用输出文件名中提取的目标CRC值。
+    source_suffix: 源文件末尾检测到的附加字节。未指定 extra_bytes 时，会从中分离出原有的 extra_bytes 并重新附加。
+    save_options.variants 不为空时，bundle 只序列化一次，同时压缩出各个版本并分别保存（见 SaveVariant）。
 
     Returns:
         tuple(bool, str): (是否成功, 状态消息) 的元组。
     """
     try:
-        # 准备保存信息并记录日志
         compression_map = {
             "lzma": t("log.compression.lzma"),
             "lz4": t("log.compression.lz4"),
             "none": t("log.compression.none"),
             "original": t("log.compression.original")
         }
-        compression_str = compression_map.get(save_options.compression, save_options.compression.upper())
-        crc_status_str = t("common.on") if save_options.perform_crc else t("common.off")
-        log(f"  > {t('log.file.saving_bundle_prefix')} [{t('log.file.compression_method', compression=compression_str)}] [{t('log.file.crc_correction', crc_status=crc_status_str)}]")
+        outputs = save_options.resolve_outputs(output_path)
+
+        # 准备保存信息并记录日志，需要 CRC 修正时先从输出文件名提取目标 CRC
+        target_crcs = []
+        for output in outputs:
+            compression_str = compression_map.get(output.compression, output.compression.upper())
+            crc_status_str = t("common.on") if output.perform_crc else t("common.off")
+            log(f"  > {t('log.file.saving_bundle_prefix')} [{t('log.file.compression_method', compression=compression_str)}] [{t('log.file.crc_correction', crc_status=crc_status_str)}]")
+
+            target_crc = None
+            if output.perform_crc:
+                _, _, _, _, crc_str = parse_filename(output.path.name)
+                if not crc_str or not crc_str.isdigit():
+                    return False, t("message.crc.correction_failed_file_not_generated", name=output.path.name)
+                target_crc = int(crc_str)
+            target_crcs.append(target_crc)
 
         # 从 env 生成修改后的压缩 bundle 数据
-        compressed_data = compress_bundle(env, save_options.compression, log)
+        compressed_datas = compress_bundle_variants(
+            env, [output.compression for output in outputs], log, save_options.max_workers
+        )
 
-        final_data = compressed_data
-        success_message = t("message.save_success")
+        for output, target_crc, compressed_data in zip(outputs, target_crcs, compressed_datas):
+            extra_bytes = None
+            if target_crc is not None:
+                # 未指定extra_bytes时，沿用源文件中检测到的extra_bytes
+                extra_bytes = output.extra_bytes
+                if not extra_bytes and (extra_bytes := extract_extra_bytes(source_suffix)):
+                    log(f"  > {t('log.file.reuse_extra_bytes', extra_bytes=extra_bytes.hex().upper())}")
 
-        if save_options.perform_crc:
-            # 从输出文件名提取目标 CRC
-            _, _, _, _, crc_str = parse_filename(output_path.name)
-            if not crc_str or not crc_str.isdigit():
-                return False, t("message.crc.correction_failed_file_not_generated", name=output_path.name)
-            target_crc = int(crc_str)
+            # 写入文件，CRC 修正失败时不生成文件
+            output.path.parent.mkdir(parents=True, exist_ok=True)
+            if not _write_bundle_file(output.path, compressed_data, extra_bytes, target_crc):
+                return False, t("message.crc.correction_failed_file_not_generated", name=output.path.name)
+            bundle_cache.invalidate(output.path)
+            if output.path != output_path:
+                log(f"  > {t('log.file.variant_saved', path=output.path)}")
 
-            # 如有extra_bytes，先附加到modified_data
-            if save_options.extra_bytes:
-                compressed_data += save_options.extra_bytes
+        return True, t("message.save_success")
 
-            corrected_data = CRCUtils.apply_crc_fix(
-                compressed_data, target_crc
-            )
+    except Exception as e:
+        log(f'❌ {t("log.file.save_failed", path=output_path, error=e)}')
+        log(traceback.format_exc())
+        return False, t("message.save_error", error=e)
 
-            if not corrected_data:
-                return False, t("message.crc.correction_failed_file_not_generated", name=output_path.name)
-            
-            final_data = corrected_data
+# ====== 元数据扫描 ======
+
+class ObjectRecord(NamedTuple):
+    """扫描 bundle 得到的对象元数据记录，不包含对象内容。"""
+    path_id: int
+    class_id: int
+    name: str | None
+    container: str | None
+    byte_start: int
+    byte_size: int
+
+    @property
+    def type(self) -> AssetType:
+        return AssetType(self.class_id)
 
-        # 写入文件
-        with open(output_path, "wb") as f:
-            f.write(final_data)
-        success_message = t("message.save_success")
+class _BlockStream(io.RawIOBase):
+    """
+    把 UnityFS 的压缩数据块拼接成一个可随机访问的只读流。
+    只有实际被读取到的数据块才会被解压，解压结果在同一个 bundle 的多个流之间共享。
+    """
+
+    def __init__(self, view: memoryview, data_start: int, blocks: list[tuple[int, int, int]], cache: dict[int, bytes]):
+        self._view = view
+        self._blocks = blocks
+        self._cache = cache
+        self._u_starts = []
+        self._c_starts = []
+        u_pos, c_pos = 0, data_start
+        for usize, csize, _ in blocks:
+            self._u_starts.append(u_pos)
+            self._c_starts.append(c_pos)
+            u_pos += usize
+            c_pos += csize
+        self._length = u_pos
+        self._pos = 0
+
+    def _block(self, index: int) -> bytes:
+        if (data := self._cache.get(index)) is None:
+            usize, csize, flags = self._blocks[index]
+            start = self._c_starts[index]
+            compressed = self._view[start:start + csize]
+            decompress = CompressionHelper.DECOMPRESSION_MAP[flags & ArchiveFlags.CompressionTypeMask]
+            data = self._cache[index] = bytes(decompress(compressed, usize))
+        return data
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += self._length
+        self._pos = max(0, offset)
+        return self._pos
+
+    def readinto(self, buffer) -> int:
+        out = memoryview(buffer).cast("B")
+        written = 0
+        while written < len(out) and self._pos < self._length:
+            index = bisect.bisect_right(self._u_starts, self._pos) - 1
+            block = self._block(index)
+            start = self._pos - self._u_starts[index]
+            chunk = block[start:start + len(out) - written]
+            out[written:written + len(chunk)] = chunk
+            written += len(chunk)
+            self._pos += len(chunk)
+        return written
+
+def _read_fs_layout(reader: EndianBinaryReader) -> tuple[int, list[tuple[int, int, int]], list[tuple[int, int, str]]] | None:
+    """
+    解析 UnityFS 头部和块信息，不解压数据块。
+    与 UnityPy 的 BundleFile.read_fs 保持一致。
+
+    Returns:
+        (数据块起始偏移, [(解压大小, 压缩大小, 标志)], [(节点偏移, 节点大小, 节点路径)])；
+        加密的 bundle 返回 None。
+    """
+    if reader.read_string_to_null() != "UnityFS":
+        return None
+    format_version = reader.read_u_int()
+    reader.read_string_to_null()  # version_player
+    version_engine = reader.read_string_to_null()
+    reader.read_long()  # bundle size
+    compressed_size = reader.read_u_int()
+    uncompressed_size = reader.read_u_int()
+    flags_value = reader.read_u_int()
+
+    match = re.match(r"(\d+)\.(\d+)\.(\d+)", version_engine)
+    version = tuple(int(x) for x in match.groups()) if match else (0, 0, 0)
+    if (
+        version < (2020,)
+        or (version[0] == 2020 and version < (2020, 3, 34))
+        or (version[0] == 2021 and version < (2021, 3, 2))
+        or (version[0] == 2022 and version < (2022, 1, 1))
+    ):
+        flags = ArchiveFlagsOld(flags_value)
+    else:
+        flags = ArchiveFlags(flags_value)
+    if flags & flags.UsesAssetBundleEncryption:
+        return None
 
-        return True, success_message
+    if format_version >= 7:
+        reader.align_stream(16)
+    elif version >= (2019, 4):
+        pre_align = reader.Position
+        if any(reader.read((16 - pre_align % 16) % 16)):
+            reader.Position = pre_align
+
+    start = reader.Position
+    if flags & ArchiveFlags.BlocksInfoAtTheEnd:
+        reader.Position = reader.Length - compressed_size
+        info_bytes = reader.read_bytes(compressed_size)
+        reader.Position = start
+    else:
+        info_bytes = reader.read_bytes(compressed_size)
+
+    decompress = CompressionHelper.DECOMPRESSION_MAP[flags & ArchiveFlags.CompressionTypeMask]
+    info = EndianBinaryReader(bytes(decompress(info_bytes, uncompressed_size)))
+    info.read_bytes(16)  # uncompressedDataHash
+    blocks = [(info.read_u_int(), info.read_u_int(), info.read_u_short()) for _ in range(info.read_int())]
+    nodes = []
+    for _ in range(info.read_int()):
+        offset, size = info.read_long(), info.read_long()
+        info.read_u_int()  # flags
+        nodes.append((offset, size, info.read_string_to_null()))
+
+    if isinstance(flags, ArchiveFlags) and flags & ArchiveFlags.BlockInfoNeedPaddingAtStart:
+        reader.align_stream(16)
+    return reader.Position, blocks, nodes
+
+def _peek_object_name(obj: Obj) -> str | None:
+    """只读取对象开头到名称字段为止的数据，不像 peek_name 那样读取整个对象。"""
+    peek = obj._get_typetree_node().get_name_peek_node()
+    if not peek:
+        return None
+    node, key = peek
+    obj.reset()
+    return TypeTreeHelper.read_typetree(node, obj.reader, as_dict=True, check_read=False)[key]
+
+def scan_bundle(bundle_path: Path, log: LogFunc = no_log) -> list[ObjectRecord] | None:
+    """
+    只读取 bundle 的目录、SerializedFile 的对象表和名称字段，列出其中的对象，不反序列化对象内容。
+    只有包含这些元数据的数据块会被解压，.resS 等资源数据不会被读取。
+
+    Returns:
+        对象记录列表；不是可扫描的 UnityFS 文件（如加密或格式不支持）时返回 None，调用方应回退到 load_bundle。
+    """
+    if not (sizes := _get_declared_size(bundle_path)):
+        return None
+    declared_size, _ = sizes
 
+    try:
+        with map_file(bundle_path) as view:
+            reader = EndianBinaryReader(view[:declared_size])
+            if not (layout := _read_fs_layout(reader)):
+                return None
+            data_start, blocks, nodes = layout
+
+            records: list[ObjectRecord] = []
+            cache: dict[int, bytes] = {}
+            for offset, size, name in nodes:
+                if name.endswith((".resS", ".resource")):
+                    continue
+                stream = io.BufferedReader(_BlockStream(view, data_start, blocks, cache), buffer_size=4096)
+                stream.seek(offset)
+                node_reader = EndianBinaryReader(stream, offset=offset)
+                try:
+                    serialized = SerializedFile(node_reader, name=name)
+                except Exception:
+                    # 不是 SerializedFile 的节点（如其他资源文件）
+                    continue
+                for obj in serialized.objects.values():
+                    try:
+                        obj_name = _peek_object_name(obj)
+                    except Exception:
+                        obj_name = None
+                    records.append(ObjectRecord(
+                        obj.path_id, obj.class_id, obj_name, obj.container, obj.byte_start, obj.byte_size
+                    ))
+            return records
     except Exception as e:
-        log(f'❌ {t("log.file.save_failed", path=output_path, error=e)}')
-        log(traceback.format_exc())
-        return False, t("message.save_error", error=e)
+        log(f'  > {t("log.search.scan_failed", name=bundle_path.name, error=e)}')
+        return None
 
 
 # ====== 寻找对应文件 ======
 
+# 日服文件名中日期前可能出现的额外资源类型部分
+JP_EXTRA_RESOURCE_TYPES = {
+    'textures', 'assets', 'textassets', 'materials',
+    "animationclip", "audio", "meshes", "prefabs", "timelines"
+}
+
 def get_filename_prefix(filename: str, log: LogFunc = no_log) -> tuple[str | None, str]:
     """
     从旧版Mod文件名中提取用于搜索新版文件的前缀。
     返回 (前缀字符串, 状态消息) 的元组。
     """
     # 1. 通过日期模式确定文件名位置
-    date_match = re.search(r'\d{4}-\d{2}-\d{2}', filename)
+    date_match = _DATE_RE.search(filename)
     if not date_match:
         msg = t("message.search.date_pattern_not_found", filename=filename)
         log(f'  > {t("common.fail")}: {msg}')
@@ -264,12 +1198,7 @@ def get_filename_prefix(filename: str, log: LogFunc = no_log) -> tuple[str | Non
     last_part = parts[-1] if parts else ''
     
     # 检查最后一个部分是否是日服版额外的资源类型
-    resource_types = {
-        'textures', 'assets', 'textassets', 'materials',
-        "animationclip", "audio", "meshes", "prefabs", "timelines"
-    }
-    
-    if last_part.lower() in resource_types:
+    if last_part.lower() in JP_EXTRA_RESOURCE_TYPES:
         # 如果找到了资源类型，则前缀不应该包含这个部分
         search_prefix = before_date.removesuffix(f'-{last_part}') + '-'
     else:
@@ -289,6 +1218,14 @@ FIXED_PREFIX = [
     "assets-_mx-",
 ]
 
+# 预编译的文件名解析正则
+_CRC_RE = re.compile(r'_(\d+)\.[^.]+$')
+_DATE_RE = re.compile(r'\d{4}-\d{2}-\d{2}')
+_DASH_DATE_RE = re.compile(r'-\d{4}-\d{2}-\d{2}')
+_TYPE_RE = re.compile(r'[-_](?:mxdependency|mxload)-([a-zA-Z0-9]+)')
+_MX_RE = re.compile(r'[-_](?:mxdependency|mxload)')
+_YEAR_RE = re.compile(r'^\d{4}$')
+
 def extract_core_filename(filename: str) -> str:
     """
     文件名核心提取函数
@@ -314,37 +1251,37 @@ def parse_filename(filename: str) -> tuple[str | None, str, str | None, str, str
     """
     # 提取 CRC32
     crc = ""
-    match_crc = re.search(r'_(\d+)\.[^.]+$', filename)
+    match_crc = _CRC_RE.search(filename)
     if match_crc:
         crc = match_crc.group(1)
 
     # 提取 Date
     date = ""
-    match_date = re.search(r'(\d{4}-\d{2}-\d{2})', filename)
+    match_date = _DATE_RE.search(filename)
     if match_date:
-        date = match_date.group(1)
+        date = match_date.group(0)
 
     # 提取 Type
     res_type = None
     # 匹配 -mxdependency-xxx 或 _mxload-xxx
-    match_type = re.search(r'[-_](?:mxdependency|mxload)-([a-zA-Z0-9]+)', filename)
+    match_type = _TYPE_RE.search(filename)
     if match_type:
         res_type = match_type.group(1)
         # 如果提取出的 type 是年份，说明实际上没有 type，而是直接接了日期
-        if re.match(r'^\d{4}$', res_type):
+        if _YEAR_RE.match(res_type):
             res_type = None
 
     # 提取 Core（从后往前，找到 _mxdependency 或 _mxload 之前的部分）
     core = ""
 
     # 找到最早的 _mxdependency 或 _mxload 位置
-    mx_match = re.search(r'[-_](?:mxdependency|mxload)', filename)
+    mx_match = _MX_RE.search(filename)
     if mx_match:
         # Core 是这之前的部分
         core_part = filename[:mx_match.start()]
     else:
         # 如果没找到，尝试用日期作为分隔
-        date_match = re.search(r'-\d{4}-\d{2}-\d{2}', filename)
+        date_match = _DASH_DATE_RE.search(filename)
         if date_match:
             core_part = filename[:date_match.start()]
         else:
@@ -372,13 +1309,364 @@ def parse_filename(filename: str) -> tuple[str | None, str, str | None, str, str
     return (category, core, res_type, date, crc)
 
 
+# ====== 资源目录索引 ======
+
+class CatalogEntry(NamedTuple):
+    """资源目录中一个文件的信息。"""
+    path: Path
+    category: str | None
+    core: str
+    type: str | None
+    date: str
+    crc: str
+    size: int
+    mtime_ns: int
+
+class ResourceCatalog:
+    """
+    游戏资源目录的文件名索引。
+
+    构建时用 os.scandir 扫描一次所有搜索目录，文件大小和修改时间保存在紧凑数组中，
+    文件名解析结果 (category, core, type, date, crc) 在第一次访问时缓存。
+    文件名按字典序排列，前缀查询和同名查询通过二分查找完成；核心名称另有哈希索引。
+    之后的查询不再访问文件系统，直到调用 refresh()。
+    """
+
+    def __init__(self, search_dirs: list[Path]):
+        self.search_dirs = [Path(d) for d in search_dirs]
+        self.refresh()
+
+    def refresh(self) -> None:
+        """重新扫描所有搜索目录。"""
+        files: list[tuple[str, int, int, int]] = []
+        dir_mtimes = []
+        for dir_index, directory in enumerate(self.search_dirs):
+            try:
+                dir_mtime = directory.stat().st_mtime_ns
+                with os.scandir(directory) as it:
+                    dir_files = []
+                    for entry in it:
+                        if entry.is_file():
+                            st = entry.stat()
+                            dir_files.append((entry.name, dir_index, st.st_size, st.st_mtime_ns))
+            except OSError:
+                dir_mtimes.append(None)
+                continue
+            dir_mtimes.append(dir_mtime)
+            files.extend(dir_files)
+        # 同名文件按搜索目录的顺序排列
+        files.sort(key=lambda f: (f[0], f[1]))
+
+        self._dir_mtimes = dir_mtimes
+        self._names = [f[0] for f in files]
+        self._dir_index = array("H", (f[1] for f in files))
+        self._sizes = array("q", (f[2] for f in files))
+        self._mtimes = array("q", (f[3] for f in files))
+
+        # 文件名解析结果按需填充，核心名称索引在第一次按核心名称查询时构建
+        self._parsed: list[tuple[str | None, str, str | None, str, str] | None] = [None] * len(files)
+        self._core_index: dict[str, list[int]] | None = None
+
+    def _parse(self, i: int) -> tuple[str | None, str, str | None, str, str]:
+        if (parsed := self._parsed[i]) is None:
+            category, core, res_type, date, crc = parse_filename(self._names[i])
+            parsed = self._parsed[i] = (
+                sys.intern(category) if category else None,
+                sys.intern(core),
+                sys.intern(res_type) if res_type else None,
+                sys.intern(date),
+                crc,
+            )
+        return parsed
+
+    def is_stale(self) -> bool:
+        """检查搜索目录是否有文件增删（目录修改时间变化），只访问目录本身。"""
+        for directory, mtime in zip(self.search_dirs, self._dir_mtimes):
+            try:
+                current = directory.stat().st_mtime_ns
+            except OSError:
+                current = None
+            if current != mtime:
+                return True
+        return False
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def _entry(self, i: int) -> CatalogEntry:
+        return CatalogEntry(
+            self.search_dirs[self._dir_index[i]] / self._names[i],
+            *self._parse(i),
+            self._sizes[i],
+            self._mtimes[i],
+        )
+
+    def with_prefix(self, prefix: str) -> list[CatalogEntry]:
+        """查找文件名以 prefix 开头的所有文件，先按搜索目录的顺序、再按文件名排列。"""
+        start = bisect.bisect_left(self._names, prefix)
+        end = start
+        while end < len(self._names) and self._names[end].startswith(prefix):
+            end += 1
+        indices = sorted(range(start, end), key=lambda i: self._dir_index[i])
+        return [self._entry(i) for i in indices]
+
+    def find_by_name(self, name: str) -> list[CatalogEntry]:
+        """查找所有同名文件，按搜索目录的顺序返回。"""
+        start = bisect.bisect_left(self._names, name)
+        end = bisect.bisect_right(self._names, name)
+        return [self._entry(i) for i in range(start, end)]
+
+    def find_by_core(self, core: str) -> list[CatalogEntry]:
+        """查找核心名称相同的所有文件。"""
+        if self._core_index is None:
+            index: dict[str, list[int]] = {}
+            for i in range(len(self._names)):
+                index.setdefault(self._parse(i)[1], []).append(i)
+            self._core_index = index
+        return [self._entry(i) for i in self._core_index.get(core, [])]
+
+def _get_catalog(search_dirs: "Path | list[Path] | ResourceCatalog | SearchContext") -> ResourceCatalog:
+    if isinstance(search_dirs, ResourceCatalog):
+        return search_dirs
+    if isinstance(search_dirs, SearchContext):
+        return search_dirs.catalog
+    return ResourceCatalog([search_dirs] if isinstance(search_dirs, Path) else search_dirs)
+
+
+# 用于识别新旧文件对应关系的资源类型
+COMPARABLE_ASSET_TYPES = {AssetType.Texture2D, AssetType.TextAsset, AssetType.Mesh}
+
+def get_bundle_records(bundle_path: Path, log: LogFunc = no_log) -> list[ObjectRecord] | None:
+    """
+    列出 bundle 中所有对象的元数据记录。
+    优先使用 scan_bundle 只读取元数据，无法扫描时回退到完整加载。
+    加载失败时返回 None。
+    """
+    if (records := scan_bundle(bundle_path, log)) is not None:
+        return records
+
+    if not (env := load_bundle(bundle_path, log)):
+        return None
+    return [
+        ObjectRecord(obj.path_id, obj.class_id, obj.peek_name(), obj.container, obj.byte_start, obj.byte_size)
+        for obj in env.objects
+    ]
+
+def _get_comparable_keys(bundle_path: Path, log: LogFunc = no_log) -> set[NameTypeKey] | None:
+    """
+    获取 bundle 中可比较资源的 (名称, 类型) 指纹。
+    加载失败时返回 None。
+    """
+    if (records := get_bundle_records(bundle_path, log)) is None:
+        return None
+    return {
+        NameTypeKey(record.name, record.type.name)
+        for record in records
+        if record.class_id in COMPARABLE_ASSET_TYPES
+    }
+
+@dataclass
+class SearchStats:
+    """SearchContext 的缓存命中统计。"""
+    prefix_lookups: int = 0
+    prefix_hits: int = 0
+    fingerprint_lookups: int = 0
+    fingerprint_hits: int = 0
+
+    @staticmethod
+    def _rate(hits: int, lookups: int) -> str:
+        return f"{hits / lookups:.0%}" if lookups else "-"
+
+    @property
+    def prefix_hit_rate(self) -> str:
+        return self._rate(self.prefix_hits, self.prefix_lookups)
+
+    @property
+    def fingerprint_hit_rate(self) -> str:
+        return self._rate(self.fingerprint_hits, self.fingerprint_lookups)
+
+_MISSING = object()
+
+class SearchContext:
+    """
+    批量查找新版bundle文件时共享的搜索上下文，每个批次构建一次。
+
+    包装一个 ResourceCatalog（目录只扫描一次，文件名只解析一次），并在多个Mod之间缓存：
+    - 每个文件名前缀的候选文件列表，多个Mod共享同一前缀（如 spinecharacters）时直接复用；
+    - 已检查过的候选文件的可比较资源指纹，按 (路径, 大小, 修改时间) 识别，文件变化后自动失效。
+    并行比对候选文件的进程池也由上下文持有，第一次需要时创建，之后的查找都复用它，
+    不必为每个Mod重新启动工作进程。使用完毕后应调用 close()，或将上下文用于 with 语句。
+    stats 记录两种缓存的命中次数，可在批量处理结束后输出。
+    """
+
+    def __init__(self, search_paths: "Path | list[Path] | ResourceCatalog"):
+        self.catalog = _get_catalog(search_paths)
+        self.stats = SearchStats()
+        self._candidates: dict[str, list[CatalogEntry]] = {}
+        self._fingerprints: dict[Path, tuple[tuple[int, int], frozenset[NameTypeKey] | None]] = {}
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "SearchContext":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def executor(self, max_workers: int) -> ProcessPoolExecutor:
+        """获取共享的进程池，第一次调用时按 max_workers 创建。"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=max_workers, initializer=_init_pool_worker)
+            return self._executor
+
+    def close(self) -> None:
+        """关闭共享的进程池，取消尚未开始的任务。"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def candidates(self, prefix: str) -> list[CatalogEntry]:
+        """查找文件名以 prefix 开头的候选文件，同一前缀只查询一次目录索引。"""
+        with self._lock:
+            self.stats.prefix_lookups += 1
+            if (entries := self._candidates.get(prefix)) is not None:
+                self.stats.prefix_hits += 1
+                return entries
+            entries = self._candidates[prefix] = self.catalog.with_prefix(prefix)
+            return entries
+
+    def cached_keys(self, entry: CatalogEntry) -> "frozenset[NameTypeKey] | None | object":
+        """查询候选文件的缓存指纹，未缓存时返回 _MISSING。"""
+        with self._lock:
+            self.stats.fingerprint_lookups += 1
+            cached = self._fingerprints.get(entry.path)
+            if cached is None or cached[0] != (entry.size, entry.mtime_ns):
+                return _MISSING
+            self.stats.fingerprint_hits += 1
+            return cached[1]
+
+    def store_keys(self, entry: CatalogEntry, keys: set[NameTypeKey] | None) -> None:
+        """缓存候选文件的指纹（无法加载的文件缓存为 None）。"""
+        with self._lock:
+            self._fingerprints[entry.path] = (
+                (entry.size, entry.mtime_ns), frozenset(keys) if keys is not None else None
+            )
+
+    def get_comparable_keys(self, entry: CatalogEntry, log: LogFunc = no_log) -> frozenset[NameTypeKey] | None:
+        """获取候选文件的指纹，优先使用缓存。"""
+        if (keys := self.cached_keys(entry)) is not _MISSING:
+            return keys
+        keys = _get_comparable_keys(entry.path, log)
+        self.store_keys(entry, keys)
+        return frozenset(keys) if keys is not None else None
+
+def _get_search_context(search_paths: "Path | list[Path] | ResourceCatalog | SearchContext") -> SearchContext:
+    if isinstance(search_paths, SearchContext):
+        return search_paths
+    return SearchContext(search_paths)
+
+def _match_candidates_parallel(
+    candidates: list[CatalogEntry],
+    fingerprint: set[NameTypeKey],
+    max_workers: int,
+    first_match_only: bool,
+    log: LogFunc = no_log,
+    context: SearchContext | None = None,
+    executor: ProcessPoolExecutor | None = None,
+) -> list[Path]:
+    """
+    使用进程池并行比对候选文件，按候选顺序返回匹配的文件。
+    first_match_only 为 True 时，一旦排在最前的匹配确定（它之前的候选都已确认不匹配），
+    立即返回并取消尚未开始的比对。
+    提供 context 时，已缓存指纹的候选文件不再提交到进程池，新计算的指纹（包括提前返回后仍在运行的比对的结果）也会存入缓存。
+    提供 executor 时使用调用方的进程池且不关闭它，多次查找可以共用同一个进程池；否则为本次调用单独创建一个。
+    """
+    results: dict[int, bool] = {}
+
+    def check(i: int, keys: set[NameTypeKey] | None) -> None:
+        log(f"  - {t('log.search.checking_candidate', name=candidates[i].path.name)}")
+        results[i] = keys is not None and not keys.isdisjoint(fingerprint)
+        if results[i]:
+            log(f"  ✅ {t('message.search.new_file_confirmed', name=candidates[i].path.name)}")
+
+    def first_match() -> list[Path] | None:
+        # 找到按候选顺序排在最前、且之前的候选都已完成的匹配
+        for i in range(len(candidates)):
+            if i not in results:
+                return None
+            if results[i]:
+                return [candidates[i].path]
+        return None
+
+    uncached = []
+    for i, entry in enumerate(candidates):
+        if context is not None and (keys := context.cached_keys(entry)) is not _MISSING:
+            check(i, keys)
+        else:
+            uncached.append(i)
+    if first_match_only and (match := first_match()) is not None:
+        return match
+
+    def future_keys(future) -> set[NameTypeKey] | None:
+        try:
+            return future.result()
+        except Exception:
+            return None
+
+    def store(entry: CatalogEntry, future) -> None:
+        if not future.cancelled():
+            context.store_keys(entry, future_keys(future))
+
+    if uncached:
+        owns_executor = executor is None
+        if owns_executor:
+            executor = ProcessPoolExecutor(max_workers=min(max_workers, len(uncached)), initializer=_init_pool_worker)
+        futures = {}
+        try:
+            for i in uncached:
+                future = executor.submit(_get_comparable_keys, candidates[i].path)
+                if context is not None:
+                    future.add_done_callback(partial(store, candidates[i]))
+                futures[future] = i
+            pending = set(futures)
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    check(futures[future], future_keys(future))
+
+                if first_match_only and (match := first_match()) is not None:
+                    return match
+        finally:
+            if owns_executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+            else:
+                # 调用方的进程池继续保留，只取消本次查找中尚未开始的比对
+                for future in futures:
+                    future.cancel()
+
+    return [candidates[i].path for i in sorted(results) if results[i]]
+
 def find_new_bundle_path(
     old_mod_path: Path,
-    game_resource_dir: Path | list[Path],
+    game_resource_dir: "Path | list[Path] | ResourceCatalog | SearchContext",
     log: LogFunc = no_log,
+    index: "BundleIndex | None" = None,
+    max_workers: int = 1,
+    first_match_only: bool = False,
+    executor: ProcessPoolExecutor | None = None,
 ) -> tuple[list[Path], str]:
     """
     根据旧版Mod文件，在游戏资源目录中智能查找对应的新版文件。
+    game_resource_dir: 搜索目录，也可以传入已构建的 ResourceCatalog 以避免重复扫描目录，
+                       或传入 SearchContext 以在多次查找之间复用候选列表和候选文件的指纹。
+    index: 可选的持久化指纹索引。提供时候选文件的比对改为索引查询，只重新扫描有变化的文件。
+    max_workers: 大于 1 时使用进程池并行比对候选文件。
+    first_match_only: 只需要第一个匹配时设为 True，确认匹配后立即返回并取消剩余的比对。
+                      返回的仍是按候选顺序排在最前的匹配，与顺序比对的结果一致。
+    executor: 可选的进程池，多次查找时传入同一个进程池以避免每次重新启动工作进程，调用方负责关闭。
+              未提供时，传入 SearchContext 则使用它持有的进程池。
     
     Returns:
         tuple[list[Path], str]: (找到的路径列表, 状态消息)
@@ -398,14 +1686,10 @@ def find_new_bundle_path(
     extension_backup = '.backup'
 
     # 2. 收集所有候选文件
-    search_dirs = [game_resource_dir] if isinstance(game_resource_dir, Path) else game_resource_dir
-    
-    candidates = [
-        file for dir in search_dirs 
-        if dir.exists() and dir.is_dir()
-        for file in dir.iterdir()
-        if file.is_file() and file.name.startswith(prefix) and file.suffix != extension_backup
-    ]
+    context = game_resource_dir if isinstance(game_resource_dir, SearchContext) else None
+    entries = context.candidates(prefix) if context else _get_catalog(game_resource_dir).with_prefix(prefix)
+    entries = [entry for entry in entries if entry.path.suffix != extension_backup]
+    candidates = [entry.path for entry in entries]
     
     if not candidates:
         msg = t("message.search.no_matching_files_in_dir")
@@ -414,25 +1698,11 @@ def find_new_bundle_path(
     log(f"  > {t('log.search.found_candidates', count=len(candidates))}")
 
     # 3. 分析旧Mod的关键资源特征
-    # 定义用于识别的资源类型
-    comparable_types = {AssetType.Texture2D, AssetType.TextAsset, AssetType.Mesh}
-    
-    if not (old_env := load_bundle(old_mod_path, log)):
+    if (old_assets_fingerprint := _get_comparable_keys(old_mod_path, log)) is None:
         msg = t("message.search.load_old_mod_failed")
         log(f'  > {t("common.fail")}: {msg}')
         return [], msg
 
-    # 使用标准策略生成 Key，保持一致性
-    key_func = MATCH_STRATEGIES['name_type']
-    
-    # 仅提取 Key，不读取数据
-    # 使用 set 推导式构建指纹
-    old_assets_fingerprint = {
-        key_func(obj)
-        for obj in old_env.objects
-        if obj.type in comparable_types
-    }
-
     if not old_assets_fingerprint:
         msg = t("message.search.no_comparable_assets")
         log(f'  > {t("common.fail")}: {msg}')
@@ -441,26 +1711,40 @@ def find_new_bundle_path(
     log(f"  > {t('log.search.old_mod_asset_count', count=len(old_assets_fingerprint))}")
 
     # 4. 遍历候选文件进行指纹比对，收集所有匹配的文件
-    matched_paths = []
-    for candidate_path in candidates:
-        log(f"  - {t('log.search.checking_candidate', name=candidate_path.name)}")
-        
-        if not (env := load_bundle(candidate_path, log)):
-            continue
-        
-        # 检查新包中是否有匹配的资源
-        has_match = False
-        for obj in env.objects:
-            if obj.type in comparable_types:
-                candidate_key = key_func(obj)
-                if candidate_key in old_assets_fingerprint:
-                    has_match = True
+    if index is not None:
+        # 使用持久化索引查询，只重新扫描有变化的文件
+        matched_paths = index.find_matches(candidates, old_assets_fingerprint, log)
+        if first_match_only:
+            matched_paths = matched_paths[:1]
+        for candidate_path in matched_paths:
+            log(f"  ✅ {t('message.search.new_file_confirmed', name=candidate_path.name)}")
+    elif max_workers > 1 and len(candidates) > 1:
+        if executor is None and context is not None:
+            executor = context.executor(max_workers)
+        matched_paths = _match_candidates_parallel(
+            entries, old_assets_fingerprint, max_workers, first_match_only, log, context, executor
+        )
+    else:
+        # 只扫描元数据，不加载完整的 bundle
+        matched_paths = []
+        for entry in entries:
+            candidate_path = entry.path
+            log(f"  - {t('log.search.checking_candidate', name=candidate_path.name)}")
+
+            if context is not None:
+                candidate_keys = context.get_comparable_keys(entry, log)
+            else:
+                candidate_keys = _get_comparable_keys(candidate_path, log)
+            if candidate_keys is None:
+                continue
+
+            # 检查新包中是否有匹配的资源
+            if not candidate_keys.isdisjoint(old_assets_fingerprint):
+                matched_paths.append(candidate_path)
+                msg = t("message.search.new_file_confirmed", name=candidate_path.name)
+                log(f"  ✅ {msg}")
+                if first_match_only:
                     break
-        
-        if has_match:
-            matched_paths.append(candidate_path)
-            msg = t("message.search.new_file_confirmed", name=candidate_path.name)
-            log(f"  ✅ {msg}")
     
     if not matched_paths:
         msg = t("message.search.no_matching_asset_found")
@@ -471,13 +1755,388 @@ def find_new_bundle_path(
     log(f"  > {msg}")
     return matched_paths, msg
 
-# ====== 资源处理相关 ======
+# ====== 资源处理相关 ======
+
+# 按各策略匹配时依次尝试的顺序
+# container 策略不使用：多个Mesh可能共享同一个Container，这个策略很可能失效
+MIGRATION_STRATEGIES: list[str] = ['path_id', 'cont_name_type', 'name_type']
+
+class ObjectIndex:
+    """
+    一个或多个 Environment 中可替换对象的多策略键索引。
+
+    对每个 Environment 只遍历一次对象表，为 MATCH_STRATEGIES 中的每种策略分别建立 键 -> ObjectReader 的字典。
+    键只由元数据和名称字段生成，不会反序列化对象。
+    同一个 Environment 中重复的键默认保留第一个对象（与替换时只写入第一个匹配的目标对象一致），
+    keep_last 为 True 时保留最后一个（与替换来源 replacement_map 中后出现者覆盖前者的规则一致）；
+    多个 Environment 中重复的键以后加入的为准。
+    作为替换来源时，每个对象的资源内容只解码一次，之后不论使用哪种策略、写入哪个目标都复用同一份内容。
+    """
+
+    def __init__(self):
+        self.by_strategy: dict[str, dict[AssetKey, Obj]] = {name: {} for name in MATCH_STRATEGIES}
+        self._count = 0
+        # 来源资源的延迟内容，按 (SerializedFile, path_id) 缓存，各策略和各目标文件共用
+        self._contents: dict[tuple[int, int], LazyAssetContent] = {}
+
+    @classmethod
+    def from_env(
+        cls,
+        env: Env,
+        asset_types: set[str] | None = None,
+        named_only: bool = False,
+        log: LogFunc = no_log,
+        keep_last: bool = False,
+    ) -> "ObjectIndex":
+        index = cls()
+        index.add(env, asset_types, named_only, log, keep_last)
+        return index
+
+    def add(
+        self,
+        env: Env,
+        asset_types: set[str] | None = None,
+        named_only: bool = False,
+        log: LogFunc = no_log,
+        keep_last: bool = False,
+    ) -> None:
+        """
+        将 env 中的可替换对象加入索引。
+
+        Args:
+            env: UnityPy 环境。
+            asset_types: 只索引这些类型的对象（如 {"Texture2D", "TextAsset"}），None 或包含 "ALL" 时索引所有可替换类型。
+            named_only: 是否跳过没有名称的对象（作为替换来源时，无名对象不参与替换）。
+            log: 日志记录函数。
+            keep_last: 同一个 env 中重复的键是否保留最后一个对象（作为替换来源时使用）。
+        """
+        include_all = asset_types is None or "ALL" in asset_types
+        put = dict.__setitem__ if keep_last else dict.setdefault
+        keys: dict[str, dict[AssetKey, Obj]] = {name: {} for name in MATCH_STRATEGIES}
+        for obj in env.objects:
+            if obj.type not in REPLACEABLE_ASSET_TYPES:
+                continue
+            if not include_all and obj.type.name not in asset_types:
+                continue
+            try:
+                name = _peek_object_name(obj)
+            except Exception as e:
+                log(f"  > ⚠️ {t('log.extractor.extraction_failed', name=obj.path_id, error=e)}")
+                continue
+            if named_only and not name:
+                continue
+
+            container = obj.container
+            type_name = obj.type.name
+            put(keys['path_id'], obj.path_id, obj)
+            if container is not None:
+                put(keys['container'], container, obj)
+            put(keys['name_type'], NameTypeKey(name, type_name), obj)
+            put(keys['cont_name_type'], ContNameTypeKey(container, name, type_name), obj)
+            self._count += 1
+
+        for name, strategy_keys in keys.items():
+            self.by_strategy[name].update(strategy_keys)
+
+    def __len__(self) -> int:
+        """已加入索引的对象数量。"""
+        return self._count
+
+    def match(self, target: "ObjectIndex", strategy: str) -> list[tuple[AssetKey, Obj, Obj]]:
+        """
+        按指定策略匹配本索引（来源）与目标索引中的对象，只比较键，不读取对象内容。
+
+        Returns:
+            (键, 来源对象, 目标对象) 的列表，按目标对象表的顺序排列；类型不同的对象不视为匹配。
+        """
+        source = self.by_strategy[strategy]
+        return [
+            (key, source[key], obj)
+            for key, obj in target.by_strategy[strategy].items()
+            if key in source and source[key].type == obj.type
+        ]
+
+    def match_counts(self, target: "ObjectIndex", strategies: list[str] = MIGRATION_STRATEGIES) -> dict[str, int]:
+        """统计每种策略能匹配到的对象数量。"""
+        return {strategy: len(self.match(target, strategy)) for strategy in strategies}
+
+    def get_content(self, obj: Obj, spine_options: SpineOptions | None = None, log: LogFunc = no_log) -> LazyAssetContent:
+        """获取来源对象的延迟内容，同一个对象只解码一次（包括 Skel 版本转换）。"""
+        content_key = (id(obj.assets_file), obj.path_id)
+        if (content := self._contents.get(content_key)) is None:
+            content = self._contents[content_key] = LazyAssetContent(obj, spine_options, log)
+        return content
+
+    def replacement_map(
+        self,
+        strategy: str,
+        spine_options: SpineOptions | None = None,
+        log: LogFunc = no_log,
+    ) -> dict[AssetKey, LazyAssetContent]:
+        """按指定策略生成可交给 _apply_replacements 的替换清单，内容在被替换时才读取。"""
+        return {
+            key: self.get_content(obj, spine_options, log)
+            for key, obj in self.by_strategy[strategy].items()
+        }
+
+def _extract_object_content(
+    obj: Obj,
+    spine_options: SpineOptions | None,
+    log: LogFunc = no_log,
+) -> AssetContent:
+    """
+    读取单个来源对象的资源内容：Texture2D 为图像，TextAsset 为字节数据（.skel 可选升级），其他类型为原始数据。
+    """
+    if obj.type == AssetType.Texture2D:
+        return obj.read().image
+    if obj.type == AssetType.TextAsset:
+        data = obj.read()
+        resource_name: str = data.m_Name
+        asset_bytes = data.m_Script.encode("utf-8", "surrogateescape")
+        if resource_name.lower().endswith('.skel'):
+            return SpineUtils.handle_skel_upgrade(
+                skel_bytes=asset_bytes,
+                resource_name=resource_name,
+                enabled=spine_options.enabled if spine_options else False,
+                converter_path=spine_options.converter_path if spine_options else None,
+                target_version=spine_options.target_version if spine_options else None,
+                log=log
+            )
+        return asset_bytes
+    # 其他类型直接复制原始数据
+    return obj.get_raw_data()
+
+def _copy_texture_data(source: Obj, target: Any) -> bool:
+    """
+    来源和目标 Texture2D 的格式、尺寸、mip 数量和平台一致时，直接复制压缩后的图像数据（含 mip 链），
+    跳过解码和重新编码。图像数据会内嵌到目标对象中，不再引用 .resS 流数据。
+
+    Args:
+        source: 来源 Texture2D 对象。
+        target: 已读取的目标 Texture2D 数据。
+
+    Returns:
+        是否已直接复制；返回 False 时调用方需要解码后重新编码。
+    """
+    if source.type != AssetType.Texture2D or source.platform != target.object_reader.platform:
+        return False
+    source_data = source.read()
+    layout = lambda data: (
+        data.m_TextureFormat, data.m_Width, data.m_Height, data.m_MipCount, getattr(data, "m_PlatformBlob", None)
+    )
+    if layout(source_data) != layout(target):
+        return False
+
+    image_data = source_data.get_image_data()
+    target.image_data = image_data
+    target.m_CompleteImageSize = source_data.m_CompleteImageSize
+    if target.m_MipMap is not None:
+        target.m_MipMap = source_data.m_MipMap
+    if target.m_StreamData is not None:
+        target.m_StreamData.path = ""
+        target.m_StreamData.offset = 0
+        target.m_StreamData.size = 0
+    return True
+
+@dataclass
+class _TextureEncodeTask:
+    """等待编码的纹理替换任务。"""
+    data: Any  # 已读取的目标 Texture2D
+    image: Image.Image
+    log_message: str = ""
+
+def _encode_texture(image: Image.Image, target_format: int, platform: int, platform_blob: Any) -> tuple[bytes, int]:
+    """将图像编码为纹理数据，在进程池中执行。返回 (编码后的数据, 实际使用的纹理格式)。"""
+    from UnityPy.export import Texture2DConverter
+    return Texture2DConverter.image_to_texture2d(image, target_format, platform, platform_blob)
+
+def _assign_encoded_texture(data: Any, image: Image.Image, image_data: bytes, texture_format: int) -> None:
+    """将编码好的数据写入 Texture2D，字段设置与 UnityPy 的 Texture2D.image 赋值一致（不生成 mip）。"""
+    data.m_Width, data.m_Height = image.size
+    if data.m_MipMap is not None:
+        data.m_MipMap = False
+    if data.m_MipCount is not None:
+        data.m_MipCount = 1
+    data.image_data = image_data
+    data.m_CompleteImageSize = len(image_data)
+    data.m_TextureFormat = texture_format
+    if data.m_StreamData is not None:
+        data.m_StreamData.path = ""
+        data.m_StreamData.offset = 0
+        data.m_StreamData.size = 0
+    data.save()
+
+def _run_texture_encodes(
+    tasks: list[_TextureEncodeTask],
+    max_workers: int,
+    texture_cache: TextureCache | None = None,
+    log: LogFunc = no_log,
+) -> list[_TextureEncodeTask]:
+    """
+    编码等待中的纹理并写回对象。
+    提供 texture_cache 时先查找相同图像的编码结果，未命中的纹理编码后写入缓存。
+    max_workers 大于 1 时使用进程池并行编码，主线程只负责把编码结果写回对象。
+
+    Returns:
+        编码失败的任务列表。
+    """
+    failed: list[_TextureEncodeTask] = []
+    pending: list[tuple[_TextureEncodeTask, str | None, tuple]] = []
+    cache_hits = 0
+
+    for task in tasks:
+        encode_args = (
+            task.image,
+            task.data.m_TextureFormat,
+            task.data.object_reader.platform,
+            task.data.m_PlatformBlob,
+        )
+        try:
+            cache_key = texture_cache.make_key(*encode_args) if texture_cache else None
+            if cache_key and (cached := texture_cache.get(cache_key)):
+                _assign_encoded_texture(task.data, task.image, *cached)
+                cache_hits += 1
+                continue
+        except Exception:
+            cache_key = None
+        pending.append((task, cache_key, encode_args))
+
+    if cache_hits:
+        log(f"  > {t('log.texture.cache_hits', count=cache_hits)}")
+
+    executor = None
+    if max_workers > 1 and len(pending) > 1:
+        executor = ProcessPoolExecutor(max_workers=min(max_workers, len(pending)), initializer=_init_pool_worker)
+    try:
+        futures = [executor.submit(_encode_texture, *encode_args) if executor else None for _, _, encode_args in pending]
+        for (task, cache_key, encode_args), future in zip(pending, futures):
+            try:
+                image_data, texture_format = future.result() if future else _encode_texture(*encode_args)
+                _assign_encoded_texture(task.data, task.image, image_data, texture_format)
+                if cache_key:
+                    texture_cache.put(cache_key, image_data, texture_format)
+            except Exception as e:
+                log(f'  ❌ {t("common.error")}: {t("log.replace_resource_failed", name=task.data.m_Name, type=AssetType.Texture2D.name, error=e)}')
+                failed.append(task)
+    finally:
+        if executor:
+            executor.shutdown()
+    return failed
+
+def _replace_object_content(
+    obj: Obj,
+    content: AssetContent,
+    encode_tasks: list[_TextureEncodeTask] | None = None,
+) -> tuple[str | None, bool | None]:
+    """
+    将资源内容写入目标对象，只有 Texture2D 和 TextAsset 需要反序列化。
+    延迟内容在此时才被读取；来源是格式相同的 Texture2D 时直接复制压缩数据，不解码。
+
+    Args:
+        obj: 目标对象。
+        content: 资源内容。
+        encode_tasks: 提供时需要重新编码的纹理不会立即编码，而是加入该列表，由调用方并行编码后写回。
+
+    Returns:
+        一个元组 (资源名称, 是否直接复制了纹理数据)；非 Texture2D 资源的第二项为 None。
+    """
+    if obj.type == AssetType.Texture2D:
+        data = obj.read()
+        if isinstance(content, LazyAssetContent) and _copy_texture_data(content.obj, data):
+            data.save()
+            return data.m_Name, True
+        image = content.resolve() if isinstance(content, LazyAssetContent) else content
+        if encode_tasks is not None:
+            encode_tasks.append(_TextureEncodeTask(data, image))
+        else:
+            data.image = image
+            data.save()
+        return data.m_Name, False
+    if isinstance(content, LazyAssetContent):
+        content = content.resolve()
+    if obj.type == AssetType.TextAsset:
+        data = obj.read()
+        # content 是 bytes，需要解码成 str
+        data.m_Script = content.decode("utf-8", "surrogateescape")
+        data.save()
+        return data.m_Name, None
+    # 其他类型直接设置原始数据
+    resource_name = _peek_object_name(obj)
+    obj.set_raw_data(content)
+    return resource_name, None
+
+def _format_replaced_log(obj: Obj, resource_name: str | None, asset_key: AssetKey, passthrough: bool | None) -> str:
+    """生成替换成功的日志条目，Texture2D 额外注明是直接复制还是重新编码。"""
+    resource_name = resource_name or t("log.unnamed_resource", type=obj.type.name)
+    log_message = f"[{obj.type.name}] {resource_name} (key: {asset_key})"
+    if passthrough is not None:
+        log_message += f" [{t('log.texture.passthrough' if passthrough else 'log.texture.reencoded')}]"
+    return log_message
+
+def _apply_matches(
+    source: ObjectIndex,
+    target: ObjectIndex,
+    strategy: str,
+    spine_options: SpineOptions | None = None,
+    log: LogFunc = no_log,
+    max_workers: int = 1,
+    texture_cache: TextureCache | None = None,
+) -> tuple[int, list[str]]:
+    """
+    按指定策略匹配来源和目标索引，将匹配到的资源逐个从来源读取并写入目标。
+    来源内容以 LazyAssetContent 的形式缓存在来源索引中，只有匹配到的对象会被解码。
+    需要重新编码的纹理在最后统一编码：max_workers 大于 1 时在进程池中并行编码，
+    提供 texture_cache 时优先复用缓存中的编码结果。
+
+    Returns:
+        一个元组 (成功替换的数量, 成功替换的资源日志列表)。
+    """
+    matches = [(asset_key, source, source_obj, target_obj) for asset_key, source_obj, target_obj in source.match(target, strategy)]
+    return _apply_match_list(matches, spine_options, log, max_workers, texture_cache)
+
+def _apply_match_list(
+    matches: list[tuple[AssetKey, ObjectIndex, Obj, Obj]],
+    spine_options: SpineOptions | None = None,
+    log: LogFunc = no_log,
+    max_workers: int = 1,
+    texture_cache: TextureCache | None = None,
+) -> tuple[int, list[str]]:
+    """
+    将已确定的匹配 (键, 来源索引, 来源对象, 目标对象) 逐个写入目标，其余与 _apply_matches 相同。
+    """
+    replacement_count = 0
+    replaced_assets_log = []
+
+    encode_tasks: list[_TextureEncodeTask] = []
+
+    for asset_key, source, source_obj, target_obj in matches:
+        try:
+            content = source.get_content(source_obj, spine_options, log)
+            pending = len(encode_tasks)
+            resource_name, passthrough = _replace_object_content(target_obj, content, encode_tasks)
+            replacement_count += 1
+            log_message = _format_replaced_log(target_obj, resource_name, asset_key, passthrough)
+            replaced_assets_log.append(log_message)
+            if len(encode_tasks) > pending:
+                encode_tasks[-1].log_message = log_message
+        except Exception as e:
+            resource_name_for_error = target_obj.peek_name() or t("log.unnamed_resource", type=target_obj.type.name)
+            log(f'  ❌ {t("common.error")}: {t("log.replace_resource_failed", name=resource_name_for_error, type=target_obj.type.name, error=e)}')
+
+    if encode_tasks:
+        for task in _run_texture_encodes(encode_tasks, max_workers, texture_cache, log):
+            replacement_count -= 1
+            replaced_assets_log.remove(task.log_message)
+
+    return replacement_count, replaced_assets_log
 
 def _apply_replacements(
     env: Env,
     replacement_map: dict[AssetKey, AssetContent],
     key_func: KeyGeneratorFunc,
     log: LogFunc = no_log,
+    max_workers: int = 1,
+    texture_cache: TextureCache | None = None,
 ) -> tuple[int, list[str], list[AssetKey]]:
     """
     将“替换清单”中的资源应用到目标环境中。
@@ -487,6 +2146,8 @@ def _apply_replacements(
         replacement_map: 资源替换清单，格式为 { asset_key: content }。
         key_func: 用于从目标环境中的对象生成 asset_key 的函数。
         log: 日志记录函数。
+        max_workers: 大于 1 时，需要重新编码的纹理在进程池中并行编码。
+        texture_cache: 纹理编码缓存，为 None 时不使用缓存。
 
     Returns:
         一个元组 (成功替换的数量, 成功替换的资源日志列表, 未能匹配的资源键集合)。
@@ -496,47 +2157,43 @@ def _apply_replacements(
     
     # 创建一个副本用于操作，因为我们会从中移除已处理的项
     tasks = replacement_map.copy()
+    encode_tasks: list[_TextureEncodeTask] = []
 
     for obj in env.objects:
         if not tasks:  # 如果清单空了，就提前退出
             break
-        
+
+        # 先按类型过滤，GameObject、Transform、AssetBundle 等对象不会被读取
+        if obj.type not in REPLACEABLE_ASSET_TYPES:
+            continue
+
         try:
-            data = obj.read()
             asset_key = key_func(obj)
             
-            # 跳过 asset_key 为 None 的对象（如 GameObject、Transform 等）
-            if asset_key is None:
-                continue
-            
-            # 额外检查：确保类型在白名单中
-            if obj.type not in REPLACEABLE_ASSET_TYPES:
+            # 跳过 asset_key 为 None 的对象
+            if asset_key is None or asset_key not in tasks:
                 continue
 
-            if asset_key in tasks:
-                content = tasks.pop(asset_key)
-                resource_name = getattr(data, 'm_Name', t("log.unnamed_resource", type=obj.type.name))
-                
-                if obj.type == AssetType.Texture2D:
-                    data.image = content
-                    data.save()
-                elif obj.type == AssetType.TextAsset:
-                    # content 是 bytes，需要解码成 str
-                    data.m_Script = content.decode("utf-8", "surrogateescape")
-                    data.save()
-                else:
-                    # 其他类型直接设置原始数据
-                    obj.set_raw_data(content)
+            # 只有确定要替换的对象才反序列化
+            content = tasks.pop(asset_key)
+            pending = len(encode_tasks)
+            resource_name, passthrough = _replace_object_content(obj, content, encode_tasks)
 
-                replacement_count += 1
-                key_display = str(asset_key)
-                log_message = f"[{obj.type.name}] {resource_name} (key: {key_display})"
-                replaced_assets_log.append(log_message)
+            replacement_count += 1
+            log_message = _format_replaced_log(obj, resource_name, asset_key, passthrough)
+            replaced_assets_log.append(log_message)
+            if len(encode_tasks) > pending:
+                encode_tasks[-1].log_message = log_message
 
         except Exception as e:
             resource_name_for_error = obj.peek_name() or t("log.unnamed_resource", type=obj.type.name)
             log(f'  ❌ {t("common.error")}: {t("log.replace_resource_failed", name=resource_name_for_error, type=obj.type.name, error=e)}')
 
+    if encode_tasks:
+        for task in _run_texture_encodes(encode_tasks, max_workers, texture_cache, log):
+            replacement_count -= 1
+            replaced_assets_log.remove(task.log_message)
+
     return replacement_count, replaced_assets_log, list(tasks.keys())
 
 def process_asset_packing(
@@ -576,7 +2233,7 @@ def process_asset_packing(
             temp_asset_folder = SpineUtils.normalize_legacy_spine_assets(asset_folder, log)
             asset_folder = temp_asset_folder
 
-        env = load_bundle(target_bundle_path, log)
+        env, source_suffix = load_bundle_with_suffix(target_bundle_path, log)
         if not env:
             return False, t("message.packer.load_target_bundle_failed")
         
@@ -627,7 +2284,10 @@ def process_asset_packing(
         key_func = MATCH_STRATEGIES[strategy_name]
 
         # 3. 应用替换
-        replacement_count, replaced_assets_log, unmatched_keys = _apply_replacements(env, replacement_map, key_func, log)
+        replacement_count, replaced_assets_log, unmatched_keys = _apply_replacements(
+            env, replacement_map, key_func, log,
+            save_options.max_workers, save_options.get_texture_cache(),
+        )
 
         if replacement_count == 0:
             log(f"⚠️ {t('common.warning')}: {t('log.packer.no_assets_packed')}")
@@ -664,7 +2324,8 @@ def process_asset_packing(
             env=env,
             output_path=output_path,
             save_options=save_options,
-            log=log
+            log=log,
+            source_suffix=source_suffix,
         )
 
         if not save_ok:
@@ -828,79 +2489,22 @@ def process_asset_extraction(
         log(traceback.format_exc())
         return False, t("message.error_during_process", error=e)
 
-def _extract_assets_from_bundle(
-    env: Env,
-    asset_types_to_replace: set[str],
-    key_func: KeyGeneratorFunc,
-    spine_options: SpineOptions | None,
-    log: LogFunc = no_log,
-) -> dict[AssetKey, AssetContent]:
-    """
-    从源 bundle 的 env 构建替换清单
-    即其他函数中使用的replacement_map
-    """
-    replacement_map: dict[AssetKey, AssetContent] = {}
-    replace_all = "ALL" in asset_types_to_replace
-
-    for obj in env.objects:
-        try:
-            data = obj.read()
-            
-            # 统一过滤：只提取可替换的资源类型
-            if obj.type not in REPLACEABLE_ASSET_TYPES:
-                continue
-            
-            # 如果不是"ALL"模式，则只处理在指定集合中的类型
-            if not replace_all and obj.type.name not in asset_types_to_replace:
-                continue
-
-            asset_key = key_func(obj)
-            if asset_key is None or not getattr(data, 'm_Name', None):
-                continue
-            
-            content: AssetContent | None = None
-            resource_name: str = data.m_Name
-
-            if obj.type == AssetType.Texture2D:
-                content: Image.Image = data.image
-            elif obj.type == AssetType.TextAsset:
-                asset_bytes = data.m_Script.encode("utf-8", "surrogateescape")
-                if resource_name.lower().endswith('.skel'):
-                    content: bytes = SpineUtils.handle_skel_upgrade(
-                        skel_bytes=asset_bytes,
-                        resource_name=resource_name,
-                        enabled=spine_options.enabled if spine_options else False,
-                        converter_path=spine_options.converter_path if spine_options else None,
-                        target_version=spine_options.target_version if spine_options else None,
-                        log=log
-                    )
-                else:
-                    content: bytes = asset_bytes
-            # 对于其他类型，如果处于“ALL”模式或该类型被明确请求，则复制原始数据
-            elif replace_all or obj.type.name in asset_types_to_replace:
-                content: bytes = obj.get_raw_data()
-
-            if content is not None:
-                replacement_map[asset_key] = content
-        except Exception as e:
-            log(f"  > ⚠️ {t('log.extractor.extraction_failed', name=getattr(data, 'm_Name', 'N/A'), error=e)}")
-
-    if replace_all:
-        replacement_map["__mode__"] = {"ALL"}
-
-    return replacement_map
-
 def _migrate_bundle_assets(
     old_bundle_path: Path,
     new_bundle_path: Path,
     asset_types_to_replace: set[str],
     spine_options: SpineOptions | None = None,
     log: LogFunc = no_log,
+    max_workers: int = 1,
+    texture_cache: TextureCache | None = None,
 ) -> tuple[Env | None, int]:
     """
     执行asset迁移的核心替换逻辑。
     asset_types_to_replace: 要替换的资源类型集合（如 {"Texture2D", "TextAsset", "Mesh"} 的子集 或 {"ALL"}）
-    按顺序尝试多种匹配策略（path_id, name_type），一旦有策略成功替换了至少一个资源，就停止并返回结果。
+    max_workers: 并行编码纹理的进程数，1 表示在当前进程中依次编码
+    texture_cache: 纹理编码缓存，为 None 时不使用缓存
+    先为新旧 bundle 各建立一次多策略键索引，按匹配数量选出可用的策略（按 path_id, cont_name_type, name_type 的顺序），
+    只有匹配到的资源才会被解码和写入。一旦有策略成功替换了至少一个资源，就停止并返回结果。
     返回一个元组 (modified_env, replacement_count)，如果失败则 modified_env 为 None。
     """
     # 1. 加载 bundles
@@ -914,37 +2518,30 @@ def _migrate_bundle_assets(
     if not new_env:
         return None, 0
 
-    # 定义匹配策略
-    strategies: list[tuple[str, KeyGeneratorFunc]] = [
-        ('path_id', MATCH_STRATEGIES['path_id']),
-        ('cont_name_type', MATCH_STRATEGIES['cont_name_type']),
-        ('name_type', MATCH_STRATEGIES['name_type']),
-        # ('container', MATCH_STRATEGIES['container']),
-        # 因为多个Mesh可能共享同一个Container，所以这个策略很可能失效，因此不使用
-    ]
+    # 2. 一次遍历建立新旧 bundle 的多策略键索引，此时不解码任何资源
+    old_index = ObjectIndex.from_env(old_env, asset_types_to_replace, named_only=True, log=log, keep_last=True)
+    if not old_index:
+        log(f"  > ⚠️ {t('common.warning')}: {t('log.migration.no_assets_in_old_bundle')}")
+        log(f"\n⚠️ {t('common.warning')}: {t('log.migration.all_strategies_failed', types=', '.join(asset_types_to_replace))}")
+        return None, 0
+    new_index = ObjectIndex.from_env(new_env, asset_types_to_replace, log=log)
 
-    for name, key_func in strategies:
-        log(f'\n{t("log.migration.trying_strategy", name=name)}')
-        
-        # 2. 根据当前策略从旧版 bundle 构建“替换清单”
-        log(f'  > {t("log.migration.extracting_from_old_bundle_simple")}')
-        old_assets_map = _extract_assets_from_bundle(
-            old_env, asset_types_to_replace, key_func, spine_options, log
-        )
-        
-        if not old_assets_map:
-            log(f"  > ⚠️ {t('common.warning')}: {t('log.migration.strategy_no_assets_found', name=name)}")
-            continue
+    # 3. 根据各策略的匹配数量预先选择策略
+    match_counts = old_index.match_counts(new_index)
+    log(f'  > {t("log.migration.match_counts", counts=", ".join(f"{name}={count}" for name, count in match_counts.items()))}')
 
-        log(f'  > {t("log.migration.extraction_complete", name=name, count=len(old_assets_map))}')
+    for name in MIGRATION_STRATEGIES:
+        if not match_counts[name]:
+            continue
+        log(f'\n{t("log.migration.trying_strategy", name=name)}')
 
-        # 3. 根据当前策略应用替换
+        # 4. 只读取并写入匹配到的资源
         log(f'  > {t("log.migration.writing_to_new_bundle")}')
+        replacement_count, replaced_logs = _apply_matches(
+            old_index, new_index, name, spine_options, log, max_workers, texture_cache
+        )
         
-        replacement_count, replaced_logs, unmatched_keys = _apply_replacements(
-            new_env, old_assets_map, key_func, log)
-        
-        # 4. 如果当前策略成功替换了至少一个资源，就结束
+        # 如果当前策略成功替换了至少一个资源，就结束
         if replacement_count > 0:
             log(f"\n✅ {t('log.migration.strategy_success', name=name, count=replacement_count)}:")
             for item in replaced_logs:
@@ -953,10 +2550,142 @@ def _migrate_bundle_assets(
 
         log(f'  > {t("log.migration.strategy_no_match", name=name)}')
 
-    # 5. 所有策略都失败了
+    # 所有策略都失败了
     log(f"\n⚠️ {t('common.warning')}: {t('log.migration.all_strategies_failed', types=', '.join(asset_types_to_replace))}")
     return None, 0
 
+@dataclass
+class _ModMatches:
+    """组内一个Mod的匹配结果。"""
+    status: str = "load_failed"  # ok / load_failed / no_assets / no_match
+    strategy: str | None = None
+    source: ObjectIndex | None = None
+    match_counts: dict[str, int] = field(default_factory=dict)
+    # 生效的匹配 (键, 来源索引, 来源对象, 目标对象)
+    matches: list[tuple[AssetKey, ObjectIndex, Obj, Obj]] = field(default_factory=list)
+    # 被靠后的Mod覆盖的匹配 (键, 目标对象, 覆盖它的Mod序号)
+    overridden: list[tuple[AssetKey, Obj, int]] = field(default_factory=list)
+
+def _match_group_assets(
+    old_bundle_paths: list[Path],
+    new_index: ObjectIndex,
+    asset_types_to_replace: set[str],
+    log: LogFunc = no_log,
+) -> tuple[list[_ModMatches], list[Env]]:
+    """
+    为以同一个新版bundle为目标的多个旧Mod匹配资源键，不读取任何资源内容。
+    每个Mod各自按 MIGRATION_STRATEGIES 的顺序选用第一个有匹配的策略。
+    多个Mod匹配同一个目标对象时，列表中靠后的Mod优先（与 ObjectIndex 中后加入者为准的规则一致），
+    每个冲突都会记录到日志中。
+    返回每个Mod的匹配结果，以及需要保持加载直到资源写入完成的来源 Environment。
+    """
+    old_envs = []
+    mods = [_ModMatches() for _ in old_bundle_paths]
+    # 目标对象 (SerializedFile, path_id) -> (Mod序号, 键, 来源索引, 来源对象, 目标对象)
+    winners: dict[tuple[int, int], tuple[int, AssetKey, ObjectIndex, Obj, Obj]] = {}
+
+    for mod_index, old_bundle_path in enumerate(old_bundle_paths):
+        mod = mods[mod_index]
+        log(f'\n{t("log.mod_update.group_matching", name=old_bundle_path.name)}')
+        old_env = load_bundle(old_bundle_path, log)
+        if not old_env:
+            continue
+        old_envs.append(old_env)
+
+        old_index = ObjectIndex.from_env(old_env, asset_types_to_replace, named_only=True, log=log, keep_last=True)
+        if not old_index:
+            mod.status = "no_assets"
+            log(f"  > ⚠️ {t('common.warning')}: {t('log.migration.no_assets_in_old_bundle')}")
+            continue
+        mod.source = old_index
+        mod.match_counts = old_index.match_counts(new_index)
+        log(f'  > {t("log.migration.match_counts", counts=", ".join(f"{name}={count}" for name, count in mod.match_counts.items()))}')
+
+        mod.strategy = next((name for name in MIGRATION_STRATEGIES if mod.match_counts[name]), None)
+        if mod.strategy is None:
+            mod.status = "no_match"
+            log(f"  > ⚠️ {t('common.warning')}: {t('log.migration.all_strategies_failed', types=', '.join(asset_types_to_replace))}")
+            continue
+        mod.status = "ok"
+        log(f'  > {t("log.mod_update.group_strategy", name=mod.strategy)}')
+
+        for asset_key, source_obj, target_obj in old_index.match(new_index, mod.strategy):
+            target_key = (id(target_obj.assets_file), target_obj.path_id)
+            if (previous := winners.get(target_key)) is not None:
+                mods[previous[0]].overridden.append((previous[1], target_obj, mod_index))
+                log(f"  > ⚠️ {t('log.mod_update.group_conflict', name=target_obj.peek_name() or target_obj.path_id, type=target_obj.type.name, previous=old_bundle_paths[previous[0]].name, current=old_bundle_path.name)}")
+            winners[target_key] = (mod_index, asset_key, old_index, source_obj, target_obj)
+
+    for mod_index, *match in winners.values():
+        mods[mod_index].matches.append(tuple(match))
+    return mods, old_envs
+
+def _migrate_group_assets(
+    old_bundle_paths: list[Path],
+    new_bundle_path: Path,
+    asset_types_to_replace: set[str],
+    spine_options: SpineOptions | None = None,
+    log: LogFunc = no_log,
+    max_workers: int = 1,
+    texture_cache: TextureCache | None = None,
+) -> tuple[Env | None, list[tuple[int, int]]]:
+    """
+    将多个旧Mod的资源迁移到同一个新版bundle中，新版bundle只加载一次。
+    匹配规则见 _match_group_assets；被覆盖的匹配不会被解码和写入。
+    与 _migrate_bundle_assets 相同，某个Mod选用的策略没有成功写入任何资源时，依次尝试它后面有匹配的策略；
+    回退时不会写入组内其他Mod已占用的目标对象。
+    返回一个元组 (modified_env, 每个Mod的 (成功替换的数量, 被靠后的Mod覆盖的数量))，加载失败时 modified_env 为 None。
+    """
+    log(t("log.migration.loading_new_bundle"))
+    new_env = load_bundle(new_bundle_path, log)
+    if not new_env:
+        return None, []
+    new_index = ObjectIndex.from_env(new_env, asset_types_to_replace, log=log)
+
+    mods, old_envs = _match_group_assets(old_bundle_paths, new_index, asset_types_to_replace, log)
+
+    def target_key(obj: Obj) -> tuple[int, int]:
+        return id(obj.assets_file), obj.path_id
+
+    # 目标对象 -> 写入它的Mod序号
+    owners = {target_key(target_obj): mod_index for mod_index, mod in enumerate(mods) for *_, target_obj in mod.matches}
+
+    results = []
+    for mod_index, (old_bundle_path, mod) in enumerate(zip(old_bundle_paths, mods)):
+        replacement_count = 0
+        if mod.matches:
+            log(f'\n{t("log.mod_update.group_applying", name=old_bundle_path.name)}')
+            replacement_count, replaced_logs = _apply_match_list(
+                mod.matches, spine_options, log, max_workers, texture_cache
+            )
+
+            # 当前策略没有成功写入任何资源时，依次尝试后面的策略
+            fallbacks = MIGRATION_STRATEGIES[MIGRATION_STRATEGIES.index(mod.strategy) + 1:]
+            for name in fallbacks:
+                if replacement_count > 0:
+                    break
+                matches = [
+                    (asset_key, mod.source, source_obj, target_obj)
+                    for asset_key, source_obj, target_obj in mod.source.match(new_index, name)
+                    if owners.get(target_key(target_obj), mod_index) == mod_index
+                ]
+                if not matches:
+                    continue
+                log(f'  > {t("log.migration.strategy_no_match", name=mod.strategy)}')
+                mod.strategy = name
+                log(f'\n{t("log.migration.trying_strategy", name=name)}')
+                replacement_count, replaced_logs = _apply_match_list(
+                    matches, spine_options, log, max_workers, texture_cache
+                )
+                if replacement_count > 0:
+                    owners.update((target_key(target_obj), mod_index) for *_, target_obj in matches)
+
+            for item in replaced_logs:
+                log(f"  - {item}")
+        results.append((replacement_count, len(mod.overridden)))
+
+    return new_env, results
+
 def process_mod_update(
     old_mod_path: Path,
     new_bundle_path: Path,
@@ -1002,7 +2731,9 @@ def process_mod_update(
             new_bundle_path=new_bundle_path, 
             asset_types_to_replace=asset_types_to_replace, 
             spine_options=spine_options,
-            log = log
+            log = log,
+            max_workers=save_options.max_workers,
+            texture_cache=save_options.get_texture_cache(),
         )
 
         if not modified_env:
@@ -1013,12 +2744,14 @@ def process_mod_update(
         log(f'  > {t("log.mod_update.migration_complete", count=replacement_count)}')
         
         # 保存和修正文件
+        # 写入的是新版bundle，旧Mod末尾的附加字节只在明确要求时才沿用
         output_path = output_dir / new_bundle_path.name
         save_ok, save_message = save_bundle(
             env=modified_env,
             output_path=output_path,
             save_options=save_options,
-            log=log
+            log=log,
+            source_suffix=get_bundle_suffix(old_mod_path) if save_options.keep_mod_extra_bytes else b"",
         )
 
         if not save_ok:
@@ -1033,29 +2766,226 @@ def process_mod_update(
         log(traceback.format_exc())
         return False, t("message.error_during_process", error=e)
 
+def _select_group_suffix(old_mod_paths: list[Path], log: LogFunc = no_log) -> bytes:
+    """
+    为一组Mod选择沿用的末尾附加字节（仅在 keep_mod_extra_bytes 时使用）。
+    与资源冲突的规则一致，使用列表中最靠后的带有 extra_bytes 的Mod；各Mod的 extra_bytes 不一致时记录警告。
+    """
+    suffixes = [(path, get_bundle_suffix(path)) for path in old_mod_paths]
+    carried = [(path, suffix) for path, suffix in suffixes if extract_extra_bytes(suffix)]
+    if not carried:
+        return b""
+    path, suffix = carried[-1]
+    if len({extract_extra_bytes(suffix) for _, suffix in suffixes}) > 1:
+        extra_bytes = extract_extra_bytes(suffix).hex().upper()
+        log(f"  > ⚠️ {t('log.mod_update.group_extra_bytes_conflict', extra_bytes=extra_bytes, name=path.name)}")
+    return suffix
+
+def process_mod_group_update(
+    old_mod_paths: list[Path],
+    new_bundle_path: Path,
+    output_dir: Path,
+    asset_types_to_replace: set[str],
+    save_options: SaveOptions,
+    spine_options: SpineOptions | None = None,
+    log: LogFunc = no_log,
+) -> list[tuple[bool, str]]:
+    """
+    将以同一个新版资源文件为目标的多个旧Mod一起更新，新版文件只加载、保存和CRC修正一次。
+
+    列表中靠后的Mod优先：多个Mod替换同一个资源时使用靠后的Mod的资源，冲突会记录到日志中。
+    save_options.keep_mod_extra_bytes 为 True 时，沿用最靠后的带有 extra_bytes 的Mod的附加字节（见 _select_group_suffix）。
+    只有一个Mod时等同于 process_mod_update。
+
+    Returns:
+        list[tuple[bool, str]]: 每个Mod的 (是否成功, 状态消息)，顺序与 old_mod_paths 相同。
+                                资源全部被靠后的Mod覆盖的Mod也视为成功。
+    """
+    if len(old_mod_paths) == 1:
+        return [process_mod_update(
+            old_mod_paths[0], new_bundle_path, output_dir, asset_types_to_replace,
+            save_options, spine_options, log,
+        )]
+
+    def fail_all(message: str) -> list[tuple[bool, str]]:
+        return [(False, message)] * len(old_mod_paths)
+
+    try:
+        log("="*50)
+        for old_mod_path in old_mod_paths:
+            log(f'  > {t("log.mod_update.using_old_mod", name=old_mod_path.name)}')
+        log(f'  > {t("log.mod_update.using_new_resource", name=new_bundle_path.name)}')
+
+        log(f'\n--- {t("log.section.asset_migration")} ---')
+        modified_env, counts = _migrate_group_assets(
+            old_bundle_paths=old_mod_paths,
+            new_bundle_path=new_bundle_path,
+            asset_types_to_replace=asset_types_to_replace,
+            spine_options=spine_options,
+            log=log,
+            max_workers=save_options.max_workers,
+            texture_cache=save_options.get_texture_cache(),
+        )
+
+        if not modified_env:
+            return fail_all(t("message.mod_update.migration_failed"))
+        replacement_count = sum(applied for applied, _ in counts)
+        if replacement_count == 0:
+            return fail_all(t("message.mod_update.no_matching_assets_to_replace"))
+
+        log(f'  > {t("log.mod_update.migration_complete", count=replacement_count)}')
+
+        # 与 process_mod_update 相同，旧Mod末尾的附加字节只在明确要求时才沿用
+        output_path = output_dir / new_bundle_path.name
+        save_ok, save_message = save_bundle(
+            env=modified_env,
+            output_path=output_path,
+            save_options=save_options,
+            log=log,
+            source_suffix=_select_group_suffix(old_mod_paths, log) if save_options.keep_mod_extra_bytes else b"",
+        )
+
+        if not save_ok:
+            return fail_all(save_message)
+
+        log(t("log.file.saved", path=output_path))
+        log(f"\n🎉 {t('log.mod_update.all_processes_complete')}")
+        return [
+            (True, t("message.mod_update.success")) if applied else
+            (True, t("message.mod_update.all_assets_overridden")) if overridden else
+            (False, t("message.mod_update.no_matching_assets_to_replace"))
+            for applied, overridden in counts
+        ]
+
+    except Exception as e:
+        log(f"\n❌ {t('common.error')}: {t('log.error_processing', error=e)}")
+        log(traceback.format_exc())
+        return fail_all(t("message.error_during_process", error=e))
+
+def _batch_options_hash(
+    asset_types_to_replace: set[str],
+    save_options: SaveOptions,
+    spine_options: SpineOptions | None,
+) -> str:
+    """计算影响批量更新输出结果的选项哈希，不包含并行数等只影响速度的选项。"""
+    return hash_options(
+        sorted(asset_types_to_replace),
+        save_options.perform_crc,
+        save_options.extra_bytes,
+        save_options.compression,
+        save_options.variants,
+        spine_options,
+        ENCODER_VERSION,
+    )
+
+def _update_batch_group(
+    old_mod_paths: list[Path],
+    new_bundle_path: Path,
+    output_dir: Path,
+    asset_types_to_replace: set[str],
+    save_options: SaveOptions,
+    spine_options: SpineOptions | None,
+    log: LogFunc | None = None,
+) -> tuple[list[tuple[bool, str]], list[str]]:
+    """
+    批量更新的执行阶段：更新以同一个新版bundle文件为目标的一组Mod。
+    未提供 log 时（在工作进程中）日志缓存在列表中随结果一起返回。
+    """
+    logs: list[str] = []
+    results = process_mod_group_update(
+        old_mod_paths, new_bundle_path, output_dir, asset_types_to_replace,
+        save_options, spine_options, log or logs.append,
+    )
+    return results, logs
+
+def _run_batch_stage(
+    executor: ProcessPoolExecutor | None,
+    func: Callable[..., tuple[Any, list[str]]],
+    tasks: list[tuple],
+    log: LogFunc,
+    on_start: Callable[[int], None],
+    on_done: Callable[[int, Any], None],
+    on_emit: Callable[[int, Any], None],
+) -> None:
+    """
+    执行批量更新的一个阶段。
+
+    executor 为 None 时在当前进程中依次执行 func(*task, log=log)；否则把 func(*task) 提交到进程池，
+    每个任务的日志缓存后按任务顺序完整输出。
+    on_start 在任务的日志之前、on_emit 在任务的日志之后按任务顺序调用；
+    on_done 在任务完成时立即调用（并行时按完成顺序），用于报告进度。任务抛出的异常作为结果传给回调。
+    """
+    if executor is None:
+        for k, task in enumerate(tasks):
+            on_start(k)
+            try:
+                result, _ = func(*task, log=log)
+            except Exception as e:
+                result = e
+            on_done(k, result)
+            on_emit(k, result)
+        return
+
+    futures = {executor.submit(func, *task): k for k, task in enumerate(tasks)}
+    results: dict[int, tuple[Any, list[str]]] = {}
+    next_to_emit = 0
+    pending = set(futures)
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            k = futures[future]
+            try:
+                results[k] = future.result()
+            except Exception as e:
+                results[k] = (e, [])
+            on_done(k, results[k][0])
+
+        # 按任务顺序输出已完成的日志
+        while next_to_emit in results:
+            result, logs = results.pop(next_to_emit)
+            on_start(next_to_emit)
+            for message in logs:
+                log(message)
+            on_emit(next_to_emit, result)
+            next_to_emit += 1
+
 def process_batch_mod_update(
     mod_file_list: list[Path],
-    search_paths: list[Path],
+    search_paths: "list[Path] | ResourceCatalog | SearchContext",
     output_dir: Path,
     asset_types_to_replace: set[str],
     save_options: SaveOptions,
     spine_options: SpineOptions | None,
     log: LogFunc = no_log,
     progress_callback: Callable[[int, int, str], None] | None = None,
+    index: "BundleIndex | None" = None,
+    max_workers: int = 1,
+    journal: BatchJournal | None = None,
 ) -> tuple[int, int, list[str]]:
     """
     执行批量Mod更新的核心逻辑。
 
+    分为两个阶段：先在当前进程中为所有Mod查找新版bundle文件，所有查找共用一个 SearchContext，
+    再按目标文件分组，每个目标文件只加载、保存一次，组内的Mod按列表顺序应用，
+    靠后的Mod优先（见 process_mod_group_update）。结束时输出搜索缓存的命中率。
+
     Args:
         mod_file_list: 待更新的旧Mod文件路径列表。
-        search_paths: 用于查找新版bundle文件的目录列表。
+        search_paths: 用于查找新版bundle文件的目录列表、已构建的 ResourceCatalog 或 SearchContext。
         output_dir: 输出目录。
         asset_types_to_replace: 需要替换的资源类型集合。
         save_options: 保存和CRC修正的选项。
         spine_options: Spine资源升级的选项。
         log: 日志记录函数。
         progress_callback: 进度回调函数，用于更新UI。
-                           接收 (当前索引, 总数, 文件名)。
+                           每完成一个Mod调用一次，接收 (已完成的数量, 总数, 文件名)。
+        index: 可选的持久化指纹索引，用于查找新版bundle文件。
+        max_workers: 大于 1 时使用进程池并行比对候选文件，并同时处理多个Mod组。
+                     工作进程只接收路径和选项，各自加载文件；每个任务的日志先缓存，
+                     再按顺序完整输出，不会互相穿插。
+        journal: 可选的断点续传日志。提供时每处理完一个Mod就记录结果，
+                 内容和选项都未变化、且上次的输出仍然有效的Mod直接跳过（计为成功）；
+                 与需要重新处理的Mod目标相同的Mod会重新加入其分组，以免新的输出丢失它们的修改。
 
     Returns:
         tuple[int, int, list[str]]: (成功计数, 失败计数, 失败任务详情列表)
@@ -1064,53 +2994,310 @@ def process_batch_mod_update(
     success_count = 0
     fail_count = 0
     failed_tasks = []
+    completed = 0
 
-    # 遍历每个旧Mod文件
-    for i, old_mod_path in enumerate(mod_file_list):
-        current_progress = i + 1
-        filename = old_mod_path.name
-        
-        if progress_callback:
-            progress_callback(current_progress, total_files, filename)
+    # 资源目录只扫描一次，候选列表、候选文件的指纹和进程池在所有Mod之间共用
+    context = _get_search_context(search_paths)
+    owns_context = context is not search_paths
 
-        log("\n" + "=" * 50)
-        log(t("status.processing_batch", current=current_progress, total=total_files, filename=filename))
+    options_hash = _batch_options_hash(asset_types_to_replace, save_options, spine_options) if journal is not None else ""
+    mod_hashes: dict[int, str] = {}
 
-        # 查找对应的新资源文件
-        new_bundle_paths, find_message = find_new_bundle_path(
-            old_mod_path, search_paths, log
-        )
+    def report_progress(i: int) -> None:
+        nonlocal completed
+        completed += 1
+        if progress_callback:
+            progress_callback(completed, total_files, mod_file_list[i].name)
 
-        if not new_bundle_paths:
-            log(f'❌ {t("log.search.find_failed", message=find_message)}')
+    def record(i: int, success: bool, detail: str, new_bundle_path: Path | None) -> None:
+        nonlocal success_count, fail_count
+        if success:
+            success_count += 1
+        else:
             fail_count += 1
-            failed_tasks.append(f"{filename} - {t('log.search.find_failed', message=find_message)}")
-            continue
+            failed_tasks.append(detail)
+        if journal is not None and i in mod_hashes:
+            outputs = []
+            if success and new_bundle_path is not None:
+                outputs = [output.path for output in save_options.resolve_outputs(output_dir / new_bundle_path.name)]
+            journal.record(
+                mod_file_list[i], mod_hashes[i], options_hash, success,
+                target=new_bundle_path, outputs=outputs, message=detail,
+            )
+
+    # 日志中已完成、且仍然有效的Mod
+    completed_entries: dict[int, JournalEntry] = {}
+    if journal is not None:
+        if len(journal):
+            log(t("log.mod_update.journal_resume", path=journal.path))
+        for i, old_mod_path in enumerate(mod_file_list):
+            try:
+                mod_hashes[i] = hash_file(old_mod_path)
+            except OSError:
+                continue
+            if (entry := journal.find_complete(old_mod_path, mod_hashes[i], options_hash)) is not None:
+                completed_entries[i] = entry
+    pending_mods = [i for i in range(total_files) if i not in completed_entries]
 
-        # 使用第一个匹配的文件
-        new_bundle_path = new_bundle_paths[0]
+    executor = None
+    try:
+        # ========== 阶段 1: 查找每个Mod的新版bundle文件 ==========
+        targets: dict[int, Path] = {}
 
-        # 执行Mod更新处理
-        success, process_message = process_mod_update(
-            old_mod_path=old_mod_path,
-            new_bundle_path=new_bundle_path,
-            output_dir=output_dir,
-            asset_types_to_replace=asset_types_to_replace,
-            save_options=save_options,
-            spine_options=spine_options,
-            log=log
+        def find_target(old_mod_path: Path, log: LogFunc) -> tuple[tuple[list[Path], str], list[str]]:
+            result = find_new_bundle_path(
+                old_mod_path, context, log, index=index, max_workers=max_workers, first_match_only=True
+            )
+            return result, []
+
+        def find_start(k: int) -> None:
+            log("\n" + "=" * 50)
+            log(t("status.processing_batch", current=pending_mods[k] + 1, total=total_files, filename=mod_file_list[pending_mods[k]].name))
+
+        def find_done(k: int, result: Any) -> None:
+            if isinstance(result, Exception) or not result[0]:
+                report_progress(pending_mods[k])
+
+        def find_emit(k: int, result: Any) -> None:
+            i = pending_mods[k]
+            if isinstance(result, Exception):
+                message = t("message.error_during_process", error=result)
+            else:
+                new_bundle_paths, message = result
+                if new_bundle_paths:
+                    # 使用第一个匹配的文件
+                    targets[i] = new_bundle_paths[0]
+                    return
+            log(f'❌ {t("log.search.find_failed", message=message)}')
+            record(i, False, f"{mod_file_list[i].name} - {t('log.search.find_failed', message=message)}", None)
+
+        _run_batch_stage(
+            None, find_target, [(mod_file_list[i],) for i in pending_mods],
+            log, find_start, find_done, find_emit,
         )
 
-        if success:
-            log(f'✅ {t("log.mod_update.process_success", filename=filename)}')
+        # ========== 按目标文件分组 ==========
+        groups: dict[Path, list[int]] = {}
+        for i in sorted(targets):
+            groups.setdefault(targets[i], []).append(i)
+        for i, entry in completed_entries.items():
+            if entry.target is not None and (target := Path(entry.target)) in groups:
+                groups[target].append(i)
+        for members in groups.values():
+            members.sort()
+        rejoined = {i for members in groups.values() for i in members}
+
+        for i in sorted(completed_entries.keys() - rejoined):
+            log("\n" + "=" * 50)
+            log(t("status.processing_batch", current=i + 1, total=total_files, filename=mod_file_list[i].name))
+            log(f'⏭️ {t("log.mod_update.batch_skipped", filename=mod_file_list[i].name, path=journal.path)}')
             success_count += 1
-        else:
-            log(f'❌ {t("log.mod_update.process_failed", filename=filename, message=process_message)}')
-            fail_count += 1
-            failed_tasks.append(f"{filename} - {process_message}")
-
+            report_progress(i)
+
+        # ========== 阶段 2: 每个目标文件加载、保存一次 ==========
+        group_list = list(groups.items())
+        if max_workers > 1 and len(group_list) > 1:
+            # 与阶段 1 共用上下文的进程池
+            executor = context.executor(max_workers)
+        # 每个工作进程内部不再开启进程池，避免进程数成倍增加
+        stage_save_options = replace(save_options, max_workers=1) if executor else save_options
+
+        def group_start(k: int) -> None:
+            new_bundle_path, members = group_list[k]
+            log("\n" + "=" * 50)
+            log(t("log.mod_update.group_start", target=new_bundle_path.name, mods=", ".join(mod_file_list[i].name for i in members)))
+
+        def group_done(k: int, result: Any) -> None:
+            for i in group_list[k][1]:
+                report_progress(i)
+
+        def group_emit(k: int, result: Any) -> None:
+            new_bundle_path, members = group_list[k]
+            if isinstance(result, Exception):
+                result = [(False, t("message.error_during_process", error=result))] * len(members)
+            for i, (success, message) in zip(members, result):
+                filename = mod_file_list[i].name
+                if success:
+                    log(f'✅ {t("log.mod_update.process_success", filename=filename)}')
+                    record(i, True, "", new_bundle_path)
+                else:
+                    log(f'❌ {t("log.mod_update.process_failed", filename=filename, message=message)}')
+                    record(i, False, f"{filename} - {message}", new_bundle_path)
+
+        _run_batch_stage(
+            executor, _update_batch_group,
+            [
+                ([mod_file_list[i] for i in members], new_bundle_path, output_dir,
+                 asset_types_to_replace, stage_save_options, spine_options)
+                for new_bundle_path, members in group_list
+            ],
+            log, group_start, group_done, group_emit,
+        )
+    finally:
+        if owns_context:
+            context.close()
+
+    stats = context.stats
+    log("\n" + t(
+        "log.search.context_stats",
+        prefix_hits=stats.prefix_hits, prefix_lookups=stats.prefix_lookups, prefix_rate=stats.prefix_hit_rate,
+        fingerprint_hits=stats.fingerprint_hits, fingerprint_lookups=stats.fingerprint_lookups,
+        fingerprint_rate=stats.fingerprint_hit_rate,
+    ))
     return success_count, fail_count, failed_tasks
 
+# ====== 迁移计划（预演）相关 ======
+
+@dataclass
+class PlannedAsset:
+    """迁移计划中的一个资源替换。"""
+    type: str
+    name: str
+    key: str
+    overridden_by: str | None = None  # 被同一目标文件的靠后的Mod覆盖时，为该Mod的文件名
+
+@dataclass
+class ModPlan:
+    """
+    一个Mod的迁移计划。
+    strategy 与实际更新时首先使用的策略相同。只有在写入时才能发现的失败（如资源解码失败）导致该策略
+    没有成功写入任何资源时，实际更新会依次回退到 fallback_strategies 中的策略。
+    """
+    mod: str
+    target: str | None = None
+    status: str = "ok"  # ok / search_failed / load_failed / no_assets / no_match
+    message: str = ""
+    strategy: str | None = None
+    fallback_strategies: list[str] = field(default_factory=list)
+    match_counts: dict[str, int] = field(default_factory=dict)
+    replacement_count: int = 0
+    assets: list[PlannedAsset] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "ok"
+
+@dataclass
+class BatchPlan:
+    """批量更新的迁移计划，可序列化为 JSON。"""
+    mods: list[ModPlan] = field(default_factory=list)
+
+    def groups(self) -> dict[str, list[str]]:
+        """目标文件 -> 以它为目标的Mod，按Mod的顺序排列。"""
+        groups: dict[str, list[str]] = {}
+        for plan in self.mods:
+            if plan.target is not None:
+                groups.setdefault(plan.target, []).append(plan.mod)
+        return groups
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "summary": {
+                "total": len(self.mods),
+                "matched": sum(plan.ok for plan in self.mods),
+                "failed": sum(not plan.ok for plan in self.mods),
+                "targets": len(self.groups()),
+                "replacements": sum(plan.replacement_count for plan in self.mods),
+            },
+            "groups": self.groups(),
+            "mods": [asdict(plan) for plan in self.mods],
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=2)
+
+def _plan_group(
+    old_mod_paths: list[Path],
+    new_bundle_path: Path,
+    asset_types_to_replace: set[str],
+    log: LogFunc = no_log,
+) -> list[ModPlan]:
+    """为以同一个新版bundle为目标的一组Mod生成迁移计划，与 process_mod_group_update 的匹配结果一致。"""
+    log(t("log.migration.loading_new_bundle"))
+    if not (new_env := load_bundle(new_bundle_path, log)):
+        message = t("log.file.load_failed", path=new_bundle_path)
+        return [ModPlan(str(path), str(new_bundle_path), "load_failed", message) for path in old_mod_paths]
+    new_index = ObjectIndex.from_env(new_env, asset_types_to_replace, log=log)
+    mods, _ = _match_group_assets(old_mod_paths, new_index, asset_types_to_replace, log)
+
+    def planned(asset_key: AssetKey, target_obj: Obj, overridden_by: str | None = None) -> PlannedAsset:
+        name = target_obj.peek_name() or t("log.unnamed_resource", type=target_obj.type.name)
+        return PlannedAsset(target_obj.type.name, name, str(asset_key), overridden_by)
+
+    plans = []
+    for old_mod_path, mod in zip(old_mod_paths, mods):
+        plan = ModPlan(
+            str(old_mod_path), str(new_bundle_path), mod.status,
+            strategy=mod.strategy, match_counts=mod.match_counts, replacement_count=len(mod.matches),
+        )
+        if mod.strategy is not None:
+            plan.fallback_strategies = [
+                name for name in MIGRATION_STRATEGIES[MIGRATION_STRATEGIES.index(mod.strategy) + 1:]
+                if mod.match_counts[name]
+            ]
+        plan.assets = [planned(asset_key, target_obj) for asset_key, _, _, target_obj in mod.matches]
+        plan.assets += [
+            planned(asset_key, target_obj, old_mod_paths[winner].name)
+            for asset_key, target_obj, winner in mod.overridden
+        ]
+        if mod.status == "load_failed":
+            plan.message = t("log.file.load_failed", path=old_mod_path)
+        elif mod.status == "no_assets":
+            plan.message = t("log.migration.no_assets_in_old_bundle")
+        elif mod.status == "no_match":
+            plan.message = t("message.mod_update.no_matching_assets_to_replace")
+        elif not mod.matches:
+            plan.message = t("message.mod_update.all_assets_overridden")
+        plans.append(plan)
+    return plans
+
+def plan_mod_update(
+    old_mod_path: Path,
+    new_bundle_path: Path,
+    asset_types_to_replace: set[str],
+    log: LogFunc = no_log,
+) -> ModPlan:
+    """
+    process_mod_update 的预演模式：加载新旧文件并匹配资源键后即停止，
+    不解码、编码、压缩或保存任何资源，返回将使用的策略和将被替换的资源。
+    """
+    return _plan_group([old_mod_path], new_bundle_path, asset_types_to_replace, log)[0]
+
+def plan_batch_mod_update(
+    mod_file_list: list[Path],
+    search_paths: "list[Path] | ResourceCatalog | SearchContext",
+    asset_types_to_replace: set[str],
+    log: LogFunc = no_log,
+    index: "BundleIndex | None" = None,
+    max_workers: int = 1,
+) -> BatchPlan:
+    """
+    process_batch_mod_update 的预演模式：查找每个Mod的新版bundle文件，按目标文件分组并匹配资源键，
+    得到与实际运行相同的分组、策略、冲突和替换数量，但不解码、编码、压缩或保存任何资源。
+    """
+    context = _get_search_context(search_paths)
+    plans: dict[int, ModPlan] = {}
+    groups: dict[Path, list[int]] = {}
+
+    try:
+        for i, old_mod_path in enumerate(mod_file_list):
+            new_bundle_paths, message = find_new_bundle_path(
+                old_mod_path, context, log, index=index, max_workers=max_workers, first_match_only=True
+            )
+            if new_bundle_paths:
+                groups.setdefault(new_bundle_paths[0], []).append(i)
+            else:
+                plans[i] = ModPlan(str(old_mod_path), status="search_failed", message=message)
+    finally:
+        if context is not search_paths:
+            context.close()
+
+    for new_bundle_path, members in groups.items():
+        group_plans = _plan_group([mod_file_list[i] for i in members], new_bundle_path, asset_types_to_replace, log)
+        plans.update(zip(members, group_plans))
+
+    return BatchPlan([plans[i] for i in range(len(mod_file_list))])
+
 # ====== 日服处理相关 ======
 
 # 将日服文件名中的类型标识符映射到UnityPy的AssetType名称
@@ -1200,7 +3387,7 @@ def _get_asset_types_from_jp_filenames(jp_paths: list[Path]) -> set[str]:
 
 def find_all_jp_counterparts(
     global_bundle_path: Path,
-    search_dirs: list[Path],
+    search_dirs: "list[Path] | ResourceCatalog",
     log: LogFunc = no_log,
 ) -> list[Path]:
     """
@@ -1209,7 +3396,7 @@ def find_all_jp_counterparts(
 
     Args:
         global_bundle_path: 国际服bundle文件的路径。
-        search_dirs: 用于查找的目录列表。
+        search_dirs: 用于查找的目录列表或已构建的 ResourceCatalog。
         log: 日志记录函数。
 
     Returns:
@@ -1228,22 +3415,17 @@ def find_all_jp_counterparts(
     jp_files: list[Path] = []
     seen_names = set()
 
-    # 2. 在搜索目录中查找匹配前缀的所有文件
-    for search_dir in search_dirs:
-        if not (search_dir.exists() and search_dir.is_dir()):
+    # 2. 在资源目录索引中查找匹配前缀的所有 bundle 文件
+    for entry in _get_catalog(search_dirs).with_prefix(prefix):
+        file_path = entry.path
+        # 排除自身
+        if file_path.name == global_bundle_path.name:
             continue
-        
-        for file_path in search_dir.iterdir():
-            # 排除自身
-            if file_path.name == global_bundle_path.name:
-                continue
-                
-            # 检查文件是否以通用前缀开头，且是 bundle 文件
-            if file_path.is_file() and file_path.name.startswith(prefix) and file_path.suffix == '.bundle':
-                if file_path.name not in seen_names:
-                    jp_files.append(file_path)
-                    seen_names.add(file_path.name)
-                    log(f"  > {t('log.jp_convert.found_match', path=file_path.name)}")
+
+        if file_path.suffix == '.bundle' and file_path.name not in seen_names:
+            jp_files.append(file_path)
+            seen_names.add(file_path.name)
+            log(f"  > {t('log.jp_convert.found_match', path=file_path.name)}")
 
     return jp_files
 
@@ -1279,9 +3461,8 @@ def process_jp_to_global_conversion(
         
         # 1. 从所有日服包中构建一个完整的"替换清单"
         log(f'\n--- {t("log.section.extracting_from_jp")} ---')
-        replacement_map: dict[AssetKey, AssetContent] = {}
+        source_index = ObjectIndex()
         strategy_name = 'cont_name_type'
-        key_func = MATCH_STRATEGIES[strategy_name]
 
         total_files = len(jp_bundle_paths)
         for i, jp_path in enumerate(jp_bundle_paths, 1):
@@ -1291,18 +3472,15 @@ def process_jp_to_global_conversion(
                 log(f"    > ⚠️ {t('message.load_failed')}: {jp_path.name}")
                 continue
             
-            # 提取资源并合并到主清单
-            jp_assets = _extract_assets_from_bundle(
-                jp_env, asset_types_to_replace, key_func, None, log
-            )
-            replacement_map.update(jp_assets)
+            # 索引资源并合并到主清单，资源内容在匹配后才读取
+            source_index.add(jp_env, asset_types_to_replace, named_only=True, log=log, keep_last=True)
 
-        if not replacement_map:
+        if not source_index:
             msg = t("message.jp_convert.no_assets_in_source")
             log(f"  > ⚠️ {msg}")
             return False, msg
         
-        log(f"  > {t('log.jp_convert.extracted_count_from_jp', count=len(replacement_map))}")
+        log(f"  > {t('log.jp_convert.extracted_count_from_jp', count=len(source_index.by_strategy[strategy_name]))}")
 
         # 2. 加载国际服 base 并应用替换
         log(f'\n--- {t("log.section.applying_to_global")} ---')
@@ -1310,8 +3488,10 @@ def process_jp_to_global_conversion(
         if not global_env:
             return False, t("message.jp_convert.load_global_failed")
         
-        replacement_count, replaced_logs, _ = _apply_replacements(
-            global_env, replacement_map, key_func, log
+        global_index = ObjectIndex.from_env(global_env, asset_types_to_replace, log=log)
+        replacement_count, replaced_logs = _apply_matches(
+            source_index, global_index, strategy_name, None, log,
+            save_options.max_workers, save_options.get_texture_cache(),
         )
         
         if replacement_count == 0:
@@ -1382,48 +3562,56 @@ def process_global_to_jp_conversion(
         
         log(f'\n--- {t("log.section.extracting_from_global")} ---')
 
-        # 定义匹配策略
-        strategies: list[tuple[str, KeyGeneratorFunc]] = [
-            ('path_id', MATCH_STRATEGIES['path_id']),
-            ('cont_name_type', MATCH_STRATEGIES['cont_name_type']),
-            ('name_type', MATCH_STRATEGIES['name_type']),
-        ]
+        global_index = ObjectIndex.from_env(global_env, asset_types_to_replace, named_only=True, log=log, keep_last=True)
+        log(f"  > {t('log.jp_convert.extracted_count', count=len(global_index))}")
 
         success_count = 0
         total_changes = 0
         total_files = len(jp_template_paths)
         replaced_files: list[Path] = []  # 记录被成功替换的原始文件路径
 
-        # 2. 按顺序尝试每种策略
-        for strategy_name, key_func in strategies:
-            log(f'\n{t("log.migration.trying_strategy", name=strategy_name)}')
+        # 2. 加载所有日服模板并建立索引，统计每种策略的匹配数量
+        def load_templates() -> list[tuple[Path, Env, ObjectIndex]]:
+            # 模板在每个策略开始前都要重新加载，放入 bundle 缓存以便从快照恢复
+            templates = []
+            for jp_template_path in jp_template_paths:
+                template_env = load_bundle(jp_template_path, log, keep_cached=True)
+                if not template_env:
+                    log(f"  > ❌ {t('message.load_failed')}: {jp_template_path.name}")
+                    continue
+                templates.append((jp_template_path, template_env, ObjectIndex.from_env(template_env, asset_types_to_replace, log=log)))
+            return templates
 
-            # 根据当前策略从国际服 bundle 构建替换清单
-            source_replacement_map = _extract_assets_from_bundle(
-                global_env, asset_types_to_replace, key_func, None, log
-            )
+        templates = load_templates()
 
-            if not source_replacement_map:
-                log(f"  > ⚠️ {t('common.warning')}: {t('log.migration.strategy_no_assets_found', name=strategy_name)}")
-                continue
+        match_counts = {
+            strategy_name: sum(len(global_index.match(index, strategy_name)) for _, _, index in templates)
+            for strategy_name in MIGRATION_STRATEGIES
+        }
+        log(f'  > {t("log.migration.match_counts", counts=", ".join(f"{name}={count}" for name, count in match_counts.items()))}')
 
-            log(f"  > {t('log.jp_convert.extracted_count', count=len(source_replacement_map))}")
+        # 3. 按顺序使用有匹配的策略
+        attempted = False
+        for strategy_name in MIGRATION_STRATEGIES:
+            if not match_counts[strategy_name]:
+                continue
+            # 之前的策略可能已经写入了部分资源，每个策略都从未修改的模板开始
+            if attempted:
+                templates = load_templates()
+            attempted = True
+            log(f'\n{t("log.migration.trying_strategy", name=strategy_name)}')
 
             strategy_success = False
             strategy_total_changes = 0
 
-            # 3. 遍历每个日服模板文件进行处理
-            for i, jp_template_path in enumerate(jp_template_paths, 1):
+            # 遍历每个日服模板文件进行处理
+            for i, (jp_template_path, template_env, template_index) in enumerate(templates, 1):
                 log(t("log.processing_filename_with_progress", current=i, total=total_files, name=jp_template_path.name))
 
-                template_env = load_bundle(jp_template_path, log)
-                if not template_env:
-                    log(f"  > ❌ {t('message.load_failed')}: {jp_template_path.name}")
-                    continue
-
-                # 应用替换，函数会自动匹配并替换存在于模板中的资源
-                replacement_count, replaced_logs, _ = _apply_replacements(
-                    template_env, source_replacement_map, key_func, log
+                # 只读取并写入匹配到的资源
+                replacement_count, replaced_logs = _apply_matches(
+                    global_index, template_index, strategy_name, None, log,
+                    save_options.max_workers, save_options.get_texture_cache(),
                 )
 
                 if replacement_count > 0:
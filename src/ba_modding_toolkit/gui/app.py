@@ -1,6 +1,8 @@
 # gui/app.py
 
+import sqlite3
 import sys
+import threading
 import tkinter as tk
 from tkinter import messagebox
 import ttkbootstrap as tb
@@ -8,7 +10,9 @@ from pathlib import Path
 from ttkbootstrap.widgets.scrolled import ScrolledText 
 
 from ..i18n import i18n_manager, t, get_system_language, get_locale_dir
-from ..utils import get_environment_info, get_BA_path, parse_hex_bytes
+from ..utils import get_environment_info, get_BA_path, get_search_resource_dirs, parse_hex_bytes
+from ..core import ResourceCatalog
+from ..bundle_index import BundleIndex, DEFAULT_INDEX_FILENAME
 from .components import Theme, Logger, UIComponents
 from .utils import ConfigManager, open_directory, select_directory
 from .dialogs import SettingsDialog
@@ -21,6 +25,9 @@ class App(tk.Frame):
         self.master: tk.Tk = master
         self.setup_main_window()
         self.config_manager = ConfigManager()
+        self.bundle_index = self.open_bundle_index()
+        self._resource_catalog: ResourceCatalog | None = None
+        self._resource_catalog_lock = threading.Lock()
         self.init_shared_variables()
         # 在创建UI组件前加载配置，确保语言设置正确
         self.load_config_on_startup()  # 启动时加载配置
@@ -65,6 +72,8 @@ class App(tk.Frame):
         self.enable_crc_correction_var.set("auto")
         self.create_backup_var.set(True)
         self.compression_method_var.set("lzma")
+        self.max_workers_var.set("1")
+        self.use_batch_journal_var.set(True)
         
         # JP/GB转换自动搜索选项
         self.auto_search_var.set(True)
@@ -100,6 +109,8 @@ class App(tk.Frame):
         self.enable_crc_correction_var = tk.StringVar()
         self.create_backup_var = tk.BooleanVar()
         self.compression_method_var = tk.StringVar()
+        self.max_workers_var = tk.StringVar()
+        self.use_batch_journal_var = tk.BooleanVar()
         # JP/GB转换自动搜索选项
         self.auto_search_var = tk.BooleanVar()
         # 一键更新的资源类型选项
@@ -178,6 +189,27 @@ class App(tk.Frame):
         if not lang_path.exists():
             self.logger.log(t("log.config.language_missing", language=language))
 
+    def open_bundle_index(self) -> BundleIndex | None:
+        """打开与 config.toml 同目录的资源指纹索引，无法打开时不使用索引"""
+        try:
+            return BundleIndex(self.config_manager.config_file.with_name(DEFAULT_INDEX_FILENAME))
+        except sqlite3.Error as e:
+            print(f"无法打开资源指纹索引: {e}")
+            return None
+
+    def get_resource_catalog(self) -> ResourceCatalog:
+        """获取当前游戏资源目录的文件索引，目录设置或目录内容变化时重新构建"""
+        search_dirs = get_search_resource_dirs(
+            Path(self.game_resource_dir_var.get()), self.auto_detect_subdirs_var.get()
+        )
+        with self._resource_catalog_lock:
+            catalog = self._resource_catalog
+            if catalog is None or catalog.search_dirs != search_dirs:
+                catalog = self._resource_catalog = ResourceCatalog(search_dirs)
+            elif catalog.is_stale():
+                catalog.refresh()
+            return catalog
+
     def open_settings_dialog(self):
         """打开高级设置对话框"""
         dialog = SettingsDialog(self.master, self)
@@ -191,6 +223,13 @@ class App(tk.Frame):
         """获取用户输入的 extra_bytes 配置值"""
         return parse_hex_bytes(self.extra_bytes_var.get())
 
+    def get_max_workers(self) -> int:
+        """获取用户输入的并行进程数，无效输入时为 1"""
+        try:
+            return max(1, int(self.max_workers_var.get()))
+        except ValueError:
+            return 1
+
     def select_game_resource_directory(self):
         # 根据复选框状态决定对话框标题
         if self.auto_detect_subdirs_var.get():
@@ -141,6 +141,20 @@ class SettingsDialog(tb.Toplevel):
             tooltip=t("option.compression_method_info")
         )
 
+        SettingRow.create_entry_row(
+            section,
+            label=t("option.max_workers"),
+            text_var=self.app.max_workers_var,
+            tooltip=t("option.max_workers_info")
+        )
+
+        SettingRow.create_switch(
+            section,
+            label=t("option.use_batch_journal"),
+            variable=self.app.use_batch_journal_var,
+            tooltip=t("option.use_batch_journal_info")
+        )
+
     def _init_asset_options(self):
         """初始化资源替换选项"""
         section = self._create_section(t("ui.settings.group_assets"))
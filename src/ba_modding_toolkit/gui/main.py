@@ -1,11 +1,16 @@
 # gui/main.py
 
+import multiprocessing
+
 from tkinterdnd2 import TkinterDnD
 import ttkbootstrap as tb
 
 from .app import App
 
 def main():
+    # 打包为可执行文件后，进程池的子进程需要此调用
+    multiprocessing.freeze_support()
+
     # 先创建 TkinterDnD 窗口
     root = TkinterDnD.Tk()
     # 应用 ttkbootstrap 样式
@@ -4,14 +4,13 @@ import tkinter as tk
 import ttkbootstrap as tb
 from tkinter import messagebox
 from pathlib import Path
-import shutil
 
 from ...i18n import t
 from ..base_tab import TabFrame
 from ..components import DropZone, UIComponents, SettingRow
 from ..utils import replace_file
-from ...utils import CRCUtils, get_search_resource_dirs
-from ...core import parse_filename
+from ...utils import CRCUtils
+from ...core import parse_filename, find_crc_patch_offset
 
 class CrcToolTab(TabFrame):
     def create_widgets(self):
@@ -34,6 +33,15 @@ class CrcToolTab(TabFrame):
             expand=True
         )
 
+        # 原地修正开关
+        self.patch_in_place_var = tk.BooleanVar(value=False)
+        SettingRow.create_switch(
+            self,
+            label=t("option.crc_patch_in_place"),
+            variable=self.patch_in_place_var,
+            tooltip=t("option.crc_patch_in_place_info")
+        )
+
         # 原始文件
         self.original_zone = DropZone(
             self, title=t("ui.label.original_file"),
@@ -80,18 +88,12 @@ class CrcToolTab(TabFrame):
             self.logger.log(f'⚠️ {t("log.game_dir_not_set")}')
             return
 
-        base_game_dir = Path(game_dir_str)
-        search_dirs = get_search_resource_dirs(base_game_dir, self.app.auto_detect_subdirs_var.get())
-
-        for directory in search_dirs:
-            if not directory.is_dir():
-                continue
-            
-            candidate = directory / path.name
-            if candidate.exists():
-                self.original_zone.set_path(candidate)
-                self.logger.log(t("log.file_found_in_subdir", subdir=directory.name, filename=candidate.name))
-                return
+        matches = self.app.get_resource_catalog().find_by_name(path.name)
+        if matches:
+            candidate = matches[0].path
+            self.original_zone.set_path(candidate)
+            self.logger.log(t("log.file_found_in_subdir", subdir=candidate.parent.name, filename=candidate.name))
+            return
         
         self.logger.log(f'⚠️ {t("log.file_not_found_in_dirs", filename=path.name)}')
 
@@ -158,10 +160,19 @@ class CrcToolTab(TabFrame):
             if target_crc is None:
                 return False
             
-            # 检测当前文件 CRC 是否已匹配目标
-            current_crc = CRCUtils.compute_crc32(self.modified_zone.path)
+            modified_path = self.modified_zone.path
+            output_path = output_dir / modified_path.name
+            # 输出目录即文件所在目录时直接原地修正；否则边复制边计算 CRC，修正时不再读取整个文件
+            in_place = output_path.resolve() == modified_path.resolve()
+            if in_place:
+                current_crc = CRCUtils.compute_crc32(modified_path)
+            else:
+                current_crc = CRCUtils.copy_with_crc32(modified_path, output_path)
+                self.logger.log(t("log.file.saved", path=output_path))
             
+            # 检测当前文件 CRC 是否已匹配目标
             if current_crc == target_crc:
+                self.final_output_path = output_path
                 self.logger.log(f'⚠️ {t("log.crc.match_no_correction_needed")}')
                 messagebox.showinfo(t("common.result"), t("message.crc.match_no_correction_needed"))
                 self.logger.status(t("status.calculation_done"))
@@ -169,13 +180,23 @@ class CrcToolTab(TabFrame):
                     self.master.after(0, lambda: self.replace_button.config(state=tk.NORMAL))
                 return True
             
-            output_filename = self.modified_zone.path.name
-            output_path = output_dir / output_filename
-            
-            shutil.copy2(self.modified_zone.path, output_path)
-            self.logger.log(t("log.file.saved", path=output_path))
-            
-            success = CRCUtils.manipulate_file_crc(output_path, target_crc, self.app.get_extra_bytes())
+            if self.patch_in_place_var.get():
+                patch_offset = find_crc_patch_offset(output_path)
+                if patch_offset is None:
+                    if not in_place:
+                        output_path.unlink(missing_ok=True)
+                    self.logger.log(f'❌ {t("log.crc.no_patch_offset")}')
+                    messagebox.showerror(t("common.fail"), t("message.crc.no_patch_offset", option=t("option.crc_patch_in_place")))
+                    self.logger.status(t("status.failed"))
+                    return False
+                # 改写保留的 4 个字节，文件大小不变
+                self.logger.log(t("log.crc.patch_offset", offset=patch_offset))
+                success = CRCUtils.forge_crc_at_offset(output_path, target_crc, patch_offset)
+            else:
+                # 沿用已计算的 CRC，只需在末尾追加修正字节
+                success = CRCUtils.append_crc_fix(
+                    output_path, target_crc, self.app.get_extra_bytes(), crc_state=current_crc
+                )
             
             if success:
                 self.final_output_path = output_path
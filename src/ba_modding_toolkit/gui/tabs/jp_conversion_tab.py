@@ -7,7 +7,6 @@ from pathlib import Path
 
 from ...i18n import t
 from ... import core
-from ...utils import get_search_resource_dirs
 from ..base_tab import TabFrame
 from ..components import DropZone, FileListbox, ModeSwitcher, SettingRow, UIComponents
 from ..dialogs import FileSelectionDialog
@@ -130,8 +129,7 @@ class JPGLConversionTab(TabFrame):
 
     def _find_worker(self):
         self.logger.status(t("status.searching"))
-        base_game_dir = Path(self.app.game_resource_dir_var.get())
-        game_search_dirs = get_search_resource_dirs(base_game_dir, self.app.auto_detect_subdirs_var.get())
+        game_search_dirs = self.app.get_resource_catalog()
 
         jp_files = core.find_all_jp_counterparts(
             self.global_zone.path, game_search_dirs, self.logger.log
@@ -178,14 +176,14 @@ class JPGLConversionTab(TabFrame):
         # 更新UI为搜索中状态
         self.master.after(0, lambda: self.global_zone.set_searching())
 
-        base_game_dir = Path(self.app.game_resource_dir_var.get())
-        search_paths = get_search_resource_dirs(base_game_dir, self.app.auto_detect_subdirs_var.get())
+        search_paths = self.app.get_resource_catalog()
 
         # 使用find_new_bundle_path查找Global文件
         found_paths, message = core.find_new_bundle_path(
             jp_file,
             search_paths,
-            self.logger.log
+            self.logger.log,
+            index=self.app.bundle_index
         )
 
         # 在主线程中处理结果
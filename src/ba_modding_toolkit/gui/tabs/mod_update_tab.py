@@ -11,7 +11,6 @@ from ..base_tab import TabFrame
 from ..components import DropZone, FileListbox, ModeSwitcher, UIComponents
 from ..dialogs import FileSelectionDialog
 from ..utils import replace_file
-from ...utils import get_search_resource_dirs
 
 class ModUpdateTab(TabFrame):
     """一个整合了单个更新和批量更新功能的标签页"""
@@ -103,13 +102,13 @@ class ModUpdateTab(TabFrame):
         self.new_mod_zone.set_searching()
         self.logger.status(t("status.processing_detailed"))
         
-        base_game_dir = Path(self.app.game_resource_dir_var.get())
-        search_paths = get_search_resource_dirs(base_game_dir, self.app.auto_detect_subdirs_var.get())
+        search_paths = self.app.get_resource_catalog()
 
         found_paths, message = core.find_new_bundle_path(
             self.old_mod_zone.path,
             search_paths,
-            self.logger.log
+            self.logger.log,
+            index=self.app.bundle_index
         )
         
         self.master.after(0, lambda: self._handle_search_result(found_paths, message))
@@ -286,8 +285,7 @@ class ModUpdateTab(TabFrame):
         self.logger.status(t("status.batch_starting"))
 
         output_dir = Path(self.app.output_dir_var.get())
-        base_game_dir = Path(self.app.game_resource_dir_var.get())
-        search_paths = get_search_resource_dirs(base_game_dir, self.app.auto_detect_subdirs_var.get())
+        search_paths = self.app.get_resource_catalog()
         
         try:
             output_dir.mkdir(parents=True, exist_ok=True)
@@ -326,7 +324,7 @@ class ModUpdateTab(TabFrame):
 
         # 更新UI状态的回调函数
         def progress_callback(current, total, filename):
-            self.logger.status(t("status.processing_batch", current=current, total=total, filename=filename))
+            self.logger.status(t("status.batch_progress", current=current, total=total, filename=filename))
 
         success_count, fail_count, failed_tasks = core.process_batch_mod_update(
             mod_file_list=self.mod_file_list,
@@ -336,7 +334,10 @@ class ModUpdateTab(TabFrame):
             save_options=save_options,
             spine_options=spine_options,
             log=self.logger.log,
-            progress_callback=progress_callback
+            progress_callback=progress_callback,
+            index=self.app.bundle_index,
+            max_workers=self.app.get_max_workers(),
+            journal=core.BatchJournal.in_directory(output_dir) if self.app.use_batch_journal_var.get() else None
         )
         
         total_files = len(self.mod_file_list)
@@ -356,7 +356,9 @@ class ConfigManager:
                     "extra_bytes": app.extra_bytes_var.get(),
                     "enable_crc_correction": app.enable_crc_correction_var.get(),
                     "create_backup": app.create_backup_var.get(),
-                    "compression_method": app.compression_method_var.get()
+                    "compression_method": app.compression_method_var.get(),
+                    "max_workers": app.max_workers_var.get(),
+                    "use_batch_journal": app.use_batch_journal_var.get()
                 },
                 "ResourceTypes": {
                     "replace_texture2d": app.replace_texture2d_var.get(),
@@ -413,6 +415,8 @@ class ConfigManager:
             app.enable_crc_correction_var.set(global_options.get("enable_crc_correction", "auto"))
             app.create_backup_var.set(global_options.get("create_backup", False))
             app.compression_method_var.set(global_options.get("compression_method", ""))
+            app.max_workers_var.set(global_options.get("max_workers", "1"))
+            app.use_batch_journal_var.set(global_options.get("use_batch_journal", True))
             
             resource_types = data.get("ResourceTypes", {})
             app.replace_texture2d_var.set(resource_types.get("replace_texture2d", False))
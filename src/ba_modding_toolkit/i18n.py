@@ -35,7 +35,7 @@ def get_system_language() -> str | None:
         loc = locale.getdefaultlocale()[0]
         return loc.replace("_", "-")
     except Exception:
-        print("Error: Failed to detect system language.")
+        print("Error: Failed to detect system language.", file=sys.stderr)
         return None
 
 def get_default_language() -> str:
@@ -73,13 +73,13 @@ class I18n:
         - zh-* 语言：回退到 zh-CN → key
         - 其他语言：回退到 en-US → key
         """
-        print(f"Loading locales from: {self.locales_dir}")
+        print(f"Loading locales from: {self.locales_dir}", file=sys.stderr)
         
         if self.lang == "debug":
             self.translations = {}
             self.fallback_translations = {}
             self._get_template.cache_clear()
-            print("I18n: Debug mode enabled.")
+            print("I18n: Debug mode enabled.", file=sys.stderr)
             return
 
         if self.lang.startswith("zh-"):
@@ -94,17 +94,17 @@ class I18n:
         fallback_exists = fallback_path.exists()
 
         if not main_exists and not fallback_exists:
-            print(f"I18n Warning: Language '{self.lang}' not found, fallback '{fallback_code}' not found either.")
+            print(f"I18n Warning: Language '{self.lang}' not found, fallback '{fallback_code}' not found either.", file=sys.stderr)
         elif not main_exists and fallback_exists:
-            print(f"I18n: Language '{self.lang}' not found, using fallback '{fallback_code}'.")
+            print(f"I18n: Language '{self.lang}' not found, using fallback '{fallback_code}'.", file=sys.stderr)
         elif main_exists:
-            print(f"I18n: Loaded language '{self.lang}'.")
+            print(f"I18n: Loaded language '{self.lang}'.", file=sys.stderr)
 
         self.translations = self._load_translation_file(main_path)
         self.fallback_translations = self._load_translation_file(fallback_path)
 
         if not self.translations and not self.fallback_translations:
-            print(f"Warning: No translation files found for '{self.lang}' or '{fallback_code}'.")
+            print(f"Warning: No translation files found for '{self.lang}' or '{fallback_code}'.", file=sys.stderr)
 
         self._get_template.cache_clear()
 
@@ -115,7 +115,7 @@ class I18n:
         try:
             return json.loads(path.read_text(encoding="utf-8"))
         except (json.JSONDecodeError, OSError) as e:
-            print(f"Warning: Failed to load translations from {path}: {e}")
+            print(f"Warning: Failed to load translations from {path}: {e}", file=sys.stderr)
             return {}
 
     @lru_cache(maxsize=1024)
@@ -166,10 +166,10 @@ class I18n:
             return template.format(**kwargs)
         except KeyError as e:
             # 如果 JSON 里写了 {name} 但代码没传 name 参数，避免崩溃，返回原始模板或报错信息
-            print(f"Warning: Missing format argument {e} for key '{_key}'")
+            print(f"Warning: Missing format argument {e} for key '{_key}'", file=sys.stderr)
             return template
         except Exception as e:
-            print(f"Warning: Formatting error for key '{_key}': {e}")
+            print(f"Warning: Formatting error for key '{_key}': {e}", file=sys.stderr)
             return template
 
     def set_language(self, lang: str) -> None:
@@ -0,0 +1,157 @@
+# texture_cache.py
+
+import hashlib
+import os
+import tempfile
+import threading
+from importlib import metadata
+from pathlib import Path
+
+from PIL import Image
+
+# 默认缓存目录与容量 (MB)，可通过环境变量 BAMT_TEXTURE_CACHE_DIR、BAMT_TEXTURE_CACHE_MB 调整
+DEFAULT_TEXTURE_CACHE_DIR = Path(tempfile.gettempdir()) / "bamt_texture_cache"
+DEFAULT_TEXTURE_CACHE_MB = 1024
+
+# 缓存文件格式版本，格式变化时旧缓存自然失效
+CACHE_FORMAT_VERSION = 1
+
+# 影响编码结果的库
+_ENCODER_PACKAGES = ("UnityPy", "Pillow", "etcpak", "astc-encoder-py")
+
+
+def _get_encoder_version() -> str:
+    versions = []
+    for package in _ENCODER_PACKAGES:
+        try:
+            versions.append(f"{package}={metadata.version(package)}")
+        except metadata.PackageNotFoundError:
+            pass
+    return ";".join(versions)
+
+ENCODER_VERSION = _get_encoder_version()
+
+
+class TextureCache:
+    """
+    以内容寻址的纹理编码结果磁盘缓存。
+
+    键由源图像 RGBA 像素的哈希、目标纹理格式、平台、尺寸、mip 数量和编码器版本组成，
+    值为编码后的图像数据和实际使用的纹理格式。每个条目是缓存目录下的一个文件，
+    命中时更新文件的修改时间，总大小超过上限时按修改时间淘汰最久未使用的条目。
+    """
+
+    def __init__(self, cache_dir: Path | str, max_bytes: int):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total_bytes: int | None = None
+
+    @staticmethod
+    def make_key(
+        image: Image.Image,
+        target_format: int,
+        platform: int,
+        platform_blob: bytes | list | None,
+        mip_count: int = 1,
+    ) -> str:
+        """计算缓存键。"""
+        rgba = image if image.mode == "RGBA" else image.convert("RGBA")
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(rgba.tobytes())
+        params = (
+            CACHE_FORMAT_VERSION, ENCODER_VERSION, target_format, platform,
+            bytes(platform_blob or b""), rgba.width, rgba.height, mip_count,
+        )
+        digest.update(repr(params).encode("utf-8"))
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.bin"
+
+    def get(self, key: str) -> tuple[bytes, int] | None:
+        """读取缓存的 (编码后的数据, 纹理格式)，未命中时返回 None。"""
+        path = self._entry_path(key)
+        try:
+            raw = path.read_bytes()
+            os.utime(path)
+        except OSError:
+            return None
+        if len(raw) < 4:
+            return None
+        return raw[4:], int.from_bytes(raw[:4], "little")
+
+    def put(self, key: str, image_data: bytes, texture_format: int) -> None:
+        """写入缓存条目，写入失败时忽略。"""
+        if self.max_bytes <= 0:
+            return
+        path = self._entry_path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(texture_format.to_bytes(4, "little"))
+                f.write(image_data)
+            os.replace(temp_path, path)
+        except OSError:
+            return
+
+        with self._lock:
+            if self._total_bytes is not None:
+                self._total_bytes += len(image_data) + 4
+            self._evict()
+
+    def _entries(self) -> list[tuple[int, int, Path]]:
+        """列出所有缓存条目 (修改时间, 大小, 路径)。"""
+        entries = []
+        if not self.cache_dir.is_dir():
+            return entries
+        for path in self.cache_dir.glob("*/*.bin"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime_ns, st.st_size, path))
+        return entries
+
+    def _evict(self) -> None:
+        if self._total_bytes is not None and self._total_bytes <= self.max_bytes:
+            return
+        entries = self._entries()
+        self._total_bytes = sum(size for _, size, _ in entries)
+        # 按修改时间从旧到新淘汰，直到低于上限
+        for _, size, path in sorted(entries):
+            if self._total_bytes <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            self._total_bytes -= size
+
+    def clear(self) -> None:
+        """删除所有缓存条目。"""
+        with self._lock:
+            for _, _, path in self._entries():
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+            self._total_bytes = 0
+
+
+_default_cache: TextureCache | None = None
+_default_cache_lock = threading.Lock()
+
+def get_texture_cache() -> TextureCache:
+    """获取默认的纹理缓存，位置与容量由环境变量决定。"""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            try:
+                max_mb = int(os.environ.get("BAMT_TEXTURE_CACHE_MB", DEFAULT_TEXTURE_CACHE_MB))
+            except ValueError:
+                max_mb = DEFAULT_TEXTURE_CACHE_MB
+            cache_dir = os.environ.get("BAMT_TEXTURE_CACHE_DIR") or DEFAULT_TEXTURE_CACHE_DIR
+            _default_cache = TextureCache(cache_dir, max_mb * 1024 * 1024)
+        return _default_cache
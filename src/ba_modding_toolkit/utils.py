@@ -1,15 +1,17 @@
 # utils.py
 
 import binascii
+import mmap
 import os
 import re
 import shutil
 from PIL import Image
 import subprocess
 import tempfile
+from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Callable
+from typing import BinaryIO, Callable, Iterator
 
 from .i18n import i18n_manager, t
 
@@ -88,6 +90,47 @@ def parse_hex_bytes(hex_str: str | None) -> bytes | None:
 
 LogFunc = Callable[[str], None]
 
+# --- 内存映射读取 ---
+
+# 是否使用 mmap 读取输入文件。在 mmap 较慢的文件系统（如部分网络盘）上，
+# 可以设置环境变量 BAMT_NO_MMAP=1 或调用 set_mmap_enabled(False) 回退为普通读取。
+_mmap_enabled = os.environ.get("BAMT_NO_MMAP", "").lower() not in ("1", "true", "yes")
+
+def set_mmap_enabled(enabled: bool) -> None:
+    """设置是否使用 mmap 读取输入文件。"""
+    global _mmap_enabled
+    _mmap_enabled = enabled
+
+def is_mmap_enabled() -> bool:
+    """返回当前是否使用 mmap 读取输入文件。"""
+    return _mmap_enabled
+
+@contextmanager
+def map_file(path: str | Path) -> Iterator[memoryview]:
+    """
+    以只读方式映射整个文件，返回其 memoryview。
+    禁用 mmap 或文件为空时，回退为一次性读入内存。
+
+    在上下文内切出的子视图如果仍被引用（例如交给 UnityPy 的读取器），
+    退出时不会强制关闭映射，而是交由垃圾回收释放。
+    """
+    with open(path, "rb") as f:
+        if not _mmap_enabled or os.fstat(f.fileno()).st_size == 0:
+            yield memoryview(f.read())
+            return
+
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mm)
+        try:
+            yield view
+        finally:
+            view.release()
+            try:
+                mm.close()
+            except BufferError:
+                # 仍有子视图引用该映射，留给垃圾回收处理
+                pass
+
 class CRCUtils:
     """
     一个封装了CRC32计算和修正逻辑的工具类。
@@ -97,6 +140,7 @@ class CRCUtils:
     POLY_NORMAL = 0x104C11DB7
     POLY_DEGREE = 32
     GF2_INVERSE_X32 = 0xCBF1ACDA
+    PATCH_SIZE = 4  # CRC 修正字节的长度
     _BIT_REVERSE_TABLE = bytes(int(f"{i:08b}"[::-1], 2) for i in range(256))
 
     # --- 公开的静态方法 ---
@@ -112,12 +156,9 @@ class CRCUtils:
 
     @staticmethod
     def _compute_crc32_file(path: str | Path) -> int:
-        """分块计算文件 CRC32，避免大文件内存溢出"""
-        crc = 0
-        with open(path, "rb") as f:
-            while chunk := f.read(8192):  # 8KB 分块
-                crc = binascii.crc32(chunk, crc)
-        return crc & 0xFFFFFFFF
+        """通过内存映射计算文件 CRC32，避免把整个文件读入内存"""
+        with map_file(path) as view:
+            return binascii.crc32(view) & 0xFFFFFFFF
 
     @staticmethod
     def check_crc_match(source_1: Path | str | bytes, source_2: Path | str | bytes) -> tuple[bool, int, int]:
@@ -131,45 +172,148 @@ class CRCUtils:
         return crc_1 == crc_2, crc_1, crc_2
     
     @staticmethod
-    def apply_crc_fix(modified_data: bytes, target_crc: int) -> bytes | None:
+    def compute_crc32_stream(f: BinaryIO, crc: int = 0, chunk_size: int = 1 << 20) -> int:
         """
-        计算修正CRC后的数据，使其达到指定的目标CRC值。
-        如果修正成功，返回修正后的完整字节数据；如果失败，返回None。
+        从文件句柄的当前位置读到末尾，分块累计 CRC32。
+        crc: 之前已计算部分的 CRC32 值。
+        """
+        while chunk := f.read(chunk_size):
+            crc = binascii.crc32(chunk, crc)
+        return crc & 0xFFFFFFFF
+
+    @staticmethod
+    def copy_with_crc32(src: str | Path, dest: str | Path, chunk_size: int = 1 << 20) -> int:
+        """
+        分块复制文件，并在复制的同时累计 CRC32，返回所复制内容的 CRC32 值。
+        复制后再修正 CRC 时可直接作为 crc_state 使用，无需再读取一遍文件。
+        """
+        crc = 0
+        with open(src, "rb") as f_in, open(dest, "wb") as f_out:
+            while chunk := f_in.read(chunk_size):
+                crc = binascii.crc32(chunk, crc)
+                f_out.write(chunk)
+        shutil.copystat(src, dest)
+        return crc & 0xFFFFFFFF
+
+    @staticmethod
+    def crc32_combine(crc_1: int, crc_2: int, length_2: int) -> int:
+        """
+        由 crc32(A)、crc32(B) 和 B 的长度计算 crc32(A + B)，无需重新扫描数据。
+        """
+        return CRCUtils._multiply_mod_p(CRCUtils._x_pow_8n_mod_p(length_2), crc_1) ^ (crc_2 & 0xFFFFFFFF)
+
+    @staticmethod
+    def compute_crc_correction(crc_state: int, target_crc: int) -> bytes | None:
         """
-        # 计算新数据加上4个空字节的CRC，为修正值留出空间
-        base_crc = binascii.crc32(modified_data)
-        crc_with_zeros = binascii.crc32(b'\x00\x00\x00\x00', base_crc) & 0xFFFFFFFF
+        根据已写入数据的累计 CRC32 值，计算需要追加的 4 个修正字节，使整体 CRC 达到目标值。
+        计算量与已写入数据的长度无关。无法修正时返回 None。
+        """
+        crc_with_zeros = binascii.crc32(b'\x00\x00\x00\x00', crc_state) & 0xFFFFFFFF
         k = CRCUtils._reverse_bits_32(target_crc ^ crc_with_zeros)
 
         correction_value = CRCUtils._gf2_multiply_mod(k, CRCUtils.GF2_INVERSE_X32)
         correction_bytes = CRCUtils._reverse_bytes_internal_bits(correction_value)
-        final_data = modified_data + correction_bytes
 
-        final_crc = CRCUtils.compute_crc32(final_data)
-        is_crc_match = (final_crc == target_crc)
-        return final_data if is_crc_match else None
+        # 用 CRC 合并验证结果，无需重新扫描数据
+        final_crc = CRCUtils.crc32_combine(crc_state, binascii.crc32(correction_bytes), len(correction_bytes))
+        return correction_bytes if final_crc == target_crc else None
 
     @staticmethod
-    def manipulate_file_crc(modified_path: str | Path, target_crc: int, extra_bytes: bytes | None = None) -> bool:
+    def apply_crc_fix(modified_data: bytes, target_crc: int) -> bytes | None:
         """
-        修正modified_path文件的CRC，使其达到指定的目标CRC值
-        这个函数会直接修改文件内容，而不是输出到指定目录
-        extra_bytes: 可选的4字节数据，将在CRC计算前附加到modified_data后
+        计算修正CRC后的数据，使其达到指定的目标CRC值。
+        如果修正成功，返回修正后的完整字节数据；如果失败，返回None。
+        """
+        correction_bytes = CRCUtils.compute_crc_correction(binascii.crc32(modified_data), target_crc)
+        return modified_data + correction_bytes if correction_bytes else None
+
+    @staticmethod
+    def append_crc_fix(
+        modified_path: str | Path,
+        target_crc: int,
+        extra_bytes: bytes | None = None,
+        crc_state: int | None = None,
+    ) -> bool:
+        """
+        在文件末尾原地追加 extra_bytes 和 4 个修正字节，使文件的CRC达到指定的目标值。
+        crc_state: 文件当前内容的 CRC32 值。已知时不再读取文件，否则读取一遍文件计算。
+        修正失败时不修改文件。
         """
-        with open(str(modified_path), "rb") as f:
-            modified_data = f.read()
+        with open(modified_path, "r+b") as f:
+            if crc_state is None:
+                crc_state = CRCUtils.compute_crc32_stream(f)
+            if extra_bytes:
+                crc_state = binascii.crc32(extra_bytes, crc_state)
+
+            correction_bytes = CRCUtils.compute_crc_correction(crc_state, target_crc)
+            if correction_bytes is None:
+                return False
 
-        if extra_bytes:
-            modified_data = modified_data + extra_bytes
+            f.seek(0, os.SEEK_END)
+            f.write((extra_bytes or b"") + correction_bytes)
+        return True
 
-        corrected_data = CRCUtils.apply_crc_fix(modified_data, target_crc)
+    @staticmethod
+    def compute_crc_patch(prefix_crc: int, suffix_crc: int, suffix_length: int, target_crc: int) -> bytes | None:
+        """
+        计算写在数据中间的 4 个修正字节，使 前缀 + 修正字节 + 后缀 的CRC达到指定的目标值。
+        只需前缀和后缀各自的 CRC32 值与后缀长度。无法修正时返回 None。
+        """
+        # 由目标值反推修正字节之后应有的累计 CRC
+        required_crc = CRCUtils._multiply_mod_p(
+            CRCUtils._x_pow_8n_mod_p(suffix_length, inverse=True), (target_crc ^ suffix_crc) & 0xFFFFFFFF
+        )
+        patch_bytes = CRCUtils.compute_crc_correction(prefix_crc, required_crc)
+        if patch_bytes is None:
+            return None
 
-        if corrected_data:
-            with open(modified_path, "wb") as f:
-                f.write(corrected_data)
-            return True
+        final_crc = CRCUtils.crc32_combine(required_crc, suffix_crc, suffix_length)
+        return patch_bytes if final_crc == target_crc else None
 
-        return False
+    @staticmethod
+    def forge_crc_at_offset(modified_path: str | Path, target_crc: int, offset: int) -> bool:
+        """
+        改写文件中 offset 处的 4 个字节，使文件的CRC达到指定的目标值，文件大小不变。
+        读取一遍文件计算 offset 前后两部分的 CRC，再通过内存映射只写入这 4 个字节。
+        调用方需保证这 4 个字节的内容不影响文件的解析（如对齐填充或末尾的附加字节）。
+        offset 超出文件范围或修正失败时返回 False，且不修改文件。
+        """
+        with open(modified_path, "r+b") as f:
+            file_size = os.fstat(f.fileno()).st_size
+            if offset < 0 or offset + CRCUtils.PATCH_SIZE > file_size:
+                return False
+            suffix_length = file_size - offset - CRCUtils.PATCH_SIZE
+
+            if not _mmap_enabled:
+                prefix_crc = binascii.crc32(f.read(offset))
+                f.seek(CRCUtils.PATCH_SIZE, os.SEEK_CUR)
+                suffix_crc = CRCUtils.compute_crc32_stream(f)
+                patch_bytes = CRCUtils.compute_crc_patch(prefix_crc, suffix_crc, suffix_length, target_crc)
+                if patch_bytes is None:
+                    return False
+                f.seek(offset)
+                f.write(patch_bytes)
+                return True
+
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_WRITE) as mm:
+                with memoryview(mm) as view:
+                    prefix_crc = binascii.crc32(view[:offset])
+                    suffix_crc = binascii.crc32(view[offset + CRCUtils.PATCH_SIZE:])
+                patch_bytes = CRCUtils.compute_crc_patch(prefix_crc, suffix_crc, suffix_length, target_crc)
+                if patch_bytes is None:
+                    return False
+                mm[offset:offset + CRCUtils.PATCH_SIZE] = patch_bytes
+                mm.flush()
+        return True
+
+    @staticmethod
+    def manipulate_file_crc(modified_path: str | Path, target_crc: int, extra_bytes: bytes | None = None) -> bool:
+        """
+        修正modified_path文件的CRC，使其达到指定的目标CRC值
+        这个函数会直接修改文件内容，而不是输出到指定目录
+        extra_bytes: 可选的4字节数据，将在CRC计算前附加到modified_data后
+        """
+        return CRCUtils.append_crc_fix(modified_path, target_crc, extra_bytes)
 
     # --- 内部使用的私有静态方法 ---
 
@@ -186,6 +330,51 @@ class CRCUtils:
         b = val_u32.to_bytes(4, 'big')
         return bytes(CRCUtils._BIT_REVERSE_TABLE[x] for x in b)
 
+    # 反射形式的 CRC32 多项式，用于 CRC 合并
+    _POLY_REFLECTED = 0xEDB88320
+    # 反射形式下的 x 与 x^-1
+    _X_REFLECTED = 1 << 30
+    _X_INVERSE_REFLECTED = 0xDB710641
+    # _X2N_TABLES[inverse][k] = x^(±2^k) mod P（反射形式），首次使用时生成
+    _X2N_TABLES: dict[bool, list[int]] = {}
+
+    @staticmethod
+    def _multiply_mod_p(a: int, b: int) -> int:
+        """反射形式下计算 a * b mod P，a 不能为 0"""
+        m = 1 << 31
+        p = 0
+        while True:
+            if a & m:
+                p ^= b
+                if (a & (m - 1)) == 0:
+                    break
+            m >>= 1
+            b = (b >> 1) ^ CRCUtils._POLY_REFLECTED if b & 1 else b >> 1
+        return p
+
+    @staticmethod
+    def _x_pow_8n_mod_p(n: int, inverse: bool = False) -> int:
+        """
+        计算 x^(8n) mod P（反射形式），即跨过 n 个字节的 CRC 移位算子。
+        inverse 为 True 时计算其逆元 x^(-8n) mod P。
+        """
+        table = CRCUtils._X2N_TABLES.get(inverse)
+        if table is None:
+            table = []
+            p = CRCUtils._X_INVERSE_REFLECTED if inverse else CRCUtils._X_REFLECTED
+            for _ in range(32):
+                table.append(p)
+                p = CRCUtils._multiply_mod_p(p, p)
+            CRCUtils._X2N_TABLES[inverse] = table
+        p = 1 << 31  # x^0
+        k = 3
+        while n:
+            if n & 1:
+                p = CRCUtils._multiply_mod_p(table[k & 31], p)
+            n >>= 1
+            k += 1
+        return p
+
     @staticmethod
     def _gf2_multiply_mod(a, b):
         result = 0
@@ -0,0 +1,63 @@
+"""
+压缩基准测试：比较 bundle 保存时串行压缩与并行块压缩的耗时，并检查两者输出完全相同。
+
+用法:
+    python tests/benchmarks/bench_compression.py [bundle路径] [--workers N] [--repeat N]
+
+并行只对按块压缩的 LZ4 生效（每块 128 KiB），建议使用解压后大于 1 MiB 的 bundle（如立绘、角色 Spine bundle）。
+LZMA 在 UnityPy 中整体作为一个块压缩，只作为对照。
+未指定时使用 tests/assets/packer 下的第一个 bundle。
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+from ba_modding_toolkit.core import bundle_cache, compress_bundle, load_bundle
+
+
+def measure(bundle_path: Path, compression: str, max_workers: int, repeat: int) -> tuple[float, bytes]:
+    """每轮重新加载 bundle（不计入耗时），取最短耗时。"""
+    best = float("inf")
+    data = b""
+    for _ in range(repeat):
+        bundle_cache.invalidate(bundle_path)
+        env = load_bundle(bundle_path)
+        start = time.perf_counter()
+        data = compress_bundle(env, compression, max_workers=max_workers)
+        best = min(best, time.perf_counter() - start)
+    return best, data
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("bundle", nargs="?", type=Path)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    bundle_path: Path | None = args.bundle
+    if bundle_path is None:
+        samples = sorted((Path(__file__).parents[1] / "assets" / "packer").glob("*.bundle"))
+        if not samples:
+            sys.exit("No bundle specified and no sample bundle found.")
+        bundle_path = samples[0]
+
+    if load_bundle(bundle_path) is None:
+        sys.exit(f"Failed to load {bundle_path}")
+    print(f"{bundle_path.name}: {bundle_path.stat().st_size / 1024:.1f} KiB, {args.workers} workers")
+
+    for compression in ("lz4", "lzma"):
+        serial, serial_data = measure(bundle_path, compression, 1, args.repeat)
+        parallel, parallel_data = measure(bundle_path, compression, args.workers, args.repeat)
+        identical = "identical" if serial_data == parallel_data else "DIFFERENT"
+        print(
+            f"{compression:5} serial: {serial * 1000:8.1f} ms  parallel: {parallel * 1000:8.1f} ms"
+            f"  ({serial / max(parallel, 1e-9):.2f}x, output {identical})"
+        )
+
+
+if __name__ == "__main__":
+    main()
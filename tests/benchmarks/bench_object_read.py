@@ -0,0 +1,101 @@
+"""
+对象读取基准测试：比较匹配流程中逐个反序列化所有对象与只用元数据生成键的耗时。
+
+用法:
+    python tests/benchmarks/bench_object_read.py [bundle路径] [--repeat N]
+
+建议使用包含大量 GameObject、Transform、MonoBehaviour 等非资源对象的 bundle（如 prefab 类 bundle）。
+未指定时使用 tests/assets/packer 下的第一个 bundle。
+"""
+
+import argparse
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+from ba_modding_toolkit.core import (
+    MATCH_STRATEGIES,
+    REPLACEABLE_ASSET_TYPES,
+    ObjectIndex,
+    _apply_matches,
+    bundle_cache,
+    load_bundle,
+)
+
+ASSET_TYPES = {"Texture2D", "TextAsset"}
+
+
+def full_read_pass(objects: list) -> None:
+    """旧流程：对每个对象先调用 read() 再生成键。"""
+    key_func = MATCH_STRATEGIES["cont_name_type"]
+    for obj in objects:
+        try:
+            obj.read()
+            key_func(obj)
+        except Exception:
+            pass
+
+
+def metadata_pass(objects: list) -> None:
+    """当前流程：先按类型过滤，键只由元数据和名称字段生成。"""
+    key_func = MATCH_STRATEGIES["cont_name_type"]
+    for obj in objects:
+        if obj.type not in REPLACEABLE_ASSET_TYPES:
+            continue
+        try:
+            key_func(obj)
+        except Exception:
+            pass
+
+
+def index_and_apply(objects: list, bundle_path: Path) -> None:
+    """完整的索引 + 匹配 + 替换流程（包含纹理解码与重新编码）。"""
+    source = ObjectIndex.from_env(objects[0].assets_file.environment, ASSET_TYPES, named_only=True)
+    target = ObjectIndex.from_env(load_bundle(bundle_path), ASSET_TYPES)
+    _apply_matches(source, target, "cont_name_type")
+
+
+def measure(func, bundle_path: Path, repeat: int, *extra) -> float:
+    """每轮重新加载 bundle（不计入耗时），取最短耗时。"""
+    best = float("inf")
+    for _ in range(repeat):
+        bundle_cache.invalidate(bundle_path)
+        objects = list(load_bundle(bundle_path).objects)
+        start = time.perf_counter()
+        func(objects, *extra)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("bundle", nargs="?", type=Path)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    bundle_path: Path | None = args.bundle
+    if bundle_path is None:
+        samples = sorted((Path(__file__).parents[1] / "assets" / "packer").glob("*.bundle"))
+        if not samples:
+            sys.exit("No bundle specified and no sample bundle found.")
+        bundle_path = samples[0]
+
+    env = load_bundle(bundle_path)
+    if env is None:
+        sys.exit(f"Failed to load {bundle_path}")
+    types = Counter(obj.type.name for obj in env.objects)
+    non_asset = sum(1 for obj in env.objects if obj.type not in REPLACEABLE_ASSET_TYPES)
+    print(f"{bundle_path.name}: {sum(types.values())} objects, {non_asset} non-replaceable")
+    print("  " + ", ".join(f"{name}={count}" for name, count in types.most_common(8)))
+
+    full = measure(full_read_pass, bundle_path, args.repeat)
+    lazy = measure(metadata_pass, bundle_path, args.repeat)
+    total = measure(index_and_apply, bundle_path, args.repeat, bundle_path)
+    print(f"key pass, read() every object: {full * 1000:8.1f} ms")
+    print(f"key pass, metadata only:       {lazy * 1000:8.1f} ms  ({full / max(lazy, 1e-9):.1f}x)")
+    print(f"index + match + apply:         {total * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
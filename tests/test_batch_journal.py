@@ -0,0 +1,78 @@
+"""
+批量更新断点续传日志的测试用例
+
+测试以下功能:
+- BatchJournal.record / find_complete: 记录结果并查找可以跳过的Mod
+- 内容、选项、目标文件或输出文件变化时记录失效
+- 日志文件在重新打开后仍然有效
+"""
+
+from pathlib import Path
+
+from ba_modding_toolkit.batch_journal import BatchJournal, JOURNAL_FILENAME, hash_file, hash_options
+
+
+def _setup(tmp_path: Path) -> tuple[Path, Path, Path]:
+    mod = tmp_path / "mod.bundle"
+    mod.write_bytes(b"mod data")
+    target = tmp_path / "target.bundle"
+    target.write_bytes(b"target data")
+    output = tmp_path / "output" / "target.bundle"
+    output.parent.mkdir()
+    output.write_bytes(b"output data")
+    return mod, target, output
+
+
+class TestBatchJournal:
+    def test_complete_entry_survives_reopen(self, tmp_path: Path):
+        mod, target, output = _setup(tmp_path)
+        journal = BatchJournal.in_directory(output.parent)
+        options_hash = hash_options("lzma", True)
+        journal.record(mod, hash_file(mod), options_hash, True, target=target, outputs=[output])
+
+        assert (output.parent / JOURNAL_FILENAME).is_file()
+        reopened = BatchJournal.in_directory(output.parent)
+        entry = reopened.find_complete(mod, hash_file(mod), options_hash)
+        assert entry is not None
+        assert entry.target == str(target)
+        assert [o.path for o in entry.outputs] == [str(output)]
+
+    def test_failed_entry_is_retried(self, tmp_path: Path):
+        mod, target, _ = _setup(tmp_path)
+        journal = BatchJournal(tmp_path / JOURNAL_FILENAME)
+        journal.record(mod, hash_file(mod), "options", False, target=target, message="failed")
+
+        assert journal.get(mod).status == "failed"
+        assert journal.find_complete(mod, hash_file(mod), "options") is None
+
+    def test_changes_invalidate_entry(self, tmp_path: Path):
+        mod, target, output = _setup(tmp_path)
+        journal = BatchJournal(tmp_path / JOURNAL_FILENAME)
+        mod_hash = hash_file(mod)
+        journal.record(mod, mod_hash, "options", True, target=target, outputs=[output])
+
+        assert journal.find_complete(mod, mod_hash, "options") is not None
+        assert journal.find_complete(mod, mod_hash, "other options") is None
+        assert journal.find_complete(mod, "other hash", "options") is None
+
+        # 输出文件内容变化（大小不变）
+        output.write_bytes(b"OUTPUT DATA")
+        assert journal.find_complete(mod, mod_hash, "options") is None
+
+        output.write_bytes(b"output data")
+        assert journal.find_complete(mod, mod_hash, "options") is not None
+        output.unlink()
+        assert journal.find_complete(mod, mod_hash, "options") is None
+
+    def test_target_change_invalidates_entry(self, tmp_path: Path):
+        mod, target, output = _setup(tmp_path)
+        journal = BatchJournal(tmp_path / JOURNAL_FILENAME)
+        journal.record(mod, hash_file(mod), "options", True, target=target, outputs=[output])
+
+        target.write_bytes(b"patched target data")
+        assert journal.find_complete(mod, hash_file(mod), "options") is None
+
+    def test_ignores_corrupt_journal(self, tmp_path: Path):
+        path = tmp_path / JOURNAL_FILENAME
+        path.write_text("{not json", encoding="utf-8")
+        assert len(BatchJournal(path)) == 0
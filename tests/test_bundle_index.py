@@ -0,0 +1,83 @@
+"""
+资源指纹索引的测试用例
+
+测试以下功能:
+- build_bloom / bloom_may_contain: Bloom 过滤器
+- BundleIndex.find_matches: 基于索引的候选文件比对
+- find_new_bundle_path(index=...): 使用索引查找新版文件
+"""
+
+import os
+import pytest
+import shutil
+from pathlib import Path
+
+from ba_modding_toolkit.bundle_index import BundleIndex, build_bloom, bloom_may_contain
+from ba_modding_toolkit.core import NameTypeKey, find_new_bundle_path
+from ba_modding_toolkit.i18n import t
+from conftest import has_mod_update_samples
+
+
+class TestBloomFilter:
+    def test_contains_added_keys(self):
+        keys = {NameTypeKey(f"tex_{i}", "Texture2D") for i in range(50)}
+        bloom = build_bloom(keys)
+        assert all(bloom_may_contain(bloom, key) for key in keys)
+
+    def test_empty_filter_rejects(self):
+        bloom = build_bloom(set())
+        assert not bloom_may_contain(bloom, NameTypeKey("tex", "Texture2D"))
+
+
+@pytest.mark.skipif(
+    not has_mod_update_samples(),
+    reason="old_mod.bundle AND new_original.bundle ARE REQUIRED"
+)
+class TestBundleIndex:
+    def _make_game_dir(self, new_original_bundle_path: Path, tmp_path: Path) -> Path:
+        game_dir = tmp_path / "GameData"
+        game_dir.mkdir()
+        shutil.copy2(new_original_bundle_path, game_dir / new_original_bundle_path.name)
+        return game_dir
+
+    def _rescanned(self, index: BundleIndex, game_dir: Path, fingerprint: set[NameTypeKey]) -> int:
+        """调用 find_matches，返回本次重新扫描的文件数量。"""
+        logs: list[str] = []
+        index.find_matches(sorted(game_dir.iterdir()), fingerprint, logs.append)
+        return sum(line == f"  > {t('log.index.refreshing', count=1)}" for line in logs)
+
+    def test_incremental_rescan(self, new_original_bundle_path: Path, tmp_path: Path):
+        game_dir = self._make_game_dir(new_original_bundle_path, tmp_path)
+        index = BundleIndex(tmp_path / "index.sqlite")
+        fingerprint = {NameTypeKey("ch0808_spr", "Texture2D")}
+
+        assert self._rescanned(index, game_dir, fingerprint) == 1
+        assert self._rescanned(index, game_dir, fingerprint) == 0
+
+        # 修改时间变化后重新扫描
+        bundle = game_dir / new_original_bundle_path.name
+        st = bundle.stat()
+        os.utime(bundle, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        assert self._rescanned(index, game_dir, fingerprint) == 1
+
+    def test_index_persists(self, new_original_bundle_path: Path, tmp_path: Path):
+        game_dir = self._make_game_dir(new_original_bundle_path, tmp_path)
+        fingerprint = {NameTypeKey("ch0808_spr", "Texture2D")}
+        BundleIndex(tmp_path / "index.sqlite").find_matches(list(game_dir.iterdir()), fingerprint)
+
+        index = BundleIndex(tmp_path / "index.sqlite")
+        assert self._rescanned(index, game_dir, fingerprint) == 0
+        assert index.find_matches(list(game_dir.iterdir()), fingerprint) == [game_dir / new_original_bundle_path.name]
+
+    def test_find_with_index(
+        self, old_mod_bundle_path: Path, new_original_bundle_path: Path, tmp_path: Path
+    ):
+        game_dir = self._make_game_dir(new_original_bundle_path, tmp_path)
+        index = BundleIndex(tmp_path / "index.sqlite")
+
+        expected, _ = find_new_bundle_path(old_mod_bundle_path, [game_dir])
+        found, _ = find_new_bundle_path(old_mod_bundle_path, [game_dir], index=index)
+        found_again, _ = find_new_bundle_path(old_mod_bundle_path, [game_dir], index=index)
+
+        assert found == expected == found_again
+        assert found == [game_dir / new_original_bundle_path.name]
@@ -3,20 +3,44 @@ Bundle文件I/O测试
 
 测试以下功能:
 - load_bundle: 加载bundle文件
-- compress_bundle: 压缩方式 (lzma, lz4, none)
+- load_bundle_with_suffix: 加载带有末尾附加字节的bundle文件
+- BundleCache: 进程级 bundle 解析缓存
+- scan_bundle: 只读取元数据的 bundle 扫描
+- compress_bundle: 压缩方式 (lzma, lz4, none)、并行块压缩与 original 方式下的压缩块复用
 - CRC修正与extra_bytes
+- _write_bundle_file: 分块写入临时文件并原子替换
+- save_bundle(variants=...): 一次序列化，保存多个压缩版本
+- parse_header_padding / find_crc_patch_offset: 原地CRC修正的位置
 """
 
+import random
 import pytest
 from pathlib import Path
+from UnityPy.files import SerializedFile
+from UnityPy.helpers import CompressionHelper
 
 from ba_modding_toolkit.core import (
     load_bundle,
+    load_bundle_with_suffix,
+    get_bundle_suffix,
+    parse_declared_bundle_size,
+    extract_extra_bytes,
     compress_bundle,
     save_bundle,
     SaveOptions,
+    SaveVariant,
+    BundleCache,
+    bundle_cache,
+    scan_bundle,
+    _write_bundle_file,
+    parse_header_padding,
+    find_crc_patch_offset,
+    _parallel_chunk_based_compress,
+    _unitypy_chunk_based_compress,
+    _block_compression,
 )
-from ba_modding_toolkit.utils import CRCUtils
+from ba_modding_toolkit.i18n import t
+from ba_modding_toolkit.utils import CRCUtils, set_mmap_enabled
 from conftest import has_sample_bundle
 
 
@@ -43,6 +67,365 @@ class TestLoadBundle:
         assert len(list(env.files)) == 0
 
 
+class TestBundleSuffix:
+    def test_parse_declared_bundle_size(self):
+        header = b"UnityFS\x00" + (8).to_bytes(4, "big") + b"5.x.x\x00" + b"2021.3.20f1\x00" + (1234).to_bytes(8, "big")
+        assert parse_declared_bundle_size(header) == 1234
+
+    def test_parse_declared_bundle_size_invalid(self):
+        assert parse_declared_bundle_size(b"") is None
+        assert parse_declared_bundle_size(b"NotUnity\x00" + b"\x00" * 32) is None
+        assert parse_declared_bundle_size(b"UnityFS\x00\x00\x00\x00\x08" + b"5.x.x") is None
+
+    def test_extract_extra_bytes(self):
+        assert extract_extra_bytes(b"") is None
+        assert extract_extra_bytes(b"\x01\x02\x03\x04") is None
+        assert extract_extra_bytes(b"\x08\x08\x08\x08\x01\x02\x03\x04") == b"\x08\x08\x08\x08"
+
+    def test_get_bundle_suffix_non_bundle(self, tmp_path: Path):
+        file = tmp_path / "plain.bin"
+        file.write_bytes(b"not a bundle" * 10)
+        assert get_bundle_suffix(file) == b""
+
+
+@pytest.mark.skipif(
+    not has_sample_bundle(),
+    reason="sample.bundle IS REQUIRED"
+)
+class TestLoadBundleWithSuffix:
+    def test_no_suffix(self, sample_bundle_path: Path):
+        env, suffix = load_bundle_with_suffix(sample_bundle_path)
+        assert env is not None
+        assert suffix == b""
+
+    def test_detect_suffix(self, sample_bundle_path: Path, tmp_path: Path):
+        suffix = b"\x08\x08\x08\x08\xAA\xBB\xCC\xDD\x11\x22"
+        test_file = tmp_path / "suffixed.bundle"
+        test_file.write_bytes(sample_bundle_path.read_bytes() + suffix)
+
+        env, detected = load_bundle_with_suffix(test_file)
+        assert env is not None
+        assert detected == suffix
+        assert len(list(env.objects)) == len(list(load_bundle(sample_bundle_path).objects))
+        assert get_bundle_suffix(test_file) == suffix
+
+    def test_detect_suffix_without_mmap(self, sample_bundle_path: Path, tmp_path: Path):
+        suffix = b"\x08\x08\x08\x08\xAA\xBB\xCC\xDD"
+        test_file = tmp_path / "suffixed.bundle"
+        test_file.write_bytes(sample_bundle_path.read_bytes() + suffix)
+
+        set_mmap_enabled(False)
+        try:
+            env, detected = load_bundle_with_suffix(test_file)
+        finally:
+            set_mmap_enabled(True)
+        assert env is not None
+        assert detected == suffix
+        assert len(list(env.objects)) == len(list(load_bundle(sample_bundle_path).objects))
+
+    def test_save_reuses_detected_extra_bytes(self, sample_bundle_path: Path, tmp_path: Path):
+        target_crc = 24681357
+        original = tmp_path / f"test_2024-01-01_{target_crc}.bundle"
+        original.write_bytes(sample_bundle_path.read_bytes())
+        assert CRCUtils.manipulate_file_crc(original, target_crc, b"\x08\x08\x08\x08")
+
+        env, suffix = load_bundle_with_suffix(original)
+        assert env is not None
+        assert len(suffix) == 8
+
+        output_path = tmp_path / "output" / original.name
+        output_path.parent.mkdir()
+        success, msg = save_bundle(
+            env, output_path, SaveOptions(perform_crc=True, compression="none"), source_suffix=suffix
+        )
+        assert success is True, msg
+
+        output_data = output_path.read_bytes()
+        assert output_data[-8:-4] == b"\x08\x08\x08\x08"
+        assert CRCUtils.compute_crc32(output_data) == target_crc
+
+
+@pytest.mark.skipif(
+    not has_sample_bundle(),
+    reason="sample.bundle IS REQUIRED"
+)
+class TestBundleCache:
+    def test_repeat_load_hits_cache(self, sample_bundle_path: Path, tmp_path: Path):
+        test_file = tmp_path / "cached.bundle"
+        test_file.write_bytes(sample_bundle_path.read_bytes())
+
+        before = bundle_cache.stats()
+        env1 = load_bundle(test_file)
+        # 第一次加载只记录文件，第二次加载时才生成快照
+        assert bundle_cache.stats().entries == before.entries
+        load_bundle(test_file)
+        env2 = load_bundle(test_file)
+        after = bundle_cache.stats()
+
+        assert env1 is not None and env2 is not None
+        assert env1 is not env2
+        assert after.misses - before.misses == 2
+        assert after.hits - before.hits == 1
+        assert [o.path_id for o in env1.objects] == [o.path_id for o in env2.objects]
+
+    def test_keep_cached_snapshots_first_load(self, sample_bundle_path: Path, tmp_path: Path):
+        test_file = tmp_path / "cached.bundle"
+        test_file.write_bytes(sample_bundle_path.read_bytes())
+
+        before = bundle_cache.stats()
+        load_bundle(test_file, keep_cached=True)
+        assert load_bundle(test_file) is not None
+        assert bundle_cache.stats().hits - before.hits == 1
+
+    def test_cached_copy_keeps_original_compression(self, sample_bundle_path: Path, tmp_path: Path):
+        test_file = tmp_path / "cached.bundle"
+        test_file.write_bytes(sample_bundle_path.read_bytes())
+
+        fresh = compress_bundle(load_bundle(test_file), "original")
+        cached = compress_bundle(load_bundle(test_file), "original")
+        assert fresh == cached
+
+    def test_invalidate_on_file_change(self, sample_bundle_path: Path, tmp_path: Path):
+        test_file = tmp_path / "cached.bundle"
+        test_file.write_bytes(sample_bundle_path.read_bytes())
+        load_bundle(test_file)
+
+        suffix = b"\x08\x08\x08\x08\x01\x02\x03\x04"
+        test_file.write_bytes(sample_bundle_path.read_bytes() + suffix)
+        env, detected = load_bundle_with_suffix(test_file)
+        assert env is not None
+        assert detected == suffix
+
+    def test_memory_budget(self, sample_bundle_path: Path, tmp_path: Path):
+        cache = BundleCache(max_bytes=1)
+        env = load_bundle(sample_bundle_path)
+        cache.put(sample_bundle_path, env, b"", force=True)
+        assert cache.stats().entries == 0
+        assert cache.get(sample_bundle_path) is None
+
+
+@pytest.mark.skipif(
+    not has_sample_bundle(),
+    reason="sample.bundle IS REQUIRED"
+)
+class TestScanBundle:
+    def test_scan_matches_full_load(self, sample_bundle_path: Path):
+        records = scan_bundle(sample_bundle_path)
+        env = load_bundle(sample_bundle_path)
+        assert records is not None
+        assert [
+            (r.path_id, r.class_id, r.name, r.container, r.byte_start, r.byte_size) for r in records
+        ] == [
+            (o.path_id, o.class_id, o.peek_name(), o.container, o.byte_start, o.byte_size) for o in env.objects
+        ]
+
+    def test_scan_ignores_suffix(self, sample_bundle_path: Path, tmp_path: Path):
+        test_file = tmp_path / "suffixed.bundle"
+        test_file.write_bytes(sample_bundle_path.read_bytes() + b"\x08\x08\x08\x08\xAA\xBB\xCC\xDD")
+        assert scan_bundle(test_file) == scan_bundle(sample_bundle_path)
+
+    def test_scan_non_bundle(self, tmp_path: Path):
+        test_file = tmp_path / "not_a_bundle.bundle"
+        test_file.write_bytes(b"not a bundle")
+        assert scan_bundle(test_file) is None
+
+
+class TestWriteBundleFile:
+    def test_write_with_crc(self, tmp_path: Path, monkeypatch):
+        # 缩小块大小，确保数据跨越多个块
+        monkeypatch.setattr("ba_modding_toolkit.core._WRITE_CHUNK_SIZE", 7)
+        data = bytes(range(256)) * 3
+        output_path = tmp_path / "out.bundle"
+
+        assert _write_bundle_file(output_path, data, b"\x08\x08\x08\x08", 12345678)
+
+        written = output_path.read_bytes()
+        assert written[:len(data)] == data
+        assert written[len(data):-4] == b"\x08\x08\x08\x08"
+        assert CRCUtils.compute_crc32(written) == 12345678
+        assert list(tmp_path.iterdir()) == [output_path]
+
+    def test_write_without_crc(self, tmp_path: Path):
+        output_path = tmp_path / "out.bundle"
+        output_path.write_bytes(b"old content")
+
+        assert _write_bundle_file(output_path, b"new content", b"\x08\x08\x08\x08")
+
+        assert output_path.read_bytes() == b"new content"
+        assert list(tmp_path.iterdir()) == [output_path]
+
+    def test_failed_write_keeps_existing_file(self, tmp_path: Path, monkeypatch):
+        monkeypatch.setattr(CRCUtils, "compute_crc_correction", staticmethod(lambda crc, target: None))
+        output_path = tmp_path / "out.bundle"
+        output_path.write_bytes(b"old content")
+
+        assert not _write_bundle_file(output_path, b"new content", None, 12345678)
+
+        assert output_path.read_bytes() == b"old content"
+        assert list(tmp_path.iterdir()) == [output_path]
+
+
+class TestCrcPatchOffset:
+    def _make_header(self, format_version: int) -> bytes:
+        return (
+            b"UnityFS\x00" + format_version.to_bytes(4, "big") + b"5.x.x\x00" + b"2022.3.21f1\x00"
+            + (1000).to_bytes(8, "big") + bytes(12)
+        )
+
+    def test_parse_header_padding(self):
+        header = self._make_header(8)
+        assert parse_header_padding(header) == (len(header), (16 - len(header) % 16) % 16)
+
+    def test_parse_header_padding_old_format(self):
+        assert parse_header_padding(self._make_header(6)) is None
+        assert parse_header_padding(b"not a bundle") is None
+
+    def test_find_offset_without_reserved_bytes(self, tmp_path: Path):
+        test_file = tmp_path / "test.bundle"
+        test_file.write_bytes(b"not a bundle")
+        assert find_crc_patch_offset(test_file) is None
+
+
+@pytest.mark.skipif(
+    not has_sample_bundle(),
+    reason="sample.bundle IS REQUIRED"
+)
+class TestCrcPatchInPlace:
+    def test_patch_header_padding(self, sample_bundle_path: Path, tmp_path: Path):
+        test_file = tmp_path / sample_bundle_path.name
+        test_file.write_bytes(sample_bundle_path.read_bytes())
+
+        offset = find_crc_patch_offset(test_file)
+        assert offset is not None
+        assert CRCUtils.forge_crc_at_offset(test_file, 12345678, offset)
+
+        assert CRCUtils.compute_crc32(test_file) == 12345678
+        assert test_file.stat().st_size == sample_bundle_path.stat().st_size
+        env = load_bundle(test_file)
+        assert env is not None
+        assert len(env.objects) == len(load_bundle(sample_bundle_path).objects)
+
+    def test_patch_trailing_bytes(self, sample_bundle_path: Path, tmp_path: Path):
+        test_file = tmp_path / sample_bundle_path.name
+        test_file.write_bytes(sample_bundle_path.read_bytes())
+        assert CRCUtils.append_crc_fix(test_file, 12345678)
+        size = test_file.stat().st_size
+
+        offset = find_crc_patch_offset(test_file)
+        assert offset == size - 4
+        assert CRCUtils.forge_crc_at_offset(test_file, 87654321, offset)
+
+        assert CRCUtils.compute_crc32(test_file) == 87654321
+        assert test_file.stat().st_size == size
+
+
+class TestParallelBlockCompression:
+    @pytest.mark.parametrize("block_info_flag", [0, 1, 2, 3])
+    def test_matches_serial(self, block_info_flag: int):
+        # 可压缩数据与不可压缩数据交替，覆盖按原样存储的块和末尾不满一块的情况
+        chunk = 0x20000
+        data = (bytes(range(256)) * (chunk // 256) + random.Random(0).randbytes(chunk)) * 3 + b"tail"
+
+        parallel = _parallel_chunk_based_compress(data, block_info_flag, max_workers=4)
+
+        assert parallel == _unitypy_chunk_based_compress(data, block_info_flag)
+
+    def test_serial_with_one_worker(self, monkeypatch):
+        def fail(*args, **kwargs):
+            raise AssertionError("thread pool should not be used")
+        monkeypatch.setattr("ba_modding_toolkit.core.ThreadPoolExecutor", fail)
+
+        data = bytes(range(256)) * 2048
+        assert _parallel_chunk_based_compress(data, 2, max_workers=1) == _unitypy_chunk_based_compress(data, 2)
+
+    def test_restores_unitypy_function(self):
+        assert CompressionHelper.chunk_based_compress is _unitypy_chunk_based_compress
+        with _block_compression(max_workers=4):
+            with _block_compression(max_workers=2):
+                patched = CompressionHelper.chunk_based_compress
+            # 内层退出时外层仍在使用，不能提前恢复
+            assert CompressionHelper.chunk_based_compress is patched
+            assert patched is not _unitypy_chunk_based_compress
+        assert CompressionHelper.chunk_based_compress is _unitypy_chunk_based_compress
+
+
+@pytest.mark.skipif(
+    not has_sample_bundle(),
+    reason="sample.bundle IS REQUIRED"
+)
+class TestBlockReuse:
+    @pytest.fixture
+    def multi_block_bundle(self, sample_bundle_path: Path, tmp_path: Path) -> Path:
+        """把样例 bundle 中的 TextAsset 扩充到约 400 KB 并以 LZ4 保存，得到包含多个压缩块的源文件。"""
+        env = load_bundle(sample_bundle_path)
+        rng = random.Random(0)
+        text_asset = next(obj for obj in env.objects if obj.type.name == "TextAsset").read()
+        text_asset.m_Script = "".join(rng.choice("abcdefghijklmnopqrstuvwxyz\n") for _ in range(400_000))
+        text_asset.save()
+
+        path = tmp_path / "source.bundle"
+        path.write_bytes(compress_bundle(env, "lz4"))
+        bundle_cache.invalidate()
+        return path
+
+    def _save_original(self, env) -> tuple[bytes, list[str]]:
+        logs = []
+        return compress_bundle(env, "original", logs.append), logs
+
+    def test_unchanged_bundle_reuses_all_blocks(self, multi_block_bundle: Path):
+        data, logs = self._save_original(load_bundle(multi_block_bundle))
+
+        assert t("log.file.reused_blocks", reused=4, total=4) in "\n".join(logs)
+        assert data == multi_block_bundle.read_bytes()
+
+    def test_resized_object_reuses_shifted_blocks(self, multi_block_bundle: Path, tmp_path: Path):
+        env = load_bundle(multi_block_bundle)
+        texture = next(obj for obj in env.objects if obj.type.name == "Texture2D").read()
+        texture.m_Name += "_renamed"
+        texture.save()
+
+        data, logs = self._save_original(env)
+        # 第一个块包含 SerializedFile 头部（记录了文件大小）必然变化，其余未改动的块平移后复用
+        assert t("log.file.reused_blocks", reused=3, total=5) in "\n".join(logs)
+
+        output = tmp_path / "output.bundle"
+        output.write_bytes(data)
+        expected = {obj.path_id: obj.get_raw_data() for obj in load_bundle(multi_block_bundle).objects}
+        for obj in load_bundle(output).objects:
+            if obj.type.name == "Texture2D":
+                assert obj.read().m_Name.endswith("_renamed")
+            else:
+                assert obj.get_raw_data() == expected[obj.path_id]
+
+    def test_source_changed_after_load(self, multi_block_bundle: Path, sample_bundle_path: Path):
+        env = load_bundle(multi_block_bundle)
+        multi_block_bundle.write_bytes(sample_bundle_path.read_bytes())
+
+        # 源文件已变化时不复用，按普通方式保存
+        data, logs = self._save_original(env)
+        assert not logs
+        assert len(data) > 0
+
+    def test_lzma_source_is_single_block(self, multi_block_bundle: Path, tmp_path: Path):
+        lzma_path = tmp_path / "lzma.bundle"
+        lzma_path.write_bytes(compress_bundle(load_bundle(multi_block_bundle), "lzma"))
+        bundle_cache.invalidate()
+
+        env = load_bundle(lzma_path)
+        texture = next(obj for obj in env.objects if obj.type.name == "Texture2D").read()
+        texture.m_Name += "_renamed"
+        texture.save()
+
+        # LZMA 数据整体是一个块，任何改动都需要整体重新压缩
+        _, logs = self._save_original(env)
+        assert t("log.file.reused_blocks", reused=0, total=1) in "\n".join(logs)
+
+    def test_only_original_compression_reuses(self, multi_block_bundle: Path):
+        logs = []
+        compress_bundle(load_bundle(multi_block_bundle), "lz4", logs.append)
+        assert not logs
+
+
 @pytest.mark.skipif(
     not has_sample_bundle(),
     reason="sample.bundle IS REQUIRED"
@@ -111,6 +494,51 @@ class TestCrcFix:
         assert actual_crc == target_crc
 
 
+@pytest.mark.skipif(
+    not has_sample_bundle(),
+    reason="sample.bundle IS REQUIRED"
+)
+class TestSaveVariants:
+    def test_save_variants(self, sample_bundle_path: Path, tmp_path: Path, monkeypatch):
+        save_calls = []
+        original_save = SerializedFile.save
+        def counting_save(self, *args, **kwargs):
+            save_calls.append(self)
+            return original_save(self, *args, **kwargs)
+        monkeypatch.setattr(SerializedFile, "save", counting_save)
+
+        env = load_bundle(sample_bundle_path)
+        target_crc = 12345678
+        output_path = tmp_path / f"test_2024-01-01_{target_crc}.bundle"
+        save_options = SaveOptions(
+            compression="lzma",
+            variants=[SaveVariant("lz4"), SaveVariant("none", perform_crc=False, subdir="raw")],
+        )
+
+        success, msg = save_bundle(env, output_path, save_options)
+        assert success is True, msg
+        assert len(save_calls) == 1
+
+        lz4_path = tmp_path / "lz4" / output_path.name
+        raw_path = tmp_path / "raw" / output_path.name
+        assert CRCUtils.compute_crc32(output_path) == target_crc
+        assert CRCUtils.compute_crc32(lz4_path) == target_crc
+        assert CRCUtils.compute_crc32(raw_path) != target_crc
+
+        expected = {obj.path_id: obj.get_raw_data() for obj in env.objects}
+        for path in (output_path, lz4_path, raw_path):
+            loaded = load_bundle(path)
+            assert {obj.path_id: obj.get_raw_data() for obj in loaded.objects} == expected
+
+    def test_variants_match_single_saves(self, sample_bundle_path: Path, tmp_path: Path):
+        save_options = SaveOptions(perform_crc=False, compression="lzma", variants=[SaveVariant("lz4")])
+        success, msg = save_bundle(load_bundle(sample_bundle_path), tmp_path / "out.bundle", save_options)
+        assert success is True, msg
+
+        assert (tmp_path / "out.bundle").read_bytes() == compress_bundle(load_bundle(sample_bundle_path), "lzma")
+        assert (tmp_path / "lz4" / "out.bundle").read_bytes() == compress_bundle(load_bundle(sample_bundle_path), "lz4")
+
+
 @pytest.mark.skipif(
     not has_sample_bundle(),
     reason="sample.bundle IS REQUIRED"
@@ -202,6 +630,12 @@ class TestCombinedIO:
         assert isinstance(data, bytes)
         assert len(data) > 0
 
+    @pytest.mark.parametrize("compression", ["lzma", "lz4", "original"])
+    def test_parallel_compress_bundle(self, sample_bundle_path: Path, compression: str):
+        serial = compress_bundle(load_bundle(sample_bundle_path), compression)
+        parallel = compress_bundle(load_bundle(sample_bundle_path), compression, max_workers=4)
+        assert parallel == serial
+
     @pytest.mark.parametrize("compression", ["lzma", "lz4", "none"])
     def test_full_roundtrip(
         self, sample_bundle_path: Path, tmp_path: Path, compression: str
@@ -3,6 +3,7 @@ from pathlib import Path
 from PIL import Image
 import shutil
 
+from ba_modding_toolkit.i18n import t
 from ba_modding_toolkit.core import (
     process_asset_packing,
     process_asset_extraction,
@@ -182,4 +183,62 @@ class TestAssetPacking:
         extracted_atlas = extract_dir / sample_atlas_path.name
         assert extracted_atlas.exists()
         extracted_atlas_content = extracted_atlas.read_bytes()
-        assert extracted_atlas_content == original_atlas_content
\ No newline at end of file
+        assert extracted_atlas_content == original_atlas_content
+
+    def test_parallel_encoding_matches_serial(
+        self,
+        sample_bundle_path: Path,
+        sample_image_path: Path,
+        tmp_path: Path,
+    ):
+        asset_folder = tmp_path / "assets"
+        asset_folder.mkdir()
+        shutil.copy(sample_image_path, asset_folder / sample_image_path.name)
+
+        outputs = []
+        for max_workers in (1, 2):
+            output_dir = tmp_path / f"output_{max_workers}"
+            output_dir.mkdir()
+            success, msg = process_asset_packing(
+                target_bundle_path=sample_bundle_path,
+                asset_folder=asset_folder,
+                output_dir=output_dir,
+                save_options=SaveOptions(perform_crc=False, compression="none", max_workers=max_workers),
+            )
+            assert success is True, msg
+            outputs.append((output_dir / sample_bundle_path.name).read_bytes())
+
+        assert outputs[0] == outputs[1]
+
+    def test_texture_cache_reused(
+        self,
+        sample_bundle_path: Path,
+        sample_image_path: Path,
+        tmp_path: Path,
+        monkeypatch,
+    ):
+        from ba_modding_toolkit import texture_cache
+        monkeypatch.setattr(texture_cache, "_default_cache", texture_cache.TextureCache(tmp_path / "cache", 64 * 1024 * 1024))
+
+        asset_folder = tmp_path / "assets"
+        asset_folder.mkdir()
+        shutil.copy(sample_image_path, asset_folder / sample_image_path.name)
+
+        outputs = []
+        logs: list[str] = []
+        for i in range(2):
+            output_dir = tmp_path / f"output_{i}"
+            output_dir.mkdir()
+            success, msg = process_asset_packing(
+                target_bundle_path=sample_bundle_path,
+                asset_folder=asset_folder,
+                output_dir=output_dir,
+                save_options=SaveOptions(perform_crc=False, compression="none"),
+                log=logs.append,
+            )
+            assert success is True, msg
+            outputs.append((output_dir / sample_bundle_path.name).read_bytes())
+
+        assert outputs[0] == outputs[1]
+        cache_hit_message = t("log.texture.cache_hits", count=1)
+        assert sum(cache_hit_message in line for line in logs) == 1
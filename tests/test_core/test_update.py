@@ -1,13 +1,33 @@
+import json
 import pytest
+import shutil
 from pathlib import Path
 
+import UnityPy
+from UnityPy.files.ObjectReader import ObjectReader
+
 from ba_modding_toolkit.core import (
     process_mod_update,
+    process_batch_mod_update,
+    process_mod_group_update,
+    plan_mod_update,
+    plan_batch_mod_update,
+    find_new_bundle_path,
     load_bundle,
+    get_bundle_suffix,
     get_unity_platform_info,
     process_asset_extraction,
     SaveOptions,
+    BatchJournal,
+    SearchContext,
+    MATCH_STRATEGIES,
+    MIGRATION_STRATEGIES,
+    ObjectIndex,
+    _apply_matches,
+    _apply_replacements,
+    _copy_texture_data,
 )
+from ba_modding_toolkit.i18n import t
 from conftest import has_mod_update_samples, compare_directory_assets
 
 MSE_THRESHOLD = 20.0
@@ -121,4 +141,598 @@ class TestModUpdate:
             asset_types_to_extract={"Texture2D", "TextAsset"},
         )
         
-        compare_directory_assets(old_extract_dir, new_extract_dir, MSE_THRESHOLD)
\ No newline at end of file
+        compare_directory_assets(old_extract_dir, new_extract_dir, MSE_THRESHOLD)
+
+    def test_mod_extra_bytes_not_carried_by_default(
+        self,
+        old_mod_bundle_path: Path,
+        new_original_bundle_path: Path,
+        tmp_path: Path,
+    ):
+        def update(old_mod_path: Path, output_dir: Path, **options) -> bytes:
+            success, msg = process_mod_update(
+                old_mod_path=old_mod_path,
+                new_bundle_path=new_original_bundle_path,
+                output_dir=output_dir,
+                asset_types_to_replace={"Texture2D", "TextAsset"},
+                save_options=SaveOptions(compression="none", **options),
+            )
+            assert success is True, msg
+            return get_bundle_suffix(output_dir / new_original_bundle_path.name)
+
+        # 样例旧Mod末尾带有 extra_bytes 和 CRC 修正字节，去掉后得到没有附加字节的Mod
+        data = old_mod_bundle_path.read_bytes()
+        plain_mod = tmp_path / "plain_mod" / old_mod_bundle_path.name
+        plain_mod.parent.mkdir()
+        plain_mod.write_bytes(data[:len(data) - len(get_bundle_suffix(old_mod_bundle_path))])
+        assert get_bundle_suffix(plain_mod) == b""
+
+        # 没有附加字节的Mod，更新后的文件也没有附加字节
+        assert update(plain_mod, tmp_path / "plain", perform_crc=False) == b""
+
+        # 旧Mod末尾的 extra_bytes 默认不会附加到新版bundle上
+        extra_bytes = b"\xAA\xBB\xCC\xDD"
+        suffixed_mod = tmp_path / "mods" / old_mod_bundle_path.name
+        suffixed_mod.parent.mkdir()
+        suffixed_mod.write_bytes(plain_mod.read_bytes() + extra_bytes + b"\x01\x02\x03\x04")
+
+        assert update(suffixed_mod, tmp_path / "default", perform_crc=False) == b""
+        assert len(update(suffixed_mod, tmp_path / "crc")) == 4
+        assert update(suffixed_mod, tmp_path / "kept", keep_mod_extra_bytes=True)[:-4] == extra_bytes
+
+@pytest.mark.skipif(
+    not has_mod_update_samples(),
+    reason="old_mod.bundle AND new_original.bundle ARE REQUIRED"
+)
+class TestFindNewBundlePath:
+    def _make_game_dir(self, new_original_bundle_path: Path, tmp_path: Path) -> Path:
+        # 放入多个同前缀的候选文件，只有一个包含匹配的资源
+        game_dir = tmp_path / "GameData"
+        game_dir.mkdir()
+        prefix = new_original_bundle_path.name.rsplit("_", 1)[0]
+        for i in range(3):
+            (game_dir / f"{prefix}-materials-{i}_1.bundle").write_bytes(b"not a bundle")
+        shutil.copy2(new_original_bundle_path, game_dir / new_original_bundle_path.name)
+        return game_dir
+
+    def test_parallel_matches_sequential(
+        self, old_mod_bundle_path: Path, new_original_bundle_path: Path, tmp_path: Path
+    ):
+        game_dir = self._make_game_dir(new_original_bundle_path, tmp_path)
+
+        sequential, _ = find_new_bundle_path(old_mod_bundle_path, [game_dir])
+        parallel, _ = find_new_bundle_path(old_mod_bundle_path, [game_dir], max_workers=2)
+
+        assert sequential == parallel == [game_dir / new_original_bundle_path.name]
+
+    def test_first_match_only(
+        self, old_mod_bundle_path: Path, new_original_bundle_path: Path, tmp_path: Path
+    ):
+        game_dir = self._make_game_dir(new_original_bundle_path, tmp_path)
+        shutil.copy2(new_original_bundle_path, game_dir / new_original_bundle_path.name.replace("_7654321", "-copy_7654321"))
+
+        all_matches, _ = find_new_bundle_path(old_mod_bundle_path, [game_dir])
+        first, _ = find_new_bundle_path(old_mod_bundle_path, [game_dir], max_workers=2, first_match_only=True)
+
+        assert len(all_matches) == 2
+        assert first == all_matches[:1]
+
+    @pytest.mark.parametrize("max_workers", [1, 2])
+    def test_search_context_reuses_fingerprints(
+        self, old_mod_bundle_path: Path, new_original_bundle_path: Path, tmp_path: Path, max_workers: int
+    ):
+        game_dir = self._make_game_dir(new_original_bundle_path, tmp_path)
+        expected, _ = find_new_bundle_path(old_mod_bundle_path, [game_dir])
+        context = SearchContext([game_dir])
+
+        with context:
+            first, _ = find_new_bundle_path(old_mod_bundle_path, context, max_workers=max_workers)
+            second, _ = find_new_bundle_path(old_mod_bundle_path, context, max_workers=max_workers)
+
+        assert first == second == expected
+        # 第二次查找复用候选列表和所有候选文件的指纹
+        stats = context.stats
+        assert (stats.prefix_lookups, stats.prefix_hits) == (2, 1)
+        assert stats.fingerprint_hits > 0
+        assert stats.fingerprint_lookups == 2 * stats.fingerprint_hits
+        assert stats.fingerprint_hit_rate == "50%"
+
+@pytest.mark.skipif(
+    not has_mod_update_samples(),
+    reason="old_mod.bundle AND new_original.bundle ARE REQUIRED"
+)
+class TestLazyObjectRead:
+    @pytest.fixture
+    def read_types(self, monkeypatch) -> list[str]:
+        # 记录被反序列化的对象类型（AssetBundle 对象用于解析容器表，每个文件只读取一次）
+        read_types: list[str] = []
+        original_read = ObjectReader.read
+        def counting_read(obj, *args, **kwargs):
+            if obj.type.name != "AssetBundle":
+                read_types.append(obj.type.name)
+            return original_read(obj, *args, **kwargs)
+        monkeypatch.setattr(ObjectReader, "read", counting_read)
+        return read_types
+
+    def test_index_reads_nothing(self, old_mod_bundle_path: Path, read_types: list[str]):
+        index = ObjectIndex.from_env(load_bundle(old_mod_bundle_path), {"Texture2D", "TextAsset"}, named_only=True)
+
+        assert len(index) > 0
+        assert read_types == []
+
+    def test_apply_reads_only_matched_objects(
+        self, old_mod_bundle_path: Path, new_original_bundle_path: Path, read_types: list[str]
+    ):
+        old_index = ObjectIndex.from_env(load_bundle(old_mod_bundle_path), {"TextAsset"}, named_only=True)
+        new_env = load_bundle(new_original_bundle_path)
+        new_index = ObjectIndex.from_env(new_env, {"TextAsset"})
+
+        matches = old_index.match(new_index, "name_type")
+        replaced_count, _ = _apply_matches(old_index, new_index, "name_type")
+
+        assert replaced_count == len(matches) > 0
+        # 每个匹配读取一次来源对象和一次目标对象
+        assert read_types == ["TextAsset"] * (2 * replaced_count)
+
+    def test_source_decoded_once_across_strategies(
+        self, old_mod_bundle_path: Path, new_original_bundle_path: Path, read_types: list[str]
+    ):
+        old_index = ObjectIndex.from_env(load_bundle(old_mod_bundle_path), {"TextAsset"}, named_only=True)
+        first_target = ObjectIndex.from_env(load_bundle(new_original_bundle_path), {"TextAsset"})
+        second_target = ObjectIndex.from_env(load_bundle(new_original_bundle_path), {"TextAsset"})
+
+        first_count, _ = _apply_matches(old_index, first_target, "name_type")
+        second_count, _ = _apply_matches(old_index, second_target, "cont_name_type")
+
+        assert first_count == second_count > 0
+        # 来源对象只在第一次匹配时读取
+        assert read_types == ["TextAsset"] * (3 * first_count)
+
+    def test_apply_replacements_reads_only_replaced_objects(
+        self, old_mod_bundle_path: Path, new_original_bundle_path: Path, read_types: list[str]
+    ):
+        key_func = MATCH_STRATEGIES["name_type"]
+        old_env = load_bundle(old_mod_bundle_path)
+        replacement_map = {
+            key_func(obj): obj.read().m_Script.encode("utf-8", "surrogateescape")
+            for obj in old_env.objects if obj.type.name == "TextAsset"
+        }
+        read_types.clear()
+
+        replaced_count, _, _ = _apply_replacements(load_bundle(new_original_bundle_path), replacement_map, key_func)
+
+        assert replaced_count > 0
+        assert read_types == ["TextAsset"] * replaced_count
+
+    def test_lazy_content_resolved_on_replace(
+        self, old_mod_bundle_path: Path, new_original_bundle_path: Path, read_types: list[str]
+    ):
+        old_index = ObjectIndex.from_env(load_bundle(old_mod_bundle_path), {"Texture2D", "TextAsset"}, named_only=True)
+        replacement_map = old_index.replacement_map("name_type")
+        assert replacement_map
+        assert not any(content.resolved for content in replacement_map.values())
+        assert read_types == []
+
+        text_only = {key: content for key, content in replacement_map.items() if key.type == "TextAsset"}
+        replaced_count, _, _ = _apply_replacements(
+            load_bundle(new_original_bundle_path), text_only, MATCH_STRATEGIES["name_type"]
+        )
+
+        assert replaced_count == len(text_only) > 0
+        # 只有被写入的资源才会读取，未使用的 Texture2D 不会被解码
+        assert all(content.resolved == (key.type == "TextAsset") for key, content in replacement_map.items())
+        assert "Texture2D" not in read_types
+
+    def test_duplicate_source_keys_last_wins(self, old_mod_bundle_path: Path, tmp_path: Path):
+        # 把 skel 改名为 atlas，得到两个 name_type 键相同的 TextAsset
+        env = load_bundle(old_mod_bundle_path)
+        text_assets = [obj for obj in env.objects if obj.type.name == "TextAsset"]
+        atlas_name = next(obj.peek_name() for obj in text_assets if obj.peek_name().endswith(".atlas"))
+        for obj in text_assets:
+            data = obj.read()
+            data.m_Name = atlas_name
+            data.save()
+        duplicated = tmp_path / old_mod_bundle_path.name
+        duplicated.write_bytes(env.file.save(packer="none"))
+
+        env = load_bundle(duplicated)
+        objects = [obj for obj in env.objects if obj.type.name == "TextAsset"]
+        key = MATCH_STRATEGIES["name_type"](objects[0])
+        assert len(objects) > 1 and all(MATCH_STRATEGIES["name_type"](obj) == key for obj in objects)
+
+        first = ObjectIndex.from_env(env, {"TextAsset"}, named_only=True)
+        last = ObjectIndex.from_env(env, {"TextAsset"}, named_only=True, keep_last=True)
+        assert first.by_strategy["name_type"][key] is objects[0]
+        assert last.by_strategy["name_type"][key] is objects[-1]
+
+    def test_match_counts(self, old_mod_bundle_path: Path, new_original_bundle_path: Path):
+        old_index = ObjectIndex.from_env(load_bundle(old_mod_bundle_path), {"Texture2D", "TextAsset"}, named_only=True)
+        new_index = ObjectIndex.from_env(load_bundle(new_original_bundle_path), {"Texture2D", "TextAsset"})
+
+        counts = old_index.match_counts(new_index)
+        assert list(counts) == ["path_id", "cont_name_type", "name_type"]
+        assert counts["name_type"] > 0
+
+@pytest.mark.skipif(
+    not has_mod_update_samples(),
+    reason="old_mod.bundle AND new_original.bundle ARE REQUIRED"
+)
+class TestTexturePassthrough:
+    def _get_texture(self, bundle_path: Path):
+        env = load_bundle(bundle_path)
+        return next(obj for obj in env.objects if obj.type.name == "Texture2D")
+
+    def test_same_layout_copies_raw_data(self, old_mod_bundle_path: Path, new_original_bundle_path: Path):
+        old_index = ObjectIndex.from_env(load_bundle(old_mod_bundle_path), {"Texture2D"}, named_only=True)
+        new_env = load_bundle(new_original_bundle_path)
+        new_index = ObjectIndex.from_env(new_env, {"Texture2D"})
+
+        replaced_count, replaced_logs = _apply_matches(old_index, new_index, "name_type")
+
+        assert replaced_count > 0
+        assert all("raw copy" in item for item in replaced_logs)
+        # 直接复制时不会解码来源纹理
+        assert not any(content.resolved for content in old_index._contents.values())
+
+        source = self._get_texture(old_mod_bundle_path).read()
+        saved_env = UnityPy.load(new_env.file.save(packer="none"))
+        target = next(obj for obj in saved_env.objects if obj.type.name == "Texture2D").read()
+        assert target.image_data == source.get_image_data()
+
+    def test_different_layout_falls_back(self, old_mod_bundle_path: Path, new_original_bundle_path: Path):
+        source = self._get_texture(old_mod_bundle_path)
+        target = self._get_texture(new_original_bundle_path).read()
+        target.m_MipCount = target.m_MipCount + 1
+
+        assert not _copy_texture_data(source, target)
+
+
+@pytest.mark.skipif(
+    not has_mod_update_samples(),
+    reason="old_mod.bundle AND new_original.bundle ARE REQUIRED"
+)
+class TestBatchModUpdate:
+    def _run(self, mod_files: list[Path], game_dir: Path, output_dir: Path, max_workers: int, journal=None):
+        logs: list[str] = []
+        progress: list[tuple[int, int, str]] = []
+        result = process_batch_mod_update(
+            mod_file_list=mod_files,
+            search_paths=[game_dir],
+            output_dir=output_dir,
+            asset_types_to_replace={"Texture2D", "TextAsset"},
+            save_options=SaveOptions(perform_crc=False, compression="none"),
+            spine_options=None,
+            log=logs.append,
+            progress_callback=lambda *args: progress.append(args),
+            max_workers=max_workers,
+            journal=journal,
+        )
+        return result, logs, progress
+
+    def test_parallel_matches_sequential(
+        self, old_mod_bundle_path: Path, new_original_bundle_path: Path, tmp_path: Path
+    ):
+        game_dir = tmp_path / "GameData"
+        game_dir.mkdir()
+        shutil.copy2(new_original_bundle_path, game_dir / new_original_bundle_path.name)
+
+        # 第二个Mod找不到对应的新版文件
+        unknown_mod = tmp_path / "mods" / "assets-_mx-unknown-_mxdependency-2024-11-18_1.bundle"
+        unknown_mod.parent.mkdir()
+        unknown_mod.write_bytes(b"not a bundle")
+        mod_files = [old_mod_bundle_path, unknown_mod, old_mod_bundle_path]
+
+        sequential, sequential_logs, _ = self._run(mod_files, game_dir, tmp_path / "sequential", 1)
+        parallel, parallel_logs, progress = self._run(mod_files, game_dir, tmp_path / "parallel", 2)
+
+        assert sequential == parallel
+        assert sequential[:2] == (2, 1)
+        # 两个相同的Mod共用候选列表和指纹，命中率输出在最后
+        assert "1/3" in sequential_logs[-1] and "1/2" in sequential_logs[-1]
+        # 每个Mod的日志按顺序完整输出（只有输出目录不同）
+        assert [line.replace(str(tmp_path / "parallel"), str(tmp_path / "sequential")) for line in parallel_logs] == sequential_logs
+        assert sorted(current for current, _, _ in progress) == [1, 2, 3]
+        assert all(total == 3 for _, total, _ in progress)
+
+        name = new_original_bundle_path.name
+        assert (tmp_path / "parallel" / name).read_bytes() == (tmp_path / "sequential" / name).read_bytes()
+
+    def test_search_shares_one_pool(
+        self, old_mod_bundle_path: Path, new_original_bundle_path: Path, tmp_path: Path, monkeypatch
+    ):
+        import ba_modding_toolkit.core as core
+
+        # 两个前缀不同的Mod，各自有多个候选文件，查找时都需要提交到进程池
+        game_dir = tmp_path / "GameData"
+        game_dir.mkdir()
+        mod_files = []
+        for character in ("ch0808", "ch0809"):
+            new_name = new_original_bundle_path.name.replace("ch0808", character)
+            shutil.copy2(new_original_bundle_path, game_dir / new_name)
+            for i in range(3):
+                (game_dir / f"{new_name.rsplit('_', 1)[0]}-materials-{i}_1.bundle").write_bytes(b"not a bundle")
+            mod_file = tmp_path / "mods" / old_mod_bundle_path.name.replace("ch0808", character)
+            mod_file.parent.mkdir(exist_ok=True)
+            shutil.copy2(old_mod_bundle_path, mod_file)
+            mod_files.append(mod_file)
+
+        pools = []
+        class CountingExecutor(core.ProcessPoolExecutor):
+            def __init__(self, *args, **kwargs):
+                pools.append(self)
+                super().__init__(*args, **kwargs)
+        monkeypatch.setattr(core, "ProcessPoolExecutor", CountingExecutor)
+
+        result, _, _ = self._run(mod_files, game_dir, tmp_path / "output", 2)
+
+        assert result[:2] == (2, 0)
+        # 阶段 1 的所有查找和阶段 2 的两个目标文件共用搜索上下文的进程池
+        assert len(pools) == 1
+
+    def test_journal_skips_completed_mods(
+        self, old_mod_bundle_path: Path, new_original_bundle_path: Path, tmp_path: Path
+    ):
+        game_dir = tmp_path / "GameData"
+        game_dir.mkdir()
+        shutil.copy2(new_original_bundle_path, game_dir / new_original_bundle_path.name)
+        unknown_mod = tmp_path / "mods" / "assets-_mx-unknown-_mxdependency-2024-11-18_1.bundle"
+        unknown_mod.parent.mkdir()
+        unknown_mod.write_bytes(b"not a bundle")
+        mod_files = [old_mod_bundle_path, unknown_mod]
+        output_dir = tmp_path / "output"
+
+        first, _, _ = self._run(mod_files, game_dir, output_dir, 1, BatchJournal.in_directory(output_dir))
+        assert first[:2] == (1, 1)
+        output = output_dir / new_original_bundle_path.name
+        mtime = output.stat().st_mtime_ns
+
+        for max_workers in (1, 2):
+            result, logs, progress = self._run(
+                mod_files, game_dir, output_dir, max_workers, BatchJournal.in_directory(output_dir)
+            )
+            # 成功的Mod被跳过，失败的Mod重新处理
+            assert result[:2] == (1, 1)
+            skipped = t("log.mod_update.batch_skipped", filename=old_mod_bundle_path.name, path=BatchJournal.in_directory(output_dir).path)
+            assert [line for line in logs if "⏭️" in line] == [f"⏭️ {skipped}"]
+            assert sorted(current for current, _, _ in progress) == [1, 2]
+            assert output.stat().st_mtime_ns == mtime
+
+        # 不使用日志时全部重新处理
+        _, logs, _ = self._run(mod_files, game_dir, output_dir, 1)
+        assert not any("⏭️" in line for line in logs)
+
+        # 输出文件被删除后重新处理
+        output.unlink()
+        result, logs, _ = self._run(mod_files, game_dir, output_dir, 1, BatchJournal.in_directory(output_dir))
+        assert result[:2] == (1, 1)
+        assert not any("⏭️" in line for line in logs)
+        assert output.is_file()
+
+def _read_atlas(bundle_path: Path) -> str:
+    env = load_bundle(bundle_path)
+    return next(
+        obj.read().m_Script for obj in env.objects
+        if obj.type.name == "TextAsset" and obj.peek_name().endswith(".atlas")
+    )
+
+
+def _make_atlas_variant(old_mod_path: Path, dest: Path, suffix: str) -> Path:
+    """复制旧Mod并在 atlas 文本末尾追加内容，得到替换相同资源的另一个Mod。"""
+    env = load_bundle(old_mod_path)
+    for obj in env.objects:
+        if obj.type.name == "TextAsset" and obj.peek_name().endswith(".atlas"):
+            data = obj.read()
+            data.m_Script += suffix
+            data.save()
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    dest.write_bytes(env.file.save(packer="none"))
+    return dest
+
+
+@pytest.mark.skipif(
+    not has_mod_update_samples(),
+    reason="old_mod.bundle AND new_original.bundle ARE REQUIRED"
+)
+class TestModGroupUpdate:
+    def test_later_mod_wins(self, old_mod_bundle_path: Path, new_original_bundle_path: Path, tmp_path: Path):
+        variant = _make_atlas_variant(old_mod_bundle_path, tmp_path / "variant" / old_mod_bundle_path.name, "\n# variant")
+        save_options = SaveOptions(perform_crc=False, compression="none")
+        output = tmp_path / "output" / new_original_bundle_path.name
+        output.parent.mkdir()
+
+        for mods, expected in (
+            ([old_mod_bundle_path, variant], _read_atlas(variant)),
+            ([variant, old_mod_bundle_path], _read_atlas(old_mod_bundle_path)),
+        ):
+            logs: list[str] = []
+            results = process_mod_group_update(
+                mods, new_original_bundle_path, output.parent, {"Texture2D", "TextAsset"},
+                save_options, log=logs.append,
+            )
+
+            assert all(success for success, _ in results), results
+            assert _read_atlas(output) == expected
+            # 两个Mod替换相同的资源，每个资源都记录一次冲突
+            assert any(".atlas" in line and mods[1].name in line for line in logs if "⚠️" in line)
+
+    def test_group_extra_bytes(self, old_mod_bundle_path: Path, new_original_bundle_path: Path, tmp_path: Path):
+        # 样例旧Mod带有 extra_bytes，变体Mod没有附加字节
+        variant = _make_atlas_variant(old_mod_bundle_path, tmp_path / "variant" / old_mod_bundle_path.name, "\n# variant")
+        extra_bytes = get_bundle_suffix(old_mod_bundle_path)[:-4]
+        assert extra_bytes and get_bundle_suffix(variant) == b""
+        mods = [old_mod_bundle_path, variant]
+
+        def update(output_dir: Path, **options) -> tuple[bytes, list[str]]:
+            logs: list[str] = []
+            results = process_mod_group_update(
+                mods, new_original_bundle_path, output_dir, {"Texture2D", "TextAsset"},
+                SaveOptions(compression="none", **options), log=logs.append,
+            )
+            assert all(success for success, _ in results), results
+            return get_bundle_suffix(output_dir / new_original_bundle_path.name), logs
+
+        # 默认不沿用旧Mod的附加字节
+        suffix, _ = update(tmp_path / "default")
+        assert len(suffix) == 4
+
+        # 明确要求时沿用，各Mod不一致时记录警告
+        suffix, logs = update(tmp_path / "kept", keep_mod_extra_bytes=True)
+        assert suffix[:-4] == extra_bytes
+        assert any("⚠️" in line and extra_bytes.hex().upper() in line for line in logs)
+
+    def test_falls_back_when_strategy_writes_nothing(
+        self, old_mod_bundle_path: Path, new_original_bundle_path: Path, monkeypatch
+    ):
+        import ba_modding_toolkit.core as core
+
+        # 第一次写入全部失败，迫使两种迁移方式都回退到下一个策略
+        original_apply = core._apply_match_list
+        def failing_first_apply(*args, **kwargs):
+            calls.append(args[0])
+            if len(calls) == 1:
+                return 0, []
+            return original_apply(*args, **kwargs)
+        monkeypatch.setattr(core, "_apply_match_list", failing_first_apply)
+        asset_types = {"Texture2D", "TextAsset"}
+
+        calls = []
+        _, single_count = core._migrate_bundle_assets(old_mod_bundle_path, new_original_bundle_path, asset_types)
+        single_calls = len(calls)
+        calls = []
+        _, results = core._migrate_group_assets([old_mod_bundle_path], new_original_bundle_path, asset_types)
+
+        assert single_calls == len(calls) == 2
+        assert results[0] == (single_count, 0)
+        assert single_count > 0
+
+    def test_batch_saves_each_target_once(
+        self, old_mod_bundle_path: Path, new_original_bundle_path: Path, tmp_path: Path, monkeypatch
+    ):
+        import ba_modding_toolkit.core as core
+
+        game_dir = tmp_path / "GameData"
+        game_dir.mkdir()
+        shutil.copy2(new_original_bundle_path, game_dir / new_original_bundle_path.name)
+        variant = _make_atlas_variant(old_mod_bundle_path, tmp_path / "variant" / old_mod_bundle_path.name, "\n# variant")
+
+        saved: list[Path] = []
+        original_save_bundle = core.save_bundle
+        def counting_save_bundle(*args, **kwargs):
+            saved.append(kwargs["output_path"])
+            return original_save_bundle(*args, **kwargs)
+        monkeypatch.setattr(core, "save_bundle", counting_save_bundle)
+
+        output_dir = tmp_path / "output"
+        result = process_batch_mod_update(
+            mod_file_list=[old_mod_bundle_path, variant],
+            search_paths=[game_dir],
+            output_dir=output_dir,
+            asset_types_to_replace={"Texture2D", "TextAsset"},
+            save_options=SaveOptions(perform_crc=False, compression="none"),
+            spine_options=None,
+        )
+
+        assert result == (2, 0, [])
+        assert saved == [output_dir / new_original_bundle_path.name]
+        assert _read_atlas(saved[0]) == _read_atlas(variant)
+
+
+@pytest.mark.skipif(
+    not has_mod_update_samples(),
+    reason="old_mod.bundle AND new_original.bundle ARE REQUIRED"
+)
+class TestMigrationPlan:
+    @pytest.fixture(autouse=True)
+    def _forbid_writes(self, monkeypatch):
+        import ba_modding_toolkit.core as core
+
+        def fail(*args, **kwargs):
+            raise AssertionError("plan mode must not apply or save assets")
+        monkeypatch.setattr(core, "save_bundle", fail)
+        monkeypatch.setattr(core, "_apply_match_list", fail)
+
+    def test_plan_matches_real_run(
+        self, old_mod_bundle_path: Path, new_original_bundle_path: Path, tmp_path: Path, monkeypatch
+    ):
+        asset_types = {"Texture2D", "TextAsset"}
+        plan = plan_mod_update(old_mod_bundle_path, new_original_bundle_path, asset_types)
+
+        monkeypatch.undo()
+        logs: list[str] = []
+        success, message = process_mod_update(
+            old_mod_bundle_path, new_original_bundle_path, tmp_path, asset_types,
+            SaveOptions(perform_crc=False, compression="none"), log=logs.append,
+        )
+
+        assert success, message
+        assert plan.ok and plan.replacement_count > 0
+        assert plan.fallback_strategies == [
+            name for name in MIGRATION_STRATEGIES[MIGRATION_STRATEGIES.index(plan.strategy) + 1:]
+            if plan.match_counts[name]
+        ]
+        # 实际更新使用了计划中的策略，并替换了相同数量的资源
+        expected = t("log.migration.strategy_success", name=plan.strategy, count=plan.replacement_count)
+        assert any(expected in line for line in logs)
+        assert len(plan.assets) == plan.replacement_count
+        assert any(asset.name.endswith(".atlas") for asset in plan.assets)
+
+    def test_batch_plan_json(self, old_mod_bundle_path: Path, new_original_bundle_path: Path, tmp_path: Path):
+        game_dir = tmp_path / "GameData"
+        game_dir.mkdir()
+        shutil.copy2(new_original_bundle_path, game_dir / new_original_bundle_path.name)
+        variant = _make_atlas_variant(old_mod_bundle_path, tmp_path / "variant" / old_mod_bundle_path.name, "\n# variant")
+        unknown_mod = tmp_path / "mods" / "assets-_mx-unknown-_mxdependency-2024-11-18_1.bundle"
+        unknown_mod.parent.mkdir()
+        unknown_mod.write_bytes(b"not a bundle")
+
+        plan = plan_batch_mod_update(
+            [old_mod_bundle_path, unknown_mod, variant], [game_dir], {"Texture2D", "TextAsset"}
+        )
+        data = json.loads(plan.to_json())
+
+        assert data["summary"]["total"] == 3
+        assert data["summary"]["failed"] == 1
+        assert data["groups"] == {
+            str(game_dir / new_original_bundle_path.name): [str(old_mod_bundle_path), str(variant)]
+        }
+        first, unknown, second = data["mods"]
+        assert unknown["status"] == "search_failed" and unknown["target"] is None
+        # 靠后的Mod覆盖了前一个Mod的全部资源
+        assert first["replacement_count"] == 0 and first["message"]
+        assert {asset["overridden_by"] for asset in first["assets"]} == {variant.name}
+        assert second["replacement_count"] == len(first["assets"]) > 0
+        assert data["summary"]["replacements"] == second["replacement_count"]
+
+
+@pytest.mark.skipif(
+    not has_mod_update_samples(),
+    reason="old_mod.bundle AND new_original.bundle ARE REQUIRED"
+)
+class TestGlobalToJpConversion:
+    def test_fallback_strategy_starts_from_clean_templates(
+        self, old_mod_bundle_path: Path, new_original_bundle_path: Path, tmp_path: Path, monkeypatch
+    ):
+        import ba_modding_toolkit.core as core
+
+        # 第一个策略写入资源后报告失败，迫使回退到下一个策略
+        targets: list[ObjectIndex] = []
+        original_apply = core._apply_matches
+        def failing_first_apply(source, target, *args, **kwargs):
+            targets.append(target)
+            result = original_apply(source, target, *args, **kwargs)
+            return (0, []) if len(targets) == 1 else result
+        monkeypatch.setattr(core, "_apply_matches", failing_first_apply)
+
+        success, message, replaced = core.process_global_to_jp_conversion(
+            old_mod_bundle_path, [new_original_bundle_path], tmp_path,
+            SaveOptions(perform_crc=False, compression="none"), {"Texture2D", "TextAsset"},
+        )
+
+        assert success, message
+        assert replaced == [new_original_bundle_path]
+        assert len(targets) == 2
+        # 回退的策略使用重新加载的模板，而不是被第一个策略改写过的模板
+        first_env = next(iter(targets[0].by_strategy["path_id"].values())).assets_file.environment
+        second_env = next(iter(targets[1].by_strategy["path_id"].values())).assets_file.environment
+        assert first_env is not second_env
+        assert _read_atlas(tmp_path / new_original_bundle_path.name) == _read_atlas(old_mod_bundle_path)
@@ -5,14 +5,22 @@ CRC修正功能的测试用例
 - CRCUtils.compute_crc32(data: bytes) -> int
 - CRCUtils.check_crc_match(source, target) -> tuple[bool, int, int]
 - CRCUtils.apply_crc_fix(modified_data: bytes, target_crc: int) -> bytes | None
+- CRCUtils.compute_crc_correction(crc_state: int, target_crc: int) -> bytes | None
+- CRCUtils.compute_crc32_stream(f: BinaryIO) -> int
+- CRCUtils.copy_with_crc32(src: Path, dest: Path) -> int
+- CRCUtils.crc32_combine(crc_1: int, crc_2: int, length_2: int) -> int
+- CRCUtils.compute_crc_patch(prefix_crc: int, suffix_crc: int, suffix_length: int, target_crc: int) -> bytes | None
+- CRCUtils.forge_crc_at_offset(modified_path: Path, target_crc: int, offset: int) -> bool
+- CRCUtils.append_crc_fix(modified_path: Path, target_crc: int, extra_bytes: bytes | None = None, crc_state: int | None = None) -> bool
 - CRCUtils.manipulate_file_crc(modified_path: Path, target_crc: int, extra_bytes: bytes | None = None) -> bool
 """
 
+import binascii
 import pytest
 from pathlib import Path
 import shutil
 
-from ba_modding_toolkit.utils import CRCUtils
+from ba_modding_toolkit.utils import CRCUtils, set_mmap_enabled
 from conftest import has_sample_bundle
 
 
@@ -29,6 +37,21 @@ class TestComputeCrc32:
         file.write_bytes(data)
         assert CRCUtils.compute_crc32(file) == CRCUtils.compute_crc32(data)
 
+    def test_compute_crc32_file_without_mmap(self, tmp_path: Path):
+        data = b"0808" * 4096
+        file = tmp_path / "test.bin"
+        file.write_bytes(data)
+        set_mmap_enabled(False)
+        try:
+            assert CRCUtils.compute_crc32(file) == CRCUtils.compute_crc32(data)
+        finally:
+            set_mmap_enabled(True)
+
+    def test_compute_crc32_empty_file(self, tmp_path: Path):
+        file = tmp_path / "empty.bin"
+        file.write_bytes(b"")
+        assert CRCUtils.compute_crc32(file) == 0
+
 
 class TestCheckCrcMatch:
     def test_same_data(self):
@@ -139,6 +162,147 @@ class TestApplyCrcFix:
         assert CRCUtils.compute_crc32(fixed_data) == 0
 
 
+class TestComputeCrcCorrection:
+    def test_matches_apply_crc_fix(self):
+        data = b"test data for crc modification"
+        target_crc = 7355608
+
+        correction = CRCUtils.compute_crc_correction(CRCUtils.compute_crc32(data), target_crc)
+
+        assert correction is not None
+        assert len(correction) == 4
+        assert data + correction == CRCUtils.apply_crc_fix(data, target_crc)
+
+    def test_running_crc(self):
+        chunks = [b"first chunk", bytes(range(256)) * 10, b"last"]
+        crc = 0
+        for chunk in chunks:
+            crc = binascii.crc32(chunk, crc)
+        target_crc = 0xDEADBEEF
+
+        correction = CRCUtils.compute_crc_correction(crc, target_crc)
+
+        assert correction is not None
+        assert CRCUtils.compute_crc32(b"".join(chunks) + correction) == target_crc
+
+    def test_empty_data(self):
+        correction = CRCUtils.compute_crc_correction(0, 12345678)
+
+        assert correction is not None
+        assert CRCUtils.compute_crc32(correction) == 12345678
+
+
+class TestCrc32Combine:
+    @pytest.mark.parametrize("length_1,length_2", [(0, 0), (5, 0), (0, 7), (100, 4), (1000, 65537)])
+    def test_matches_concatenation(self, length_1: int, length_2: int):
+        data_1 = bytes(i * 7 % 256 for i in range(length_1))
+        data_2 = bytes(i * 13 % 256 for i in range(length_2))
+
+        combined = CRCUtils.crc32_combine(
+            CRCUtils.compute_crc32(data_1), CRCUtils.compute_crc32(data_2), length_2
+        )
+
+        assert combined == CRCUtils.compute_crc32(data_1 + data_2)
+
+    def test_stream_matches_bytes(self, tmp_path: Path):
+        data = bytes(range(256)) * 100
+        test_file = tmp_path / "test.bin"
+        test_file.write_bytes(data)
+
+        with open(test_file, "rb") as f:
+            assert CRCUtils.compute_crc32_stream(f, chunk_size=1000) == CRCUtils.compute_crc32(data)
+
+    def test_copy_with_crc32(self, tmp_path: Path):
+        data = bytes(range(256)) * 100
+        src = tmp_path / "src.bin"
+        src.write_bytes(data)
+        dest = tmp_path / "dest.bin"
+
+        crc = CRCUtils.copy_with_crc32(src, dest, chunk_size=1000)
+
+        assert crc == CRCUtils.compute_crc32(data)
+        assert dest.read_bytes() == data
+        # 复制得到的 CRC 可直接用于追加修正字节
+        assert CRCUtils.append_crc_fix(dest, 0x12345678, crc_state=crc)
+        assert CRCUtils.compute_crc32(dest) == 0x12345678
+        assert src.read_bytes() == data
+
+
+class TestAppendCrcFix:
+    def test_append_with_known_crc(self, tmp_path: Path):
+        data = b"original data" * 100
+        test_file = tmp_path / "test.bin"
+        test_file.write_bytes(data)
+        target_crc = 0x12345678
+
+        assert CRCUtils.append_crc_fix(test_file, target_crc, crc_state=CRCUtils.compute_crc32(data))
+
+        assert test_file.read_bytes()[:len(data)] == data
+        assert test_file.stat().st_size == len(data) + 4
+        assert CRCUtils.compute_crc32(test_file) == target_crc
+
+    def test_append_with_extra_bytes(self, tmp_path: Path):
+        data = b"original data"
+        test_file = tmp_path / "test.bin"
+        test_file.write_bytes(data)
+        extra_bytes = b"\x08\x08\x08\x08"
+
+        assert CRCUtils.append_crc_fix(test_file, 7355608, extra_bytes)
+
+        content = test_file.read_bytes()
+        assert content[len(data):-4] == extra_bytes
+        assert CRCUtils.compute_crc32(content) == 7355608
+
+    def test_failure_keeps_file(self, tmp_path: Path, monkeypatch):
+        monkeypatch.setattr(CRCUtils, "compute_crc_correction", staticmethod(lambda crc, target: None))
+        test_file = tmp_path / "test.bin"
+        test_file.write_bytes(b"original data")
+
+        assert not CRCUtils.append_crc_fix(test_file, 7355608, b"\x08\x08\x08\x08")
+        assert test_file.read_bytes() == b"original data"
+
+
+class TestForgeCrcAtOffset:
+    @pytest.mark.parametrize("use_mmap", [True, False])
+    @pytest.mark.parametrize("offset", [0, 50, 996])
+    def test_forge_keeps_size(self, tmp_path: Path, use_mmap: bool, offset: int):
+        data = bytes(i * 31 % 256 for i in range(1000))
+        test_file = tmp_path / "test.bin"
+        test_file.write_bytes(data)
+        target_crc = 0xDEADBEEF
+
+        set_mmap_enabled(use_mmap)
+        try:
+            assert CRCUtils.forge_crc_at_offset(test_file, target_crc, offset)
+        finally:
+            set_mmap_enabled(True)
+
+        content = test_file.read_bytes()
+        assert len(content) == len(data)
+        assert content[:offset] == data[:offset]
+        assert content[offset + 4:] == data[offset + 4:]
+        assert CRCUtils.compute_crc32(content) == target_crc
+
+    def test_compute_crc_patch(self):
+        prefix, suffix = b"header", b"body" * 50
+        target_crc = 7355608
+
+        patch = CRCUtils.compute_crc_patch(
+            CRCUtils.compute_crc32(prefix), CRCUtils.compute_crc32(suffix), len(suffix), target_crc
+        )
+
+        assert patch is not None
+        assert CRCUtils.compute_crc32(prefix + patch + suffix) == target_crc
+
+    def test_offset_out_of_range(self, tmp_path: Path):
+        test_file = tmp_path / "test.bin"
+        test_file.write_bytes(b"short data")
+
+        assert not CRCUtils.forge_crc_at_offset(test_file, 0x12345678, 8)
+        assert not CRCUtils.forge_crc_at_offset(test_file, 0x12345678, -1)
+        assert test_file.read_bytes() == b"short data"
+
+
 class TestManipulateFileCrc:
     def test_basic_file_crc_manipulation(self, tmp_path: Path):
         test_file = tmp_path / "test_file.bin"
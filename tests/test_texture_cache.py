@@ -0,0 +1,66 @@
+"""
+纹理编码缓存的测试用例
+
+测试以下功能:
+- TextureCache.make_key: 缓存键随像素与编码参数变化
+- TextureCache.get / put: 读写缓存条目
+- TextureCache 的容量上限与最久未使用淘汰
+"""
+
+import os
+from pathlib import Path
+from PIL import Image
+
+from ba_modding_toolkit.texture_cache import TextureCache
+
+
+def _make_image(color: tuple[int, int, int, int]) -> Image.Image:
+    return Image.new("RGBA", (16, 16), color)
+
+
+class TestTextureCache:
+    def test_key_depends_on_pixels_and_format(self):
+        red = _make_image((255, 0, 0, 255))
+        blue = _make_image((0, 0, 255, 255))
+
+        key = TextureCache.make_key(red, 4, 19, None)
+        assert key == TextureCache.make_key(red.copy(), 4, 19, b"")
+        assert key != TextureCache.make_key(blue, 4, 19, None)
+        assert key != TextureCache.make_key(red, 34, 19, None)
+        assert key != TextureCache.make_key(red, 4, 13, None)
+        assert key != TextureCache.make_key(red, 4, 19, None, mip_count=2)
+        # 模式不同但像素相同的图像使用同一个键
+        assert key == TextureCache.make_key(red.convert("RGB").convert("RGBA"), 4, 19, None)
+
+    def test_put_and_get(self, tmp_path: Path):
+        cache = TextureCache(tmp_path, 1024 * 1024)
+        key = TextureCache.make_key(_make_image((1, 2, 3, 255)), 4, 19, None)
+
+        assert cache.get(key) is None
+        cache.put(key, b"encoded", 4)
+        assert cache.get(key) == (b"encoded", 4)
+
+    def test_evicts_least_recently_used(self, tmp_path: Path):
+        cache = TextureCache(tmp_path, 2500)
+        keys = [TextureCache.make_key(_make_image((i, 0, 0, 255)), 4, 19, None) for i in range(3)]
+
+        cache.put(keys[0], b"a" * 1000, 4)
+        cache.put(keys[1], b"b" * 1000, 4)
+        # 让第一个条目比第二个更早被使用过，再访问第一个条目
+        for i, key in enumerate(keys[:2]):
+            path = tmp_path / key[:2] / f"{key}.bin"
+            os.utime(path, ns=(1_000_000_000 * (i + 1), 1_000_000_000 * (i + 1)))
+        assert cache.get(keys[0]) is not None
+
+        cache.put(keys[2], b"c" * 1000, 4)
+
+        assert cache.get(keys[0]) is not None
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[2]) is not None
+
+    def test_disabled_when_budget_is_zero(self, tmp_path: Path):
+        cache = TextureCache(tmp_path, 0)
+        key = TextureCache.make_key(_make_image((1, 2, 3, 255)), 4, 19, None)
+
+        cache.put(key, b"encoded", 4)
+        assert cache.get(key) is None
@@ -1,3 +1,4 @@
+import os
 import pytest
 from pathlib import Path
 from PIL import Image
@@ -11,6 +12,7 @@ from ba_modding_toolkit.core import (
     parse_filename,
     extract_core_filename,
     get_filename_prefix,
+    ResourceCatalog,
 )
 from conftest import has_sample_skel
 
@@ -129,3 +131,65 @@ class TestGetFilenamePrefix:
         
         assert prefix is not None
         assert "spinecharacters-ch0808_home" in prefix
+
+
+class TestResourceCatalog:
+    def _make_dirs(self, tmp_path: Path) -> list[Path]:
+        first = tmp_path / "GameData"
+        second = tmp_path / "Preload"
+        first.mkdir()
+        second.mkdir()
+        for name in (
+            "spinecharacters-ch0808_spr-mxdependency-textures-2077-08-08_11111111.bundle",
+            "spinecharacters-ch0808_spr-2077-08-08_22222222.bundle",
+            "spinecharacters-ch0809_spr-2077-08-08_33333333.bundle",
+        ):
+            (first / name).write_bytes(b"x")
+        (second / "spinecharacters-ch0808_spr-2077-08-08_22222222.bundle").write_bytes(b"yy")
+        return [first, second]
+
+    def test_with_prefix(self, tmp_path: Path):
+        dirs = self._make_dirs(tmp_path)
+        catalog = ResourceCatalog(dirs)
+
+        entries = catalog.with_prefix("spinecharacters-ch0808_spr")
+        assert len(entries) == 3
+        # 先按搜索目录排列
+        assert [e.path.parent for e in entries] == [dirs[0], dirs[0], dirs[1]]
+        assert catalog.with_prefix("spinecharacters-ch0810") == []
+
+    def test_find_by_name(self, tmp_path: Path):
+        dirs = self._make_dirs(tmp_path)
+        catalog = ResourceCatalog(dirs)
+
+        entries = catalog.find_by_name("spinecharacters-ch0808_spr-2077-08-08_22222222.bundle")
+        assert [e.path.parent for e in entries] == dirs
+        assert entries[1].size == 2
+        assert entries[0].crc == "22222222"
+
+    def test_find_by_core(self, tmp_path: Path):
+        catalog = ResourceCatalog(self._make_dirs(tmp_path))
+
+        entries = catalog.find_by_core("ch0808_spr")
+        assert len(entries) == 3
+        assert {e.type for e in entries} == {"textures", None}
+
+    def test_stale_and_refresh(self, tmp_path: Path):
+        dirs = self._make_dirs(tmp_path)
+        catalog = ResourceCatalog(dirs)
+        assert not catalog.is_stale()
+
+        new_file = dirs[1] / "spinecharacters-ch0809_spr-2077-08-08_44444444.bundle"
+        new_file.write_bytes(b"z")
+        st = dirs[1].stat()
+        os.utime(dirs[1], ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        assert catalog.is_stale()
+
+        catalog.refresh()
+        assert not catalog.is_stale()
+        assert len(catalog.find_by_core("ch0809_spr")) == 2
+
+    def test_missing_directory(self, tmp_path: Path):
+        catalog = ResourceCatalog([tmp_path / "missing"])
+        assert len(catalog) == 0
+        assert catalog.with_prefix("a") == []